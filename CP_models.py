@@ -13,9 +13,10 @@ from docplex.cp.config import context
 import docplex.cp.parameters as params
 import common
 
-def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
+def CP(sim, env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
     '''!
     Creates a schedule using the Constraint Programming model
+    @param sim: The Simulation object
     @param env_time: Current time of the simulation environment
     @param P_elems: Instances of processing elements in the SoC configuration generated in the simulation environment
     @param resource_matrix: All processing elements in the SoC configuration 
@@ -34,25 +35,19 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
     Dags_2 = {}
     # Get the task in Outstanding and Ready Queues
     # Since tasks in Completed Queue are already done, they will not be considered
-    for task in common.TaskQueues.outstanding.list:
+    for task in sim.TaskQueues.outstanding.list:
         if task.jobID not in Dags:
             Dags.append(task.jobID)
-            for i in range(len(domain_applications.list)):
-                name = domain_applications.list[i].name
-                if name == task.jobname:
-                    Dags_2[task.jobID] = {}
-                    Dags_2[task.jobID]['selection'] = i
-    for task in common.TaskQueues.ready.list:
+            Dags_2[task.jobID] = {}
+            Dags_2[task.jobID]['selection'] = task.app_ID
+    for task in sim.TaskQueues.ready.list:
         if task.jobID not in Dags:
             Dags.append(task.jobID)
-            for i in range(len(domain_applications.list)):
-                name = domain_applications.list[i].name
-                if name == task.jobname:
-                    Dags_2[task.jobID] = {}
-                    Dags_2[task.jobID]['selection'] = i
+            Dags_2[task.jobID] = {}
+            Dags_2[task.jobID]['selection'] = task.app_ID
     #Dags.sort()
 
-    common.ilp_job_list = [(key,Dags_2[key]['selection']) for key in Dags_2.keys()]
+    sim.ilp_job_list = [(key,Dags_2[key]['selection']) for key in Dags_2.keys()]
     #print(Dags_2)
     
     
@@ -93,8 +88,8 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
                 else:
                     if task.name in resource.supported_functionalities:
                         ind = resource.supported_functionalities.index(task.name)
-                        #Functionality.append((resource.name, task.base_ID, resource.performance[ind]))
-                        Dags_2[ID]['Functionality'].append((resource.name, task.base_ID, resource.performance[ind]))
+                        #Functionality.append((resource.name, task.base_ID, float(resource.performance[ind])))
+                        Dags_2[ID]['Functionality'].append((resource.name, task.base_ID, float(resource.performance[ind])))
             
             # Finally, gather dependency information between tasks
             
@@ -140,15 +135,15 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
         for f in Dags_2[d]['Functionality']:
             #print(f)
             name = str(d)+"_"+str(f[1])+'-'+str(f[0])
-            if len(common.TaskQueues.running.list) == 0 and len(common.TaskQueues.completed.list) == 0:
+            if len(sim.TaskQueues.running.list) == 0 and len(sim.TaskQueues.completed.list) == 0:
                 pe_tasks_2[(d,f)] = mdl.interval_var(optional=True, size =int(f[2]), name = name )
                 task_names_ids_2[name] = last_ID+f[1]
             else:
-                for ii, running_task in enumerate(common.TaskQueues.running.list):
+                for ii, running_task in enumerate(sim.TaskQueues.running.list):
                     if (d == running_task.jobID) and (f[1] == running_task.base_ID) and (f[0] == P_elems[running_task.PE_ID].name):
 
                         ind = resource_matrix.list[running_task.PE_ID].supported_functionalities.index(running_task.name)
-                        exec_time = resource_matrix.list[running_task.PE_ID].performance[ind]
+                        exec_time = float(resource_matrix.list[running_task.PE_ID].performance[ind])
                         free_time = int(running_task.start_time + exec_time - env_time)
                         #print(free_time)    
                         pe_tasks_2[(d,f)] = mdl.interval_var(optional=True, start=0, end=free_time,name = name )
@@ -162,7 +157,7 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
                     pe_tasks_2[(d,f)] = mdl.interval_var(optional=True, size =int(f[2]), name = name )
                     task_names_ids_2[name] = last_ID+f[1]
                 
-                for iii, completed_task in enumerate(common.TaskQueues.completed.list):
+                for iii, completed_task in enumerate(sim.TaskQueues.completed.list):
                     if (d == completed_task.jobID) and (f[1] == completed_task.base_ID) and (f[0] == P_elems[completed_task.PE_ID].name):
                         #print(completed_task.name)
                         #pe_tasks[(d,f)] = mdl.interval_var(optional=True, size =0, name = name )
@@ -189,9 +184,9 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
                         elif p2 != c[0] and task2 == c[2]:
                             p2_id = PEs.index(p2)
                             #print(p2_id)
-                            bandwidth = common.ResourceManager.comm_band[p1_id,p2_id]
+                            bandwidth = sim.comm_band[p1_id,p2_id]
                             comm_time = int( (c[3])/bandwidth )
-                            for ii, completed_task in enumerate(common.TaskQueues.completed.list):
+                            for ii, completed_task in enumerate(sim.TaskQueues.completed.list):
                                 if ((d == completed_task.jobID) and (task1 == completed_task.base_ID) and (p1 == P_elems[completed_task.PE_ID].name)):
                                     mdl.add( mdl.end_before_start(pe_tasks_2[d,(p1,task1,d1)], pe_tasks_2[d,(p2,task2,d2)], max(0,comm_time+completed_task.finish_time-env_time)  ))
                                     #print (d, p1,p2, task1,task2, max(0,int(c[3])+completed_task.finish_time-self.env.now) )
@@ -264,14 +259,14 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
     actual_schedule.sort(key=lambda x: x[0], reverse=False)
     #print(actual_schedule)
     
-    common.table = []
+    sim.table = []
     for element in actual_schedule:
-        common.table.append((element[1],element[2]))
-    #print(common.table)    
-    #print(len(common.table))
+        sim.table.append((element[1],element[2]))
+    #print(sim.table)    
+    #print(len(sim.table))
     
     
-    if (common.simulation_mode == 'validation'):
+    if (common.simulation_mode == 'validation') and (common.plot_mode == 'show'):     # The schedule is only shown in a window, it is not rendered headless
         colors = ['salmon','turquoise', 'lime' , 'coral', 'lightpink']
         PEs.reverse()                     
         for i,p in enumerate(PEs):
@@ -295,7 +290,7 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
         for task in generated_jobs[d].task_list:
 
             task_sched_ID = 0
-            task.dynamic_dependencies.clear()                                  # Clear dependencies from previosu ILP run
+            dynamic_dependencies = []                                           # Dependencies from previous ILP run are replaced
            
             ind = Dags.index(d)
             for i in range(ind):
@@ -303,7 +298,7 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
                 task_sched_ID += len(domain_applications.list[selection].task_list)
             task_sched_ID += task.base_ID
             
-            task_order = common.table[task_sched_ID][1]
+            task_order = sim.table[task_sched_ID][1]
            
             for k in Dags:
 
@@ -316,13 +311,14 @@ def CP(env_time, P_elems, resource_matrix, domain_applications, generated_jobs):
                         dyn_depend_sched_ID += len(domain_applications.list[selection].task_list)
                     dyn_depend_sched_ID += dyn_depend.base_ID    
                        
-                    if ( (common.table[dyn_depend_sched_ID][0] == common.table[task_sched_ID][0]) and 
-                        (common.table[dyn_depend_sched_ID][1] == task_order-1) and 
+                    if ( (sim.table[dyn_depend_sched_ID][0] == sim.table[task_sched_ID][0]) and 
+                        (sim.table[dyn_depend_sched_ID][1] == task_order-1) and 
                         (dyn_depend.ID not in task.predecessors) and 
-                        (dyn_depend.ID not in task.dynamic_dependencies) ):
+                        (dyn_depend.ID not in dynamic_dependencies) ):
                         
-                        task.dynamic_dependencies.append(dyn_depend.ID)
-                #print(task.ID, task.dynamic_dependencies)
+                        dynamic_dependencies.append(dyn_depend.ID)
+            sim.TaskQueues.dynamic_dependencies.set(task, dynamic_dependencies)
+            #print(task.ID, task.dynamic_dependencies)
 
 # end of CP_Multi(......
 
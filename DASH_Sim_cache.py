@@ -0,0 +1,142 @@
+'''!
+@brief This file contains the result cache of the sweep points.
+
+The results of a point are stored on disk, in the directory given by result_cache_dir in config_file.ini,
+under a hash of the configuration variables that affect the results (result_variables), the contents of the SoC and job files
+and the source files of DASH-Sim. Therefore, a point is simulated again only if one of them changes.
+The least recently used results are evicted when the cache exceeds result_cache_size.
+'''
+import os
+import glob
+import pickle
+import hashlib
+
+import common
+
+## The configuration variables that affect the results of a sweep point (see common.parse_config)
+## The other variables only change how the results are obtained or shown (e.g., engine_mode, num_of_processes, plot_mode or the traces)
+## A new option that affects the results must be added to this list
+result_variables = [
+    # DEFAULT
+    'resource_file', 'job_files', 'scheduler', 'seed', 'simulation_clk', 'simulation_length', 'standard_deviation',
+    'job_probabilities', 'inject_jobs_ASAP', 'fixed_injection_rate', 'max_jobs_in_parallel', 'job_list', 'snippet_size',
+    'max_num_jobs', 'inject_fixed_num_jobs',
+    # POWER MANAGEMENT
+    'sampling_rate', 'sampling_rate_temperature', 'plan_fixed_frequency_tasks', 'util_high_threshold', 'util_low_threshold',
+    'enable_throttling', 'enable_DTPM_throttling', 'C1', 'C2', 'Igate', 'T_ambient', 'DVFS_mode', 'trip_temperature',
+    'trip_hysteresis', 'DTPM_trip_temperature',
+    # SIMULATION MODE (the points of a sweep run under performance mode, so scale is not used)
+    'simulation_mode', 'warmup_period', 'num_of_iterations', 'scale_values_list', 'completed_jobs_window', 'warmup_forks',
+    # COMMUNICATION MODE
+    'packet_size', 'PE_to_PE', 'shared_memory'
+]
+
+## Hash of the source files of DASH-Sim, which is computed once
+source_hash = None
+
+def get_configuration(config):
+    '''!
+    Get the effective configuration of a point, i.e., the values that its options give to the variables in result_variables.
+    @param config: Dictionary of the options of each section of the point (see DASH_Sim_sweep.get_point_config)
+    @return Dictionary of the configuration variables, indexed by name
+    '''
+    variables = common.parse_config(config)
+    return {name: variables[name] for name in result_variables}
+# end of def get_configuration(config)
+
+def get_source_hash():
+    '''!
+    Get the hash of the source files of DASH-Sim, which identifies the version of the simulator.
+    @return Hexadecimal digest of the source files
+    '''
+    global source_hash
+    if source_hash is None:
+        digest = hashlib.sha256()
+        for file_name in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(common.__file__)), '*.py'))):
+            with open(file_name, 'rb') as source_file:
+                digest.update(source_file.read())
+        source_hash = digest.hexdigest()
+    return source_hash
+# end of def get_source_hash()
+
+def get_input_files(configuration):
+    '''!
+    Get the SoC and job files of a configuration.
+    @param configuration: Dictionary of the configuration variables (see get_configuration)
+    @return List of the names of the SoC and job files, relative to the directory of the simulation
+    '''
+    return ["config_SoC/" + configuration['resource_file']] + ["config_Jobs/" + f for f in configuration['job_files']]
+# end of def get_input_files(configuration)
+
+def get_key(config):
+    '''!
+    Get the key of a point in the result cache.
+    @param config: Dictionary of the options of each section of the point (see DASH_Sim_sweep.get_point_config)
+    @return Hexadecimal digest of the configuration, the SoC and job files and the source files
+    '''
+    configuration = get_configuration(config)
+    digest = hashlib.sha256()
+    digest.update(get_source_hash().encode())
+    digest.update(repr(sorted(configuration.items())).encode())
+    for file_name in get_input_files(configuration):
+        try:
+            with open(file_name, 'rb') as input_file:
+                digest.update(input_file.read())
+        except OSError:
+            digest.update(b'missing')                                           # The simulation reports the missing file
+    return digest.hexdigest()
+# end of def get_key(config)
+
+def load(key):
+    '''!
+    Load the results of a point from the result cache.
+    @param key: Key of the point
+    @return The results of the point, or None if the cache does not contain them
+    '''
+    file_name = os.path.join(common.result_cache_dir, key + '.pkl')
+    try:
+        with open(file_name, 'rb') as cache_file:
+            results = pickle.load(cache_file)
+        os.utime(file_name)                                                     # Mark the results as the most recently used
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    return results
+# end of def load(key)
+
+def store(key, results):
+    '''!
+    Store the results of a point in the result cache, and evict the least recently used results if the cache is too large.
+    @param key: Key of the point
+    @param results: The results of the point
+    '''
+    os.makedirs(common.result_cache_dir, exist_ok=True)
+    file_name = os.path.join(common.result_cache_dir, key + '.pkl')
+    temp_file_name = file_name + '.' + str(os.getpid())                         # Written aside, so that other sweeps never read a partial file
+    with open(temp_file_name, 'wb') as cache_file:
+        pickle.dump(results, cache_file)
+    os.replace(temp_file_name, file_name)
+    evict()
+# end of def store(key, results)
+
+def evict():
+    '''!
+    Remove the least recently used results until the result cache fits in result_cache_size (in MB).
+    '''
+    entries = []
+    for file_name in glob.glob(os.path.join(common.result_cache_dir, '*.pkl')):
+        try:
+            status = os.stat(file_name)
+        except OSError:
+            continue                                                            # Evicted by another sweep
+        entries.append((status.st_mtime, status.st_size, file_name))
+
+    cache_size = sum(entry[1] for entry in entries)
+    for _, size, file_name in sorted(entries):
+        if cache_size <= common.result_cache_size * 1024 * 1024:
+            break
+        try:
+            os.remove(file_name)
+        except OSError:
+            pass
+        cache_size -= size
+# end of def evict()
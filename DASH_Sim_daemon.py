@@ -0,0 +1,204 @@
+'''!
+@brief This file contains the simulation daemon of DASH-Sim, which runs simulations for other processes (e.g., CI checks or notebooks).
+
+The daemon is a long-lived process, which imports DASH-Sim and parses the SoC and job files once, and keeps the parsed
+configurations in memory (see DASH_Sim_utils.compiled_in_memory). It accepts run requests on a Unix socket, and runs
+independent requests concurrently in a pool of worker processes, which are forked from the warm daemon.
+Therefore, a request only costs the simulation itself. The daemon is started with:
+    python DASH_Sim_daemon.py --processes <number of worker processes>
+and a simulation is requested with request_simulation(config), which returns the same Results object as DASH_Sim_v0.simulate.
+The configuration of a request overrides the configuration of the daemon (config_file.ini in its directory).
+'''
+import io
+import os
+import sys
+import glob
+import socket
+import argparse
+import threading
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import concurrent.futures
+
+import common
+import DASH_Sim_v0
+import DASH_Sim_utils
+import DASH_SoC_parser
+import job_parser
+
+socket_file = 'DASH_Sim.sock'                                                   # Default Unix socket of the daemon, relative to the directory of the daemon
+
+## The configuration of the daemon, which is inherited by the worker processes
+base_config = None
+
+def warm_up():
+    '''!
+    Parse all SoC and job files of the daemon directory, and keep the parsed configurations in memory.
+    The files that cannot be parsed are skipped, their requests report the error.
+    '''
+    DASH_Sim_utils.compiled_in_memory = {}
+    for file_name in sorted(glob.glob('config_SoC/*.txt')):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                DASH_SoC_parser.resource_parse(common.Simulation(), common.ResourceManager(), file_name)
+        except Exception:
+            pass
+    for file_name in sorted(glob.glob('config_Jobs/*.txt')):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                job_parser.job_parse(common.ApplicationManager(), file_name)
+        except Exception:
+            pass
+# end of def warm_up()
+
+def run_request(config, scale_values):
+    '''!
+    Simulate a request in a worker process of the daemon.
+    @param config: The configuration of the request, as a dictionary of sections, which overrides the configuration of the daemon
+    @param scale_values: Optional input to select specific scale values
+    @return Tuple of the Results object and the printed output of the simulation
+    @exception common.ConfigurationError: The configuration, or a SoC or job file, has an invalid value
+    '''
+    merged_config = {name: dict(section) for name, section in base_config.items()}
+    for name, section in config.items():
+        merged_config.setdefault(name, {}).update(section)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        common.load_config(merged_config)
+        common.CLEAN_TRACES = False                                             # Concurrent requests must not remove the traces of each other
+        common.trace_file_num = os.getpid()
+        common.num_of_processes = 1                                             # The requests already run in parallel
+        if common.plot_mode == 'show':
+            common.plot_mode = 'none'                                           # The daemon has no display
+        results = common.Results(DASH_Sim_v0.run_simulator(scale_values))
+    return results, output.getvalue()
+# end of def run_request(config, scale_values)
+
+def serve(conn, pool, stop):
+    '''!
+    Run the requests of a client until it disconnects.
+    @param conn: Connection to the client
+    @param pool: Pool of worker processes
+    @param stop: Event that is set to stop the daemon
+    '''
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == 'stop':
+                stop.set()
+                conn.send(('stopped',))
+                break
+            _, config, scale_values = message
+            try:
+                conn.send(('results',) + pool.submit(run_request, config, scale_values).result())
+            except Exception as error:
+                conn.send(('error', error))
+    except (EOFError, OSError):
+        pass                                                                    # The client disconnected
+    finally:
+        conn.close()
+# end of def serve(conn, pool, stop)
+
+def accept(listener, pool, stop):
+    '''!
+    Accept the connections of the clients, and serve each client in a thread.
+    @param listener: Listener of the daemon
+    @param pool: Pool of worker processes
+    @param stop: Event that is set to stop the daemon
+    '''
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError:
+            return                                                              # The listener is closed
+        threading.Thread(target=serve, args=(conn, pool, stop), daemon=True).start()
+# end of def accept(listener, pool, stop)
+
+def run_daemon(socket_file=socket_file, num_of_processes=None, config=None):
+    '''!
+    Run the simulation daemon until it receives a stop request.
+    @param socket_file: Unix socket on which the daemon listens
+    @param num_of_processes: Number of worker processes, the number of CPUs by default
+    @param config: The configuration of the daemon, as a ConfigParser object or a dictionary of sections, config_file.ini by default
+    @exception RuntimeError: The daemon cannot be started
+    @exception common.ConfigurationError: The configuration of the daemon has an invalid value
+    '''
+    global base_config
+
+    if not hasattr(socket, 'AF_UNIX') or 'fork' not in multiprocessing.get_all_start_methods():
+        raise RuntimeError('Running the simulation daemon is not supported on this platform')
+    if os.path.exists(socket_file):
+        try:
+            multiprocessing.connection.Client(socket_file, family='AF_UNIX').close()
+        except OSError:
+            os.remove(socket_file)                                              # Left by a daemon that did not stop
+        else:
+            raise RuntimeError('A simulation daemon is already listening on %s' % socket_file)
+
+    common.load_config(config)
+    base_config = common.config
+    warm_up()
+
+    if num_of_processes is None:
+        num_of_processes = os.cpu_count()
+    stop = threading.Event()
+    with concurrent.futures.ProcessPoolExecutor(num_of_processes, mp_context=multiprocessing.get_context('fork')) as pool:
+        pool.submit(int).result()                                               # Fork the worker processes before the first request
+        listener = multiprocessing.connection.Listener(socket_file, family='AF_UNIX')
+        os.chmod(socket_file, 0o600)                                            # Only the user of the daemon can request simulations
+        print('[I] Simulation daemon listening on %s with %d worker processes' % (socket_file, num_of_processes))
+        sys.stdout.flush()
+
+        threading.Thread(target=accept, args=(listener, pool, stop), daemon=True).start()
+        stop.wait()
+        listener.close()
+    print('[I] Simulation daemon stopped')
+# end of def run_daemon(socket_file=socket_file, num_of_processes=None, config=None)
+
+def request_simulation(config=None, scale_values=None, socket_file=socket_file, print_output=False):
+    '''!
+    Request a simulation from the daemon.
+    @param config: The configuration of the request, as a dictionary of sections (e.g., {'DEFAULT': {'scheduler': 'MET'}}),
+                   which overrides the configuration of the daemon
+    @param scale_values: Optional input to select specific scale values. Default value is defined in the configuration
+    @param socket_file: Unix socket of the daemon
+    @param print_output: Whether the printed output of the simulation is printed by the client
+    @return The Results object of the simulation
+    @exception common.ConfigurationError: The configuration, or a SoC or job file, has an invalid value
+    '''
+    with multiprocessing.connection.Client(socket_file, family='AF_UNIX') as conn:
+        conn.send(('run', config if config is not None else {}, scale_values))
+        message = conn.recv()
+    if message[0] == 'error':
+        raise message[1]
+    _, results, output = message
+    if print_output:
+        print(output, end='')
+    return results
+# end of def request_simulation(config=None, scale_values=None, socket_file=socket_file, print_output=False)
+
+def stop_daemon(socket_file=socket_file):
+    '''!
+    Stop the daemon, after the requests that it is running.
+    @param socket_file: Unix socket of the daemon
+    '''
+    with multiprocessing.connection.Client(socket_file, family='AF_UNIX') as conn:
+        conn.send(('stop',))
+        conn.recv()
+# end of def stop_daemon(socket_file=socket_file)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the DASH-Sim simulation daemon')
+    parser.add_argument('--socket', default=socket_file, help='Unix socket of the daemon (default: %(default)s)')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--stop', action='store_true', help='stop the daemon that listens on the socket')
+    args = parser.parse_args()
+    try:
+        if args.stop:
+            stop_daemon(args.socket)
+        else:
+            run_daemon(args.socket, args.processes)
+    except (common.ConfigurationError, RuntimeError) as error:
+        common.exit_with_error(error)
@@ -0,0 +1,366 @@
+'''!
+@brief This file contains the distributed sweep of DASH-Sim, which runs the points of a sweep on several machines.
+
+The coordinator (run_distributed_sweep) listens on a TCP port and hands out the points of a grid of configuration overrides
+(see DASH_Sim_sweep.py) to the workers that connect to it. A worker receives the effective configuration and the SoC and job
+files of the sweep once, then simulates one point at a time and sends its rows back. The coordinator merges the rows into a
+single table, in the order of the points. The points of a worker that disconnects, or that exceeds point_timeout, are handed
+out again, up to max_retries times.
+
+A worker is started on each machine with:
+    python DASH_Sim_distributed.py <coordinator host> <port> --processes <number of worker processes>
+The connections are authenticated with a shared key (DASH_SIM_AUTHKEY environment variable), which must be set on the
+coordinator and the workers. The messages are pickled, so the coordinator listens on localhost unless another host is given,
+and should only be reachable from trusted machines.
+For a test on a single machine, the coordinator starts num_of_local_workers worker processes itself.
+'''
+import os
+import sys
+import time
+import queue
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+import multiprocessing.connection
+
+import common
+import DASH_Sim_sweep
+import DASH_Sim_cache
+
+connect_timeout = 30                                                            # Time (in seconds) for which a worker retries to connect to the coordinator
+
+def get_authkey(authkey=None):
+    '''!
+    Get the key that authenticates the connections between the coordinator and the workers.
+    There is no default key, the coordinator and the workers do not start without a key.
+    @param authkey: The key, or None for the DASH_SIM_AUTHKEY environment variable
+    @return The key as bytes
+    @exception common.ConfigurationError: No key is set
+    '''
+    if authkey is None:
+        authkey = os.environ.get('DASH_SIM_AUTHKEY')
+    if not authkey:
+        raise common.ConfigurationError('No key is set to authenticate the distributed sweep, please set the DASH_SIM_AUTHKEY environment variable')
+    return authkey.encode() if isinstance(authkey, str) else authkey
+# end of def get_authkey(authkey=None)
+
+class Coordinator:
+    '''!
+    Define the Coordinator class, which hands out the points of a sweep to the connected workers and merges their rows.
+    '''
+    def __init__(self, points, keys, configuration, input_files, csvfile, point_timeout, max_retries):
+        '''!
+        @param points: List of points, each point is a dictionary of overrides
+        @param keys: Keys of the points in the result cache (None for the points that are not cached)
+        @param configuration: Configuration of the coordinator, from which the points start on the workers (see DASH_Sim_sweep.get_base_config)
+        @param input_files: Contents of the SoC and job files of the sweep, indexed by file name
+        @param csvfile: Results file, or None if the table is not written to a file
+        @param point_timeout: Time (in seconds) after which a point is handed out again, None waits for the worker indefinitely
+        @param max_retries: Number of times that a lost point is handed out again
+        '''
+        self.points = points
+        self.keys = keys
+        self.configuration = configuration
+        self.input_files = input_files
+        self.csvfile = csvfile
+        self.point_timeout = point_timeout
+        self.max_retries = max_retries
+
+        self.pending = queue.Queue()            # Indices of the points that are waiting for a worker
+        self.rows = [None] * len(points)        # Rows of each point, None until the point is completed
+        self.retries = [0] * len(points)        # Number of times that each point was lost
+        self.failed = []                        # Indices of the points whose simulation failed
+        self.num_of_completed = 0
+        self.num_of_workers = 0                 # Number of the workers that are connected
+        self.lock = threading.Lock()
+        self.done = threading.Event()           # Set when all points are completed
+    # end of def __init__(self, points, keys, configuration, input_files, csvfile, point_timeout, max_retries)
+
+    def add_point(self, index, rows=None):
+        '''!
+        Add a point to the sweep.
+        @param index: Index of the point
+        @param rows: Rows of the point if they were loaded from the result cache, otherwise the point is handed out to a worker
+        '''
+        if rows is None:
+            self.pending.put(index)
+        else:
+            self.complete(index, rows, store=False)
+    # end of def add_point(self, index, rows=None)
+
+    def complete(self, index, rows, store=True):
+        '''!
+        Record the rows of a completed point.
+        @param index: Index of the point
+        @param rows: List of the rows of the point
+        @param store: Whether the rows are stored in the result cache
+        '''
+        with self.lock:
+            if self.rows[index] is not None:                                    # The point was completed by another worker
+                return
+            self.rows[index] = rows
+            if store and self.keys[index] is not None:
+                DASH_Sim_cache.store(self.keys[index], rows)
+            DASH_Sim_sweep.write_rows(self.csvfile, index, rows)
+            self.num_of_completed += 1
+            if self.num_of_completed == len(self.points):
+                self.done.set()
+    # end of def complete(self, index, rows, store=True)
+
+    def fail(self, index, message):
+        '''!
+        Record a point whose simulation failed, which is not handed out again.
+        @param index: Index of the point
+        @param message: Error message of the worker
+        '''
+        print('[E] The simulation of point %d (%s) failed: %s' % (index, self.points[index], message))
+        with self.lock:
+            self.failed.append(index)
+        self.complete(index, [], store=False)
+    # end of def fail(self, index, message)
+
+    def lose(self, index):
+        '''!
+        Hand out a point again, after its worker disconnected or timed out.
+        @param index: Index of the point
+        '''
+        with self.lock:                                                         # Several workers may be lost at the same time
+            self.retries[index] += 1
+            retries = self.retries[index]
+        if retries > self.max_retries:
+            self.fail(index, 'the point was lost %d times' % retries)
+        else:
+            print('[I] Point %d was lost, handing it out again' % index)
+            self.pending.put(index)
+    # end of def lose(self, index)
+
+    def serve(self, conn):
+        '''!
+        Hand out points to a worker until all points are completed, or the worker is lost.
+        @param conn: Connection to the worker
+        '''
+        index = None
+        with self.lock:
+            self.num_of_workers += 1
+        try:
+            conn.send(('configuration', self.configuration, self.input_files))
+            while not self.done.is_set():
+                try:
+                    index = self.pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                conn.send(('point', index, self.points[index]))
+                if not conn.poll(self.point_timeout):
+                    print('[I] Point %d timed out' % index)
+                    break
+                message = conn.recv()
+                if message[0] == 'rows':
+                    self.complete(index, message[2])
+                else:
+                    self.fail(index, message[2])
+                index = None
+            else:
+                conn.send(('stop',))
+        except (EOFError, OSError):
+            pass                                                                # The worker disconnected
+        finally:
+            conn.close()
+            if index is not None:
+                self.lose(index)
+            with self.lock:
+                self.num_of_workers -= 1
+    # end of def serve(self, conn)
+
+    def accept(self, listener):
+        '''!
+        Accept the connections of the workers, and serve each worker in a thread.
+        @param listener: Listener of the coordinator
+        '''
+        while True:
+            try:
+                conn = listener.accept()
+            except multiprocessing.AuthenticationError:
+                print('[I] A worker was rejected, since its key does not match DASH_SIM_AUTHKEY')
+                continue
+            except OSError:
+                return                                                          # The listener is closed
+            threading.Thread(target=self.serve, args=(conn,), daemon=True).start()
+    # end of def accept(self, listener)
+# end class Coordinator
+
+def run_distributed_sweep(grid, host='localhost', port=6100, authkey=None, results_file=None,
+                          num_of_local_workers=0, point_timeout=None, max_retries=3):
+    '''!
+    Simulate each point of a grid of configuration overrides on the workers that connect to the coordinator.
+    @param grid: Dictionary of the values of each override, indexed by the name of the option in config_file.ini (see DASH_Sim_sweep.get_points)
+    @param host: Host name or address on which the coordinator listens, localhost by default ('' listens on all interfaces)
+    @param port: TCP port on which the coordinator listens (0 selects a free port, e.g., for local workers only)
+    @param authkey: Key that authenticates the workers, the DASH_SIM_AUTHKEY environment variable by default
+    @param results_file: CSV file to which the rows are written as soon as the points are completed, no file is written by default
+    @param num_of_local_workers: Number of worker processes started on this machine
+    @param point_timeout: Time (in seconds) after which a point is handed out again, None waits for the worker indefinitely
+    @param max_retries: Number of times that a lost point is handed out again
+    @return List of the rows of the results table, in the order of the points
+    @exception RuntimeError: All the local workers stopped while no other worker is connected
+    '''
+    configuration = DASH_Sim_sweep.get_base_config()
+    DASH_Sim_sweep.check_grid(grid, configuration)
+    points = DASH_Sim_sweep.get_points(grid)
+    point_configs = [DASH_Sim_sweep.get_point_config(configuration, point) for point in points]
+
+    # The workers receive the SoC and job files of all points, and compile them in their own directory
+    input_files = {}
+    for point_config in point_configs:
+        for file_name in DASH_Sim_cache.get_input_files(DASH_Sim_cache.get_configuration(point_config)):
+            if file_name not in input_files:
+                try:
+                    with open(file_name, 'rb') as input_file:
+                        input_files[file_name] = input_file.read()
+                except OSError:
+                    raise common.ConfigurationError('Could not read the input file %s of the sweep' % file_name) from None
+
+    authkey = get_authkey(authkey)
+    keys = [DASH_Sim_cache.get_key(point_config) if common.result_cache_dir else None for point_config in point_configs]
+    csvfile = open(results_file, 'w', newline='') if results_file is not None else None
+    listener = multiprocessing.connection.Listener((host, port), authkey=authkey)
+    workers = []
+    try:
+        coordinator = Coordinator(points, keys, configuration, input_files, csvfile, point_timeout, max_retries)
+        for index, point in enumerate(points):
+            coordinator.add_point(index, DASH_Sim_cache.load(keys[index]) if keys[index] is not None else None)
+
+        threading.Thread(target=coordinator.accept, args=(listener,), daemon=True).start()
+        print('[I] Coordinator of %d points listening on %s:%d' % (len(points), *listener.address))
+        sys.stdout.flush()                                                      # Otherwise, the buffered output is printed by each worker
+        for i in range(num_of_local_workers):
+            workers.append(multiprocessing.Process(target=run_points, args=(listener.address, authkey)))
+            workers[-1].start()
+
+        # The coordinator waits indefinitely for the workers of other machines,
+        # but not after the local workers stopped (e.g., due to an error) while no other worker is connected
+        while not coordinator.done.wait(1):
+            if workers and not any(worker.is_alive() for worker in workers) and coordinator.num_of_workers == 0:
+                raise RuntimeError('All the local workers of the distributed sweep stopped before the points were completed')
+    finally:
+        listener.close()
+        for worker in workers:
+            worker.join()
+        if csvfile is not None:
+            csvfile.close()
+
+    return [row for point_rows in coordinator.rows for row in point_rows]
+# end of def run_distributed_sweep(grid, host='localhost', port=6100, authkey=None, results_file=None, ...)
+
+def serve_points(address, authkey=None, work_dir=None, compiled_config_dir='config_Compiled'):
+    '''!
+    Connect to a coordinator as a worker, and simulate the points that it hands out until it stops the worker.
+    The worker runs in a new process, since it changes its working directory to work_dir, so the caller is not affected.
+    @param address: Tuple of the host and port of the coordinator
+    @param authkey: Key that authenticates the worker, the DASH_SIM_AUTHKEY environment variable by default
+    @param work_dir: Directory in which the SoC and job files are written and the simulations are run, a new temporary directory by default
+    @param compiled_config_dir: Directory of the compiled SoC and job files, relative to work_dir (empty disables the compiled files)
+    '''
+    process = multiprocessing.Process(target=run_points, args=(address, get_authkey(authkey), work_dir, compiled_config_dir))
+    process.start()
+    process.join()
+# end of def serve_points(address, authkey=None, work_dir=None, compiled_config_dir='config_Compiled')
+
+def run_points(address, authkey=None, work_dir=None, compiled_config_dir='config_Compiled'):
+    '''!
+    Body of a worker process, which simulates the points that the coordinator hands out until it stops the worker.
+    The working directory of the process is changed to work_dir, so it only runs in a process started for it (see serve_points).
+    @param address: Tuple of the host and port of the coordinator
+    @param authkey: Key that authenticates the worker, the DASH_SIM_AUTHKEY environment variable by default
+    @param work_dir: Directory in which the SoC and job files are written and the simulations are run, a new temporary directory by default
+                     (which is removed when the worker stops)
+    @param compiled_config_dir: Directory of the compiled SoC and job files, relative to work_dir (empty disables the compiled files)
+    '''
+    authkey = get_authkey(authkey)
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            conn = multiprocessing.connection.Client(tuple(address), authkey=authkey)
+            break
+        except ConnectionRefusedError:                                          # The coordinator is not listening yet
+            if time.time() > deadline:
+                raise ConnectionError('Could not connect to the coordinator at %s:%d' % tuple(address)) from None
+            time.sleep(0.5)
+
+    temp_dir = None
+    cwd = os.getcwd()
+    try:
+        message = conn.recv()
+        if message[0] != 'configuration':
+            return
+        _, configuration, input_files = message
+
+        if work_dir is None:
+            work_dir = temp_dir = tempfile.mkdtemp(prefix='DASH_Sim_worker_')
+        os.makedirs(work_dir, exist_ok=True)
+        os.chdir(work_dir)
+        for file_name, contents in input_files.items():
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            temp_file_name = file_name + '.' + str(os.getpid())                 # Written aside, since other workers may share work_dir
+            with open(temp_file_name, 'wb') as input_file:
+                input_file.write(contents)
+            os.replace(temp_file_name, file_name)
+
+        # The points start from the configuration of the coordinator, with the compiled files of the worker
+        configuration['DEFAULT']['compiled_config_dir'] = compiled_config_dir
+
+        while True:
+            message = conn.recv()
+            if message[0] != 'point':
+                break
+            _, index, point = message
+            try:
+                conn.send(('rows', index, DASH_Sim_sweep.run_point(index, point, configuration)))
+            except Exception as error:                                          # E.g., a ConfigurationError for an invalid point
+                conn.send(('error', index, repr(error)))
+    except (EOFError, OSError):
+        pass                                                                    # The coordinator is closed
+    finally:
+        conn.close()
+        if temp_dir is not None:
+            os.chdir(cwd)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+# end of def run_points(address, authkey=None, work_dir=None, compiled_config_dir='config_Compiled')
+
+def run_worker(host, port, num_of_processes=1, authkey=None, work_dir=None):
+    '''!
+    Run the worker processes of a machine, each of them simulates one point at a time.
+    @param host: Host name or address of the coordinator
+    @param port: TCP port of the coordinator
+    @param num_of_processes: Number of worker processes
+    @param authkey: Key that authenticates the workers, the DASH_SIM_AUTHKEY environment variable by default
+    @param work_dir: Directory shared by the worker processes, a new temporary directory by default (which is removed when the workers stop)
+    '''
+    authkey = get_authkey(authkey)                                              # Checked before the worker processes are started
+    temp_dir = None
+    if work_dir is None:
+        work_dir = temp_dir = tempfile.mkdtemp(prefix='DASH_Sim_worker_')
+    try:
+        processes = [multiprocessing.Process(target=run_points, args=((host, port), authkey, work_dir))
+                     for i in range(num_of_processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+# end of def run_worker(host, port, num_of_processes=1, authkey=None, work_dir=None)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the worker processes of a distributed DASH-Sim sweep')
+    parser.add_argument('host', help='host name or address of the coordinator')
+    parser.add_argument('port', type=int, help='TCP port of the coordinator')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--dir', default=None, help='directory of the simulations (default: a new temporary directory)')
+    args = parser.parse_args()
+    try:
+        run_worker(args.host, args.port, args.processes, work_dir=args.dir)
+    except common.ConfigurationError as error:
+        common.exit_with_error(error)
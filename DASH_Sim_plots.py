@@ -0,0 +1,135 @@
+'''!
+@brief This file contains the Gantt chart and DAG plots of the validation mode.
+
+The timeline of the tasks and the DAGs of the applications are recorded as plain data (see get_timeline and get_DAGs),
+and rendered after the simulation according to plot_mode in config_file.ini:
+show opens them in Matplotlib windows, file renders them to PNG files in plot_dir, background renders the files in a
+separate process, and none only records the data, which can be rendered later with render_files.
+Matplotlib and networkx are only imported when a plot is drawn.
+'''
+import os
+import multiprocessing
+
+import numpy as np
+
+def get_timeline(sim):
+    '''!
+    Get the timeline of the completed tasks, which is drawn in the Gantt chart.
+    @param sim: The Simulation object
+    @return List of (PE ID, start time, finish time, task ID, job ID) tuples
+    '''
+    return [(task.PE_ID, task.start_time, task.finish_time, task.ID, task.jobID) for task in sim.TaskQueues.completed.list]
+# end of def get_timeline(sim)
+
+def get_DAGs(jobs):
+    '''!
+    Get the DAGs of the applications.
+    @param jobs: The list of all jobs given to DASH-Sim
+    @return List of (application name, number of tasks, list of edges) tuples
+    '''
+    return [(job.name, len(job.comm_vol), [(int(i), int(j)) for i, j in zip(*np.nonzero(job.comm_vol))]) for job in jobs.list]
+# end of def get_DAGs(jobs)
+
+def draw_gantt(ax, timeline, num_of_PEs):
+    '''!
+    Draw the Gantt chart of a simulation.
+    @param ax: Matplotlib axes
+    @param timeline: Timeline of the completed tasks (see get_timeline)
+    @param num_of_PEs: Number of PEs in the SoC, including the memory
+    '''
+    ilen = num_of_PEs - 1                                                       # since the last PE is the memory
+    pos = np.arange(0.5, ilen * 0.5 + 0.5, 0.5)
+    color_choices = ['red', 'blue', 'green', 'cyan', 'magenta']
+    for PE_ID, start_time, end_time, task_ID, job_ID in timeline:
+        ax.barh((PE_ID * 0.5) + 0.5, end_time - start_time, left=start_time,
+                height=0.3, align='center', edgecolor='black', color='white', alpha=0.95)
+        ax.text(0.5 * (start_time + end_time - len(str(task_ID)) - 0.25), (PE_ID * 0.5) + 0.5 - 0.03125,
+                task_ID, color=color_choices[job_ID % 5], fontweight='bold', fontsize=18, alpha=0.75)
+    ax.set_yticks(pos)
+    ax.set_yticklabels(range(ilen), fontsize=18)
+    ax.set_ylabel('Processing Element', fontsize=18)
+    ax.set_xlabel('Time', fontsize=18)
+    ax.tick_params(labelsize=16)
+    ax.set_ylim(bottom=-0.1, top=ilen * 0.5 + 0.5)
+    ax.set_xlim(left=-5)
+    ax.grid(color='g', linestyle=':', alpha=0.5)
+# end of def draw_gantt(ax, timeline, num_of_PEs)
+
+def draw_DAG(ax, DAG):
+    '''!
+    Draw the directed acyclic task graph of an application.
+    The graphviz layout is used if graphviz is installed, otherwise the tasks are placed in layers of their topological order.
+    @param ax: Matplotlib axes
+    @param DAG: DAG of the application (see get_DAGs)
+    '''
+    import networkx as nx
+
+    name, num_of_tasks, edges = DAG
+    dag = nx.DiGraph()
+    dag.add_nodes_from(range(num_of_tasks))
+    dag.add_edges_from(edges)
+    try:
+        pos = nx.nx_pydot.graphviz_layout(dag, prog='dot')
+    except (ImportError, OSError, AssertionError):
+        for layer, nodes in enumerate(nx.topological_generations(dag)):
+            for node in nodes:
+                dag.nodes[node]['layer'] = layer
+        pos = nx.multipartite_layout(dag, subset_key='layer', align='horizontal', scale=-1)
+    ax.set_title(name)
+    nx.draw(dag, pos=pos, ax=ax, with_labels=True)
+# end of def draw_DAG(ax, DAG)
+
+def show(timeline, num_of_PEs, DAGs):
+    '''!
+    Show the DAGs and the Gantt chart in Matplotlib windows.
+    @param timeline: Timeline of the completed tasks (see get_timeline)
+    @param num_of_PEs: Number of PEs in the SoC, including the memory
+    @param DAGs: DAGs of the applications (see get_DAGs)
+    '''
+    import matplotlib.pyplot as plt
+
+    for DAG in DAGs:
+        draw_DAG(plt.figure().add_subplot(111), DAG)
+    draw_gantt(plt.figure(figsize=(10, 6)).add_subplot(111), timeline, num_of_PEs)
+    plt.show()
+# end of def show(timeline, num_of_PEs, DAGs)
+
+def render_files(timeline, num_of_PEs, DAGs, plot_dir):
+    '''!
+    Render the Gantt chart and the DAGs to PNG files, without a display.
+    @param timeline: Timeline of the completed tasks (see get_timeline)
+    @param num_of_PEs: Number of PEs in the SoC, including the memory
+    @param DAGs: DAGs of the applications (see get_DAGs)
+    @param plot_dir: Directory of the PNG files
+    @return List of the names of the PNG files
+    '''
+    from matplotlib.figure import Figure                                        # Figures are not managed by pyplot, so no window is opened
+
+    os.makedirs(plot_dir, exist_ok=True)
+    file_names = []
+    for DAG in DAGs:
+        fig = Figure()
+        draw_DAG(fig.add_subplot(111), DAG)
+        file_names.append(os.path.join(plot_dir, 'DAG_%s.png' % DAG[0]))
+        fig.savefig(file_names[-1])
+    fig = Figure(figsize=(10, 6))
+    draw_gantt(fig.add_subplot(111), timeline, num_of_PEs)
+    file_names.append(os.path.join(plot_dir, 'gantt.png'))
+    fig.savefig(file_names[-1])
+    return file_names
+# end of def render_files(timeline, num_of_PEs, DAGs, plot_dir)
+
+def render_in_background(timeline, num_of_PEs, DAGs, plot_dir):
+    '''!
+    Render the Gantt chart and the DAGs to PNG files in a separate process, so that the simulation does not wait for them.
+    The process is joined when the Python interpreter exits.
+    @param timeline: Timeline of the completed tasks (see get_timeline)
+    @param num_of_PEs: Number of PEs in the SoC, including the memory
+    @param DAGs: DAGs of the applications (see get_DAGs)
+    @param plot_dir: Directory of the PNG files
+    @return The multiprocessing.Process object of the rendering process
+    '''
+    process = multiprocessing.Process(target=render_files, args=(timeline, num_of_PEs, DAGs, plot_dir))
+    process.start()
+    return process
+# end of def render_in_background(timeline, num_of_PEs, DAGs, plot_dir)
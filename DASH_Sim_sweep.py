@@ -0,0 +1,179 @@
+'''!
+@brief This file contains the sweep orchestrator of DASH-Sim.
+
+A sweep runs a simulation for each point of a grid of configuration overrides, e.g.,
+run_sweep({'scheduler': ['MET', 'ETF'], 'scale_values': [[100], [200]]}).
+The overrides are options of config_file.ini, as in DASH_Sim_v0.simulate. Each point starts from the configuration that was
+last loaded (config_file.ini by default, or the one given to common.load_config), and loads it with its overrides in a forked
+worker process, so the variables derived from the options (e.g., snippet_size from max_jobs) follow the overrides,
+the points run concurrently and config_file.ini is never rewritten.
+The results are streamed into a single table, with a row for each point, scale value and continuation.
+If result_cache_dir is set in config_file.ini, the points that were simulated before are loaded from the result cache (see DASH_Sim_cache.py).
+'''
+import os
+import sys
+import csv
+import itertools
+import multiprocessing
+import concurrent.futures
+
+import common
+import DASH_Sim_v0
+import DASH_Sim_utils
+import DASH_Sim_cache
+
+## The trace files that are not numbered with trace_file_num, which are suffixed with the index of the point instead
+point_files = ['TRACE_FILE_FREQUENCY', 'TRACE_FILE_PES', 'TRACE_FILE_TEMPERATURE', 'TRACE_FILE_TEMPERATURE_WORKLOAD',
+               'TRACE_FILE_LOAD']
+
+## The section of each option of the configuration, indexed by the name of the option in lower case
+option_sections = {option.lower(): section for section, options in common.default_config.items() for option in options}
+
+def get_points(grid):
+    '''!
+    Get the points of a grid of configuration overrides.
+    @param grid: Dictionary of the values of each override, indexed by the name of the option in config_file.ini.
+                 A tuple of names overrides several options together (e.g., ('job_file', 'job_probabilities'))
+    @return List of points, each point is a dictionary of overrides
+    '''
+    names = list(grid.keys())
+    points = []
+    for values in itertools.product(*[grid[name] for name in names]):
+        point = {}
+        for name, value in zip(names, values):
+            if isinstance(name, tuple):
+                point.update(zip(name, value))
+            else:
+                point[name] = value
+        points.append(point)
+    return points
+# end of def get_points(grid)
+
+def get_base_config():
+    '''!
+    Get the configuration from which the points of a sweep start, i.e., the configuration that was last loaded by common.load_config.
+    @return Dictionary of the options of each section
+    '''
+    return {name: dict(section) for name, section in common.config.items()}
+# end of def get_base_config()
+
+def get_point_config(base_config, point):
+    '''!
+    Get the configuration of a point, i.e., the base configuration with the overrides of the point.
+    @param base_config: Dictionary of the options of each section (see get_base_config)
+    @param point: Dictionary of overrides, whose values are given as in config_file.ini or as Python values (e.g., [100] or True)
+    @return Dictionary of the options of each section
+    '''
+    config = {name: dict(section) for name, section in base_config.items()}
+    for name, value in point.items():
+        if isinstance(value, bool):
+            value = 'yes' if value else 'no'
+        config.setdefault(option_sections[name.lower()], {})[name] = str(value)
+    return config
+# end of def get_point_config(base_config, point)
+
+def check_grid(grid, base_config):
+    '''!
+    Check that the grid only overrides options of the configuration, and that each point is a valid configuration under performance mode.
+    @param grid: Dictionary of the values of each override, indexed by the name of the option in config_file.ini (see get_points)
+    @param base_config: Dictionary of the options of each section (see get_base_config)
+    @exception common.ConfigurationError: The sweep cannot be run with this configuration or grid
+    '''
+    for name in grid:
+        for option in (name if isinstance(name, tuple) else (name,)):
+            if option.lower() not in option_sections:
+                raise common.ConfigurationError('Could not find the option %s of the sweep\n'
+                                                'Please use the name of an option in config_file.ini' % option)
+    for point in get_points(grid):
+        if common.parse_config(get_point_config(base_config, point))['simulation_mode'] != 'performance':
+            raise common.ConfigurationError('A sweep can only be run under performance mode\n'
+                                            'Please set simulation_mode to performance in config_file.ini')
+# end of def check_grid(grid, base_config)
+
+def run_point(index, point, base_config):
+    '''!
+    Simulate a point of the sweep in a worker process.
+    The configuration of the point is loaded with common.load_config, so the next point of the worker process starts from
+    the base configuration again.
+    @param index: Index of the point, which numbers its trace files
+    @param point: Dictionary of overrides
+    @param base_config: Dictionary of the options of each section (see get_base_config)
+    @return List of the rows of the results table for this point
+    '''
+    common.load_config(get_point_config(base_config, point))
+    common.CLEAN_TRACES = False                                                 # The traces are cleaned once, at the start of the sweep
+    common.trace_file_num = index
+    common.num_of_processes = 1                                                 # The points already run in parallel
+    common.RESULTS = ''                                                         # The rows of the point are returned instead
+    for name in point_files:
+        setattr(common, name, os.path.splitext(getattr(common, name))[0] + '__' + str(index) + '.csv')
+
+    sim = DASH_Sim_v0.run_simulator()
+    sys.stdout.flush()
+
+    return [dict(point, scale=scale, continuation=continuation, **averages)
+            for (scale, continuation), averages in sim.averages.items()]
+# end of def run_point(index, point)
+
+def write_rows(csvfile, index, point_rows):
+    '''!
+    Append the rows of a point to the results table, and write the header before the first row.
+    @param csvfile: Results file, or None if the table is not written to a file
+    @param index: Index of the point
+    @param point_rows: List of the rows of the point
+    '''
+    if csvfile is None:
+        return
+    result_file = csv.writer(csvfile, delimiter=',')
+    for row in point_rows:
+        if csvfile.tell() == 0:
+            result_file.writerow(['point'] + list(row.keys()))
+        result_file.writerow([index] + list(row.values()))
+    csvfile.flush()
+# end of def write_rows(csvfile, index, point_rows)
+
+def run_sweep(grid, results_file=None, num_of_processes=None):
+    '''!
+    Simulate each point of a grid of configuration overrides in a pool of worker processes under performance mode.
+    @param grid: Dictionary of the values of each override, indexed by the name of the option in config_file.ini (see get_points)
+    @param results_file: CSV file to which the rows are written as soon as the points are completed, no file is written by default
+    @param num_of_processes: Number of worker processes, the number of CPUs by default
+    @return List of the rows of the results table, in the order of the points
+    '''
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise RuntimeError('Running a sweep is not supported on this platform')
+    base_config = get_base_config()
+    check_grid(grid, base_config)
+    points = get_points(grid)
+    if (common.CLEAN_TRACES):
+        DASH_Sim_utils.clean_traces()
+
+    rows = [[] for point in points]
+    keys = [None for point in points]
+    csvfile = open(results_file, 'w', newline='') if results_file is not None else None
+    sys.stdout.flush()                                                          # Otherwise, the buffered output is printed by each worker
+    try:
+        with concurrent.futures.ProcessPoolExecutor(num_of_processes, mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = {}
+            for index, point in enumerate(points):
+                if common.result_cache_dir:
+                    keys[index] = DASH_Sim_cache.get_key(get_point_config(base_config, point))
+                    cached_rows = DASH_Sim_cache.load(keys[index])
+                    if cached_rows is not None:                                 # The point was simulated before with the same configuration
+                        rows[index] = cached_rows
+                        write_rows(csvfile, index, rows[index])
+                        continue
+                futures[pool.submit(run_point, index, point, base_config)] = index
+
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                rows[index] = future.result()
+                if keys[index] is not None:
+                    DASH_Sim_cache.store(keys[index], rows[index])
+                write_rows(csvfile, index, rows[index])
+    finally:
+        if csvfile is not None:
+            csvfile.close()
+
+    return [row for point_rows in rows for row in point_rows]
+# end of def run_sweep(grid, results_file=None, num_of_processes=None)
@@ -3,17 +3,20 @@
 '''
 
 import os
+import io
 import csv
 import fnmatch
 import sys
+import pickle
+import hashlib
+import numpy as np
 
 import common
 
-trace_list = [common.TRACE_FILE_SYSTEM, common.TRACE_FILE_TASKS, common.TRACE_FILE_FREQUENCY, common.TRACE_FILE_PES, common.TRACE_FILE_TEMPERATURE, common.TRACE_FILE_LOAD, common.TRACE_FILE_TEMPERATURE_WORKLOAD]
-
-def update_PE_utilization_and_info(PE, current_timestamp):
+def update_PE_utilization_and_info(sim, PE, current_timestamp):
     '''!
     Update the PE utilization.
+    @param sim: The Simulation object
     @param PE: PE to be evaluated
     @param current_timestamp: Current timestamp
     '''
@@ -21,20 +24,18 @@ def update_PE_utilization_and_info(PE, current_timestamp):
 
     completed_info = []
     running_info = []
-    for task in common.TaskQueues.completed.list:
+    # Only the tasks of this PE that finished inside the window are visited
+    for task in sim.TaskQueues.completed.list.get_PE_history(PE.ID, lower_bound):
         #print('Time %s:'%current_timestamp, task.start_time, task.finish_time, task.PE_ID)
-        if task.PE_ID == PE.ID:
-            if ((task.start_time < lower_bound) and (task.finish_time < lower_bound)):
-                continue
-            elif ((task.start_time < lower_bound) and (task.finish_time >= lower_bound)):
-                completed_info.append(lower_bound)
-                completed_info.append(task.finish_time)
-            else:
-                completed_info.append(task.start_time)
-                completed_info.append(task.finish_time)
-            #print('Time %s:'%current_timestamp,'completed',completed_info, 'Task', task.ID, 'PE', PE.ID)
+        if (task.start_time < lower_bound):
+            completed_info.append(lower_bound)
+            completed_info.append(task.finish_time)
+        else:
+            completed_info.append(task.start_time)
+            completed_info.append(task.finish_time)
+        #print('Time %s:'%current_timestamp,'completed',completed_info, 'Task', task.ID, 'PE', PE.ID)
 
-    for task in common.TaskQueues.running.list:
+    for task in sim.TaskQueues.running.list:
         #print('Time %s:'%current_timestamp, task.start_time, task.PE_ID)
         if task.PE_ID == PE.ID:
             if (task.start_time < lower_bound):
@@ -60,9 +61,10 @@ def update_PE_utilization_and_info(PE, current_timestamp):
     #     print('Time %s: for PE-%d'%(current_timestamp,PE.ID),PE.info)
 
 
-def trace_frequency(timestamp):
+def trace_frequency(sim, timestamp):
     '''!
     Trace method for saving the frequency variations.
+    @param sim: The Simulation object
     @param timestamp: Current timestamp
     '''
     if (common.TRACE_FREQUENCY):
@@ -74,21 +76,22 @@ def trace_frequency(timestamp):
             trace = csv.writer(csvfile, delimiter=',')
             if create_header == True:
                 header_list = ['Timestamp']
-                for idx, current_cluster in enumerate(common.ClusterManager.cluster_list):
+                for idx, current_cluster in enumerate(sim.cluster_list):
                     if current_cluster.type != "MEM":
                         header_list.append('f_PE_' + str(idx))
                         header_list.append('N_PE_' + str(idx))
                 trace.writerow(header_list)
             data = [timestamp]
-            for idx, current_cluster in enumerate(common.ClusterManager.cluster_list):
+            for idx, current_cluster in enumerate(sim.cluster_list):
                 if current_cluster.type != "MEM":
                     data.append(current_cluster.current_frequency / 1000)
                     data.append(current_cluster.num_active_cores)
             trace.writerow(data)
 
-def trace_tasks(task, PE, task_time, total_energy):
+def trace_tasks(sim, task, PE, task_time, total_energy):
     '''!
     Trace method for saving statistics about the tasks.
+    @param sim: The Simulation object
     @param task: Task to be traced
     @param PE: Current PE
     @param task_time: Task's execution time
@@ -103,11 +106,12 @@ def trace_tasks(task, PE, task_time, total_energy):
             trace = csv.writer(csvfile, delimiter=',')
             if create_header == True:
                 trace.writerow(['DVFS policy', 'Task ID', 'PE', 'Exec. Time (us)', 'Energy (J)'])
-            trace.writerow([common.ClusterManager.cluster_list[PE.cluster_ID].DVFS, task.ID, common.ClusterManager.cluster_list[PE.cluster_ID].name, task_time, total_energy])
+            trace.writerow([sim.cluster_list[PE.cluster_ID].DVFS, task.ID, sim.cluster_list[PE.cluster_ID].name, task_time, total_energy])
 
-def trace_system():
+def trace_system(sim):
     '''!
     Trace method for saving statistics related to the system, i.e., the whole simulation.
+    @param sim: The Simulation object
     '''
     if (common.TRACE_SYSTEM):
         create_header = False
@@ -130,16 +134,16 @@ def trace_system():
                     split = str(DVFS_config).split('-')
                     DVFS_mode_list.append("C" + split[1])
             if common.simulation_mode == "validation":
-                trace.writerow([common.current_job_list, DVFS_mode_list, common.gen_trace_capacity_little, common.gen_trace_capacity_big,
-                                common.results.execution_time, common.results.execution_time, common.results.energy_consumption])
+                trace.writerow([sim.current_job_list, DVFS_mode_list, common.gen_trace_capacity_little, common.gen_trace_capacity_big,
+                                sim.results.execution_time, sim.results.execution_time, sim.results.energy_consumption])
             elif common.simulation_mode == "performance":
                 if len(common.job_list) == 1:
-                    job_list = common.current_job_list
+                    job_list = sim.current_job_list
                 else:
                     job_list = common.job_list
                 trace.writerow([job_list, DVFS_mode_list, common.gen_trace_capacity_little, common.gen_trace_capacity_big,
-                                common.results.execution_time - common.warmup_period, common.results.cumulative_exe_time,
-                                common.results.cumulative_energy_consumption])
+                                sim.results.execution_time - common.warmup_period, sim.results.cumulative_exe_time,
+                                sim.results.cumulative_energy_consumption])
 
 def trace_PEs(timestamp, PE):
     '''!
@@ -158,9 +162,10 @@ def trace_PEs(timestamp, PE):
                 dataset.writerow(['Timestamp', 'PE', 'Info'])
             dataset.writerow([timestamp, PE.ID, PE.info])
 
-def trace_temperature(timestamp):
+def trace_temperature(sim, timestamp):
     '''!
     Trace method for saving the temperature variations.
+    @param sim: The Simulation object
     @param timestamp: Current timestamp
     '''
     if (common.TRACE_TEMPERATURE):
@@ -172,11 +177,12 @@ def trace_temperature(timestamp):
             dataset = csv.writer(csvfile, delimiter=',')
             if create_header == True:
                 dataset.writerow(['Timestamp', 'Snippet', 'Temperature', 'Throttling_state'])
-            dataset.writerow([timestamp, common.current_job_list, max(common.current_temperature_vector), common.throttling_state])
+            dataset.writerow([timestamp, sim.current_job_list, max(sim.current_temperature_vector), sim.throttling_state])
 
-def trace_load(timestamp, PEs):
+def trace_load(sim, timestamp, PEs):
     '''!
     Trace method for saving the load variations
+    @param sim: The Simulation object
     @param timestamp: Current timestamp
     @param PEs: List of PEs
     '''
@@ -189,14 +195,14 @@ def trace_load(timestamp, PEs):
             dataset = csv.writer(csvfile, delimiter=',')
             if create_header == True:
                 header_list = ['Timestamp', 'Snippet']
-                for idx, current_cluster in enumerate(common.ClusterManager.cluster_list):
+                for idx, current_cluster in enumerate(sim.cluster_list):
                     if current_cluster.type != "MEM":
                         header_list.append('N_tasks_PE_' + str(idx))
                 header_list.append('N_tasks_total')
                 dataset.writerow(header_list)
-            data = [timestamp, common.current_job_list]
+            data = [timestamp, sim.current_job_list]
             total_num_tasks = 0
-            for idx, current_cluster in enumerate(common.ClusterManager.cluster_list):
+            for idx, current_cluster in enumerate(sim.cluster_list):
                 if current_cluster.type != "MEM":
                     num_tasks = get_num_tasks_being_executed(current_cluster, PEs)
                     data.append(num_tasks)
@@ -204,14 +210,15 @@ def trace_load(timestamp, PEs):
             data.append(total_num_tasks)
             dataset.writerow(data)
 
-def get_current_job_list():
+def get_current_job_list(sim):
     '''!
     Get the current snippet.
+    @param sim: The Simulation object
     @return Current snippet
     '''
     # Get the current job list based on the snippet ID while injecting jobs
     if common.job_list != []:
-        return common.job_list[common.snippet_ID_exec]
+        return common.job_list[sim.snippet_ID_exec]
     else:
         return common.job_list
 
@@ -246,6 +253,7 @@ def clean_traces():
     '''!
     Remove old trace files.
     '''
+    trace_list = [common.TRACE_FILE_SYSTEM, common.TRACE_FILE_TASKS, common.TRACE_FILE_FREQUENCY, common.TRACE_FILE_PES, common.TRACE_FILE_TEMPERATURE, common.TRACE_FILE_LOAD, common.TRACE_FILE_TEMPERATURE_WORKLOAD]
     for trace_name in trace_list:
         if os.path.exists(trace_name):
             os.remove(trace_name)
@@ -263,25 +271,124 @@ def clean_policies():
     for f in file_list:
         os.remove(f)
 
-def init_variables_at_sim_start() :
+## Compiled configurations kept in memory by a long-lived process (e.g., the simulation daemon), indexed by compiled file name
+## None keeps the compiled configurations only in compiled_config_dir
+compiled_in_memory = None
+
+def get_compiled_file(file_name, source_files, values):
+    '''!
+    Get the name of the compiled version of a configuration file, which is a pickle of the parsed configuration.
+    The name contains a hash of the configuration file, the source files of the parser and the configuration values used by the parser,
+    so any change to them selects another compiled file.
+    @param file_name: Configuration file (e.g., config_SoC/SoC.MULTIPLE_BAL.txt)
+    @param source_files: List of the source files that define the parser and the parsed objects
+    @param values: List of the configuration values that the parsed configuration depends on
+    @return Name of the compiled file, or None if the compiled configurations are disabled or the configuration file cannot be read
+    '''
+    if not common.compiled_config_dir and compiled_in_memory is None:
+        return None
+    digest = hashlib.sha256()
+    try:
+        for input_file_name in [file_name] + source_files:
+            with open(input_file_name, 'rb') as input_file:
+                digest.update(input_file.read())
+    except OSError:
+        return None                                                             # The parser reports the missing file
+    digest.update(repr(values).encode())
+    return os.path.join(common.compiled_config_dir, os.path.basename(file_name) + '.' + digest.hexdigest()[:16] + '.pkl')
+
+class TablePickler(pickle.Pickler):
+    '''!
+    Define the TablePickler class, which pickles a parsed configuration without its numerical tables (e.g., performance, comm_band
+    and comm_vol). The tables are appended to a single flat table instead, and the pickle only references them.
+    '''
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.tables = []                        # Flattened tables, in the order of their offsets
+        self.size = 0                           # Size of the flat table
+    # end of def __init__(self, file)
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray) and obj.dtype == np.float64 and obj.size > 0:
+            self.tables.append(obj.ravel())
+            self.size += obj.size
+            return ('table', self.size - obj.size, obj.shape)
+        return None                                                             # Pickled as usual
+    # end of def persistent_id(self, obj)
+# end class TablePickler
+
+class TableUnpickler(pickle.Unpickler):
+    '''!
+    Define the TableUnpickler class, which loads a parsed configuration pickled by TablePickler.
+    The tables are read-only views of the flat table, so they are not copied.
+    '''
+    def __init__(self, file, table):
+        super().__init__(file)
+        self.table = table                      # Flat table of the parsed configuration
+    # end of def __init__(self, file, table)
+
+    def persistent_load(self, pid):
+        _, offset, shape = pid
+        return self.table[offset:offset + int(np.prod(shape))].reshape(shape)
+    # end of def persistent_load(self, pid)
+# end class TableUnpickler
+
+def load_compiled(compiled_file):
+    '''!
+    Load a compiled configuration.
+    Its tables are attached from the flat table of the compiled configuration (a memory-mapped .npy file next to the compiled file,
+    or the table kept in memory), so all processes that load the same configuration share a single read-only copy of the tables.
+    @param compiled_file: Name of the compiled file, or None
+    @return The parsed configuration, or None if it was not compiled yet
+    '''
+    if compiled_file is None:
+        return None
+    if compiled_in_memory is not None and compiled_file in compiled_in_memory:
+        compiled_configuration, table = compiled_in_memory[compiled_file]
+    elif common.compiled_config_dir:
+        try:
+            with open(compiled_file, 'rb') as input_file:
+                compiled_configuration = input_file.read()
+            table = np.load(os.path.splitext(compiled_file)[0] + '.npy', mmap_mode='r').view(np.ndarray)
+        except (OSError, ValueError):
+            return None
+        if compiled_in_memory is not None:
+            compiled_in_memory[compiled_file] = (compiled_configuration, table)
+    else:
+        return None
+    try:
+        return TableUnpickler(io.BytesIO(compiled_configuration), table).load()   # Each simulation gets its own copy of the other objects
+    except (EOFError, pickle.UnpicklingError, ValueError):
+        return None
+
+def store_compiled(compiled_file, parsed_configuration):
     '''!
-    Initialize config variables.
+    Store a compiled configuration, so that the next simulations load it instead of parsing the configuration file.
+    The tables of the configuration are stored in a single .npy file, which is memory-mapped by load_compiled.
+    @param compiled_file: Name of the compiled file, or None
+    @param parsed_configuration: The parsed configuration
     '''
-    common.snippet_start_time = common.warmup_period
-    common.snippet_ID_inj = -1
-    common.snippet_ID_exec = 0
-    common.snippet_throttle = -1
-    common.snippet_temp_list = []
-    common.snippet_initial_temp = [common.T_ambient,
-                                   common.T_ambient,
-                                   common.T_ambient,
-                                   common.T_ambient,
-                                   common.T_ambient]
-    common.current_temperature_vector = [common.T_ambient,  # Indicate the current PE temperature for each hotspot
-                                         common.T_ambient,
-                                         common.T_ambient,
-                                         common.T_ambient,
-                                         common.T_ambient]
-    common.B_model = []
-    common.job_counter_list = [0]*len(common.current_job_list)
-    common.throttling_state = -1
+    if compiled_file is None:
+        return
+    output = io.BytesIO()
+    pickler = TablePickler(output)
+    pickler.dump(parsed_configuration)
+    compiled_configuration = output.getvalue()
+    table = np.concatenate(pickler.tables) if pickler.tables else np.zeros(1)   # An empty file cannot be memory-mapped
+    if compiled_in_memory is not None:
+        table.flags.writeable = False
+        compiled_in_memory[compiled_file] = (compiled_configuration, table)
+    if not common.compiled_config_dir:
+        return
+    try:
+        os.makedirs(common.compiled_config_dir, exist_ok=True)
+        table_file = io.BytesIO()
+        np.save(table_file, table)
+        # The table is written before the compiled file, which references it
+        for file_name, contents in [(os.path.splitext(compiled_file)[0] + '.npy', table_file.getvalue()), (compiled_file, compiled_configuration)]:
+            temp_file_name = file_name + '.' + str(os.getpid())                 # Written aside, so that other simulations never read a partial file
+            with open(temp_file_name, 'wb') as output_file:
+                output_file.write(contents)
+            os.replace(temp_file_name, file_name)
+    except OSError:
+        print('[I] Could not store the compiled configuration %s' % compiled_file)
@@ -2,15 +2,14 @@
 @brief This file is the main() function which should be run to get the simulation results.
 '''
 import simpy
-import configparser
-import matplotlib.pyplot as plt                                                 
 import random                                                                  
 import numpy as np
 import sys
 import os
-import networkx as nx
 import pickle
 import csv
+import multiprocessing
+import concurrent.futures
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 warnings.simplefilter(action='ignore', category=UserWarning)
@@ -24,66 +23,352 @@ import processing_element
 import DASH_Sim_core                                                            # The core of the simulation engine (SimulationManager) is defined DASH_Sim_core.py
 import scheduler                                                                # The DASH-Sim uses the scheduler defined in scheduler.py
 import DASH_Sim_utils
+import DASH_Sim_plots
+import DTPM_policies
 
-def run_simulator(scale_values=common.scale_values_list):
+def run_until_end(env, sim_done):
+    '''!
+    Run the simulation environment until the end of the iteration under performance mode.
+    @param env: Pointer to the current simulation environment
+    @param sim_done: Simpy event object to indicate whether the simulation must be finished
+    '''
+    if common.inject_fixed_num_jobs is False:
+        env.run(until = common.simulation_length)
+    else:
+        env.run(until = sim_done)
+# end of def run_until_end(env, sim_done)
+
+def report_iteration(sim, iteration):
+    '''!
+    Print the results of an iteration under performance mode.
+    The results file is written by write_results, in the process that merges the iterations.
+    @param sim: The Simulation object
+    @param iteration: Index of the iteration
+    '''
+    if (common.INFO_JOB):
+        print('[I] Completed iteration: %d' %(iteration+1))
+        print('[I] Number of injected jobs: %d' %(sim.results.injected_jobs))
+        print('[I] Number of completed jobs: %d' %(sim.results.completed_jobs))
+        try:
+            print('[I] Ave latency: %f'
+            %(sim.results.cumulative_exe_time/sim.results.completed_jobs))
+        except ZeroDivisionError:
+            print('[I] No completed jobs')
+        print("[I] %-30s : %-20s" % ("Execution time(us)", round(sim.results.execution_time - common.warmup_period, 2)))
+        print("[I] %-30s : %-20s" % ("Cumulative Execution time(us)", round(sim.results.cumulative_exe_time, 2)))
+        print("[I] %-30s : %-20s" % ("Total energy consumption(J)",
+                                     round(sim.results.cumulative_energy_consumption, 6)))
+        print("[I] %-30s : %-20s" % ("EDP",
+                                     round((sim.results.execution_time - common.warmup_period) * sim.results.cumulative_energy_consumption, 2)))
+        print("[I] %-30s : %-20s" % ("Average concurrent jobs", round(sim.results.average_job_number, 2)))
+        DASH_Sim_utils.trace_system(sim)
+# end of def report_iteration(sim, iteration)
+
+def write_results(result):
+    '''!
+    Write the results of an iteration to the results file under performance mode.
+    The iterations are written by the process that merges them, in the serial order, even if they are simulated in a pool of processes.
+    @param result: Dictionary of the results of the iteration (see get_iteration_results)
+    '''
+    if not common.INFO_JOB or not common.RESULTS:
+        return                                                                  # The results file is disabled, e.g., in the workers of a sweep
+    if not os.path.exists(common.RESULTS):
+        with open(common.RESULTS, 'w', newline='') as csvfile:
+            result_file = csv.writer(csvfile, delimiter=',')
+            result_file.writerow(['Execution time(us)', 'Total energy consumption(J)', 'EDP'])
+    with open(common.RESULTS, 'a', newline='') as csvfile:
+        result_file = csv.writer(csvfile, delimiter=',')
+        result_file.writerow([result['execution_time'], result['energy'], result['EDP']])
+# end of def write_results(result)
+
+def get_iteration_results(sim, PEs):
+    '''!
+    Get the results of an iteration under performance mode, which are averaged over all iterations.
+    @param sim: The Simulation object
+    @param PEs: The PEs available in the current SoC
+    @return Dictionary of the results of the iteration
+    '''
+    try:
+        job_execution_time = sim.results.cumulative_exe_time / sim.results.completed_jobs                      # find the mean job duration value for this iteration
+    except ZeroDivisionError:
+        job_execution_time = 0
+
+    return {'job_execution_time'  : job_execution_time,
+            'job_injection_rate'  : sim.results.injected_jobs / (sim.results.execution_time - common.warmup_period),
+            'job_completion_rate' : sim.results.completed_jobs / (sim.results.execution_time - common.warmup_period),
+            'concurrent_jobs'     : sim.results.average_job_number,
+            'active_time'         : [PE.active/sim.results.execution_time for PE in PEs],
+            'blocking_time'       : [PE.blocking/sim.results.execution_time for PE in PEs],
+            'execution_time'      : sim.results.execution_time - common.warmup_period,
+            'energy'              : sim.results.cumulative_energy_consumption,
+            'EDP'                 : (sim.results.execution_time - common.warmup_period) * sim.results.cumulative_energy_consumption}
+# end of def get_iteration_results(sim, PEs)
+
+def fork_after_warmup(sim, env, sim_done, sim_core, job_gen, PEs, resource_matrix, jobs, iteration):
+    '''!
+    Simulate the warmup period once, and fork a process for each continuation given in warmup_forks.
+    A forked process starts from a copy of the whole simulation state (queues, PEs, clusters, temperatures, job generator and
+    random number generators), so each continuation only simulates the rest of the iteration.
+    @param sim: The Simulation object
+    @param env: Pointer to the current simulation environment
+    @param sim_done: Simpy event object to indicate whether the simulation must be finished
+    @param sim_core: SimulationManager object
+    @param job_gen: JobGenerator object
+    @param PEs: The PEs available in the current SoC
+    @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
+    @param jobs: The list of all jobs given to DASH-Sim
+    @param iteration: Index of the iteration
+    @return Dictionary of the results of the iteration, indexed by continuation
+    '''
+    if common.warmup_period > 0:
+        env.run(until = common.warmup_period)
+
+    # The random module is reseeded in a forked process, so its state is passed to the continuations
+    random_state = random.getstate()
+    sys.stdout.flush()                                                          # Otherwise, the buffered output is printed by each forked process
+
+    fork_context = multiprocessing.get_context('fork')
+    forks = []
+    for continuation in common.warmup_forks:
+        receiver, sender = fork_context.Pipe(duplex=False)
+        process = fork_context.Process(target=run_continuation,
+                                       args=(sim, env, sim_done, sim_core, job_gen, PEs, resource_matrix, jobs, iteration, continuation, random_state, sender))
+        process.start()
+        sender.close()
+        forks.append((continuation, receiver, process))
+
+    iteration_results = {}
+    for continuation, receiver, process in forks:
+        iteration_results[continuation], sim.continuations[continuation] = receiver.recv()
+        process.join()
+    return iteration_results
+# end of def fork_after_warmup(sim, env, sim_done, sim_core, job_gen, PEs, resource_matrix, jobs, iteration)
+
+def run_continuation(sim, env, sim_done, sim_core, job_gen, PEs, resource_matrix, jobs, iteration, continuation, random_state, sender):
+    '''!
+    Simulate the rest of an iteration in a forked process, with the scheduler and DVFS policy of the continuation.
+    @param sim: The Simulation object
+    @param env: Pointer to the current simulation environment
+    @param sim_done: Simpy event object to indicate whether the simulation must be finished
+    @param sim_core: SimulationManager object
+    @param job_gen: JobGenerator object
+    @param PEs: The PEs available in the current SoC
+    @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
+    @param jobs: The list of all jobs given to DASH-Sim
+    @param iteration: Index of the iteration
+    @param continuation: Scheduler name, optionally followed by ':' and the DVFS policy of the clusters (e.g., MET:ondemand)
+    @param random_state: State of the random module at the end of the warmup period
+    @param sender: Connection used to send the results back to the parent process
+    '''
+    random.setstate(random_state)
+
+    scheduler_name, _, DVFS = continuation.partition(':')
+    if scheduler_name != sim_core.scheduler.name:
+        DASH_scheduler = scheduler.Scheduler(sim, env, resource_matrix, scheduler_name, PEs, jobs)
+        sim_core.scheduler = DASH_scheduler
+        job_gen.scheduler = DASH_scheduler
+
+    if DVFS:
+        for cluster in sim.cluster_list:
+            if cluster.DVFS != 'none':
+                cluster.DVFS = DVFS
+                cluster.current_frequency = 0                                   # Initialize the frequency again for the new policy
+                DTPM_policies.initialize_frequency(cluster)
+                sim_core.DTPM_module.replan_tasks(cluster)
+
+    if (common.INFO_JOB):
+        print('[I] Continuing iteration %d with %s after the warmup period' %(iteration+1, continuation))
+
+    run_until_end(env, sim_done)
+    report_iteration(sim, iteration)
+    sender.send((get_iteration_results(sim, PEs), sim.results))
+    sender.close()
+# end of def run_continuation(sim, env, sim_done, sim_core, job_gen, PEs, resource_matrix, jobs, iteration, continuation, random_state, sender)
+
+def run_iteration(sim, resource_matrix, jobs, scale, iteration):
+    '''!
+    Simulate one iteration for a given scale value under performance mode.
+    @param sim: The Simulation object
+    @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
+    @param jobs: The list of all jobs given to DASH-Sim
+    @param scale: The scale value, which determines the job arrival rate
+    @param iteration: Index of the iteration
+    @return Dictionary of the results of the iteration, indexed by continuation
+    '''
+    sim.scale = scale
+
+    ## Initialize variables at simulation start
+    sim.init_variables_at_sim_start()
+
+    ## Set a global iteration variable
+    sim.iteration = iteration
+
+    random.seed(iteration)                                                      # user can regenerate the same results by assigning a value to $random_seed in configuration file
+    np.random.seed(iteration)
+
+    # Instantiate the PerfStatics object that contains all the performance statics
+    sim.results = common.PerfStatics()
+    sim.computation_dict = {}
+    sim.current_dag = None
+
+    # Set up the Python Simulation (simpy) environment
+    env = simpy.Environment(initial_time=0)
+    sim_done = env.event()
+
+    # Construct the processing elements in the target DSSoC
+    DASH_resources = []
+    for i,resource in enumerate(resource_matrix.list):
+        # Define the PEs (resources) in simpy environment
+        new_PE = processing_element.PE(sim, env, resource.type, resource.name,
+                                       resource.ID, resource.cluster_ID, resource.capacity) # Generate a new PE with this generic process
+        DASH_resources.append(new_PE)
+    # end for
+
+    # Construct the scheduler
+    DASH_scheduler = scheduler.Scheduler(sim, env, resource_matrix, common.scheduler,
+                                         DASH_resources, jobs)
+
+    if (common.INFO_JOB):
+        print('[I] Starting iteration: %d' %(iteration+1))
+
+    job_gen = job_generator.JobGenerator(sim, env, resource_matrix, jobs, DASH_scheduler, DASH_resources)
+
+    sim_core = DASH_Sim_core.SimulationManager(sim, env, sim_done, job_gen, DASH_scheduler, DASH_resources,
+                                               jobs, resource_matrix)
+
+    if common.warmup_forks:
+        # Simulate the warmup period once, and the rest of the iteration in a forked process for each continuation
+        return fork_after_warmup(sim, env, sim_done, sim_core, job_gen, DASH_resources,
+                                 resource_matrix, jobs, iteration)
+
+    run_until_end(env, sim_done)
+
+    # Now, the simulation has completed
+    # Next, process the results
+    report_iteration(sim, iteration)
+    return {common.scheduler: get_iteration_results(sim, DASH_resources)}
+# end of def run_iteration(sim, resource_matrix, jobs, scale, iteration)
+
+## The state shared with the worker processes of run_iterations_in_pool, which is inherited when the workers are forked
+pool_state = None
+
+def init_pool_worker(sim, resource_matrix, jobs):
+    '''!
+    Keep the parsed SoC and jobs in a worker process of run_iterations_in_pool, so that they are not sent with each point.
+    @param sim: The Simulation object
+    @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
+    @param jobs: The list of all jobs given to DASH-Sim
+    '''
+    global pool_state
+    pool_state = (sim, resource_matrix, jobs)
+# end of def init_pool_worker(sim, resource_matrix, jobs)
+
+def run_pool_point(point):
+    '''!
+    Simulate one (scale, iteration) point in a worker process of run_iterations_in_pool.
+    @param point: Tuple of the scale value and the index of the iteration
+    @return Tuple of the results of the iteration, and the results and continuations of the Simulation object
+    '''
+    sim, resource_matrix, jobs = pool_state
+    sim.continuations = {}
+    iteration_results = run_iteration(sim, resource_matrix, jobs, *point)
+    sys.stdout.flush()
+    return iteration_results, sim.results, sim.continuations
+# end of def run_pool_point(point)
+
+def run_iterations_in_pool(sim, resource_matrix, jobs):
+    '''!
+    Simulate all (scale, iteration) points of the performance mode in a pool of num_of_processes worker processes.
+    Each point is independent, since it seeds the random number generators with its iteration, so the results are the same as
+    the serial ones. The Simulation object is left with the results of the last point, as in the serial case.
+    @param sim: The Simulation object
+    @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
+    @param jobs: The list of all jobs given to DASH-Sim
+    @return Dictionary of the results of each iteration, indexed by (index of the scale value, iteration)
+    '''
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise common.ConfigurationError('Running the simulation in a process pool is not supported on this platform\n'
+                                        'Please set num_of_processes to 1 in config_file.ini')
+
+    points = [(scale, iteration) for scale in common.scale_values_list for iteration in range(common.num_of_iterations)]
+    keys = [(ind, iteration) for ind in range(len(common.scale_values_list)) for iteration in range(common.num_of_iterations)]
+
+    sys.stdout.flush()                                                          # Otherwise, the buffered output is printed by each worker
+    pool_results = {}
+    with concurrent.futures.ProcessPoolExecutor(common.num_of_processes, mp_context=multiprocessing.get_context('fork'),
+                                                initializer=init_pool_worker, initargs=(sim, resource_matrix, jobs)) as pool:
+        for key, (iteration_results, sim.results, sim.continuations) in zip(keys, pool.map(run_pool_point, points)):
+            pool_results[key] = iteration_results
+
+    sim.scale, sim.iteration = points[-1]
+    return pool_results
+# end of def run_iterations_in_pool(sim, resource_matrix, jobs)
+
+def run_simulator(scale_values=None):
     '''!
     Parse the job and SoC configurations and execute the simulation environment with the parameters from config_file.ini
+    The configuration is read once, when a variable of common is first used (or given to simulate), so the parameters can be changed
+    between simulations by assigning the variables in common (e.g., common.scheduler), without rewriting config_file.ini.
+    The configuration is kept in the module variables of common, i.e., there is one configuration per process. Therefore,
+    simulations with different configurations must run one after another, or in separate processes (e.g., DASH_Sim_sweep.py),
+    not concurrently in threads of one process. scale_values also replaces common.scale_values_list for the later simulations.
     @param scale_values: Optional input to select specific scale values. Default value is defined in the config_file.ini
+    @return The Simulation object, which holds the state and the results of the last simulation
+    @exception common.ConfigurationError: The configuration, or a SoC or job file, has an invalid value
     '''
+    if scale_values is not None:
+        common.scale_values_list = list(scale_values)
 
     #common.clear_screen()                                                           # Clear IPthon Console screen at the beginning of each simulation
     print('%59s'%('**** Welcome to DASH_Sim.v0 ****'))
     print('%65s'%('**** \xa9 2020 eLab ASU ALL RIGHTS RESERVED ****'))
 
+    # Instantiate the Simulation object that holds the state of the simulation
+    sim = common.Simulation()
+
     # Instantiate the ResourceManager object that contains all the resources
     # in the target DSSoC
     resource_matrix = common.ResourceManager()                                      # This line generates an empty resource matrixesource_matrix = common.ResourceManager()                                      # This line generates an empty resource matrix
-    config = configparser.ConfigParser()
-    config.read('config_file.ini')
-    resource_file = "config_SoC/" + config['DEFAULT']['resource_file']
-    DASH_SoC_parser.resource_parse(resource_matrix, resource_file)                  # Parse the input configuration file to populate the resource matrix
-    
-    common.scheduler = config['DEFAULT']['scheduler']                               # Assign scheduler name variable
-    config_scale_values = config['SIMULATION MODE']['scale_values']
-    common.scale_values_list = common.str_to_list(config_scale_values)
+    resource_file = "config_SoC/" + common.resource_file
+    DASH_SoC_parser.resource_parse(sim, resource_matrix, resource_file)             # Parse the input configuration file to populate the resource matrix
+
+    if common.DVFS_mode:
+        for cluster in sim.cluster_list:                                            # Override the DVFS mode given in the SoC file
+            if cluster.DVFS != 'none':
+                cluster.DVFS = common.DVFS_mode
 
-    plt.close('all')                                                                # close all existing plots before the new simulation
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].close('all')                               # close all existing plots before the new simulation
     if (common.CLEAN_TRACES):
         DASH_Sim_utils.clean_traces()
 
-    for cluster in common.ClusterManager.cluster_list:
+    for cluster in sim.cluster_list:
         if cluster.DVFS != 'none':
             if len(cluster.trip_freq) != len(common.trip_temperature) or len(cluster.trip_freq) != len(common.trip_hysteresis):
-                print("[E] The trip points must match in size:")
-                print("[E] Trip frequency (SoC file):      {} (Cluster {})".format(len(cluster.trip_freq), cluster.ID))
-                print("[E] Trip temperature (config file): {}".format(len(common.trip_temperature)))
-                print("[E] Trip hysteresis (config file):  {}".format(len(common.trip_hysteresis)))
-                sys.exit()
+                raise common.ConfigurationError("The trip points must match in size:\n"
+                                                "Trip frequency (SoC file):      {} (Cluster {})\n"
+                                                "Trip temperature (config file): {}\n"
+                                                "Trip hysteresis (config file):  {}".format(len(cluster.trip_freq), cluster.ID,
+                                                                                           len(common.trip_temperature), len(common.trip_hysteresis)))
             if len(cluster.power_profile) != len(cluster.PG_profile):
-                print("[E] The power and PG profiles must match in size, please check the SoC file")
-                print("[E] Cluster ID: {}, Num power points: {}, PG power points: {}".format(cluster.ID, len(cluster.power_profile), len(cluster.PG_profile)))
-                sys.exit()
+                raise common.ConfigurationError("The power and PG profiles must match in size, please check the SoC file\n"
+                                                "Cluster ID: {}, Num power points: {}, PG power points: {}".format(cluster.ID, len(cluster.power_profile), len(cluster.PG_profile)))
 
     # Instantiate the ApplicationManager object that contains all the jobs
     # in the target DSSoC
     jobs = common.ApplicationManager()                                              # This line generates an empty list for all jobs
-    job_files_list = ["config_Jobs/" + f for f in common.str_to_list(config['DEFAULT']['job_file'])]
+    job_files_list = ["config_Jobs/" + f for f in common.job_files]
     for job_file in job_files_list:
         job_parser.job_parse(jobs, job_file)                                        # Parse the input job file to populate the job list
 
-    ## Initialize variables at simulation start
-    DASH_Sim_utils.init_variables_at_sim_start()
-
     if common.job_list == []:
         if len(common.job_probabilities) != len(job_files_list):
-            print("[E] The length of the application list (job_file) must match the job_probabilities configuration.")
-            print("[E] Please check these parameters in the config_file.ini")
-            sys.exit()
+            raise common.ConfigurationError("The length of the application list (job_file) must match the job_probabilities configuration.\n"
+                                            "Please check these parameters in the config_file.ini")
     else:
         if len(common.job_list[0]) != len(job_files_list):
-            print("[E] The length of the application list (job_file) must match each snippet in the job_list configuration.")
-            print("[E] Please check these parameters in the config_file.ini")
-            sys.exit()
+            raise common.ConfigurationError("The length of the application list (job_file) must match each snippet in the job_list configuration.\n"
+                                            "Please check these parameters in the config_file.ini")
 
     # Check whether the resource_matrix and task list are initialized correctly
     if (common.DEBUG_CONFIG):
@@ -102,7 +387,7 @@ def run_simulator(scale_values=common.scale_values_list):
             for ii in range(curr_resource.num_of_functionalities):
                 print ('%4s'%('')+curr_resource.supported_functionalities[ii],
                        curr_resource.performance[ii])
-        print('\nCommunication Bandwidth matrix between Resources is\n', common.ResourceManager.comm_band)
+        print('\nCommunication Bandwidth matrix between Resources is\n', sim.comm_band)
             # end for ii
         # end for i
 
@@ -135,10 +420,10 @@ def run_simulator(scale_values=common.scale_values_list):
         # Provide the value of the seed for the random variables
         random.seed(common.seed)  # user can regenerate the same results by assigning a value to $random_seed in configuration file
         np.random.seed(common.seed)
-        common.iteration = 1 # set the iteration value
+        sim.iteration = 1 # set the iteration value
 
         # Instantiate the PerfStatics object that contains all the performance statics
-        common.results = common.PerfStatics()
+        sim.results = common.PerfStatics()
 
         # Set up the Python Simulation (simpy) environment
         env = simpy.Environment(initial_time=0)
@@ -149,13 +434,13 @@ def run_simulator(scale_values=common.scale_values_list):
 
         for i,resource in enumerate(resource_matrix.list):
             # Define the PEs (resources) in simpy environment
-            new_PE = processing_element.PE(env, resource.type, resource.name,
+            new_PE = processing_element.PE(sim, env, resource.type, resource.name,
                                            resource.ID, resource.cluster_ID, resource.capacity) # Generate a new PE with this generic process
             DASH_resources.append(new_PE)
         # end for
 
         # Construct the scheduler
-        DASH_scheduler = scheduler.Scheduler(env, resource_matrix, common.scheduler,
+        DASH_scheduler = scheduler.Scheduler(sim, env, resource_matrix, common.scheduler,
                                              DASH_resources, jobs)
 
         # Check whether PEs are initialized correctly
@@ -167,24 +452,23 @@ def run_simulator(scale_values=common.scale_values_list):
         # Start the simulation engine
         print('[I] Starting the simulation under VALIDATION MODE...')
 
-        job_gen = job_generator.JobGenerator(env, resource_matrix, jobs, DASH_scheduler, DASH_resources)
+        job_gen = job_generator.JobGenerator(sim, env, resource_matrix, jobs, DASH_scheduler, DASH_resources)
 
-        sim_core = DASH_Sim_core.SimulationManager(env, sim_done, job_gen, DASH_scheduler, DASH_resources,
+        sim_core = DASH_Sim_core.SimulationManager(sim, env, sim_done, job_gen, DASH_scheduler, DASH_resources,
                                                   jobs, resource_matrix)
 
 
         env.run(until = common.simulation_length)
 
         
-        job_execution_time += common.results.cumulative_exe_time / common.results.completed_jobs                           # find the mean job duration
+        job_execution_time += sim.results.cumulative_exe_time / sim.results.completed_jobs                           # find the mean job duration
 
         print('[I] Completed Simulation ...')
-        for job in common.Validation.generated_jobs:
-            if job in common.Validation.completed_jobs:
+        for job in sim.validation.generated_jobs:
+            if job in sim.validation.completed_jobs:
                 continue
             else:
-              print('[E] Not all generated jobs are completed')
-              sys.exit()
+              raise RuntimeError('Not all generated jobs are completed')
         print('[I] And, simulation is validated, successfully.')
         print('\nSimulation Parameters')
         print("-"*55)
@@ -195,54 +479,26 @@ def run_simulator(scale_values=common.scale_values_list):
         print("%-30s : %-20d"%("Simulation length(us)",common.simulation_length))
         print('\nSimulation Statitics')
         print("-"*55)
-        print("%-30s : %-20s" % ("Execution time(us)", round(common.results.execution_time, 2)))
-        print("%-30s : %-20s" % ("Cumulative Execution time(us)", round(common.results.cumulative_exe_time, 2)))
+        print("%-30s : %-20s" % ("Execution time(us)", round(sim.results.execution_time, 2)))
+        print("%-30s : %-20s" % ("Cumulative Execution time(us)", round(sim.results.cumulative_exe_time, 2)))
         print("%-30s : %-20s"%("Avg execution time(us)",job_execution_time))
         print("%-30s : %-20s" % ("Total energy consumption(uJ)",
-                                 round(common.results.energy_consumption, 2)))
+                                 round(sim.results.energy_consumption, 2)))
         print("%-30s : %-20s" % ("EDP",
-                                 round(common.results.execution_time * common.results.energy_consumption, 2)))
-        DASH_Sim_utils.trace_system()
+                                 round(sim.results.execution_time * sim.results.energy_consumption, 2)))
+        DASH_Sim_utils.trace_system(sim)
         # End of simpy simulation
 
-        plot_gantt_chart = True
-        if plot_gantt_chart:
-            # Creating a text based Gantt chart to visualize the simulation
-            job_ID = -1
-            ilen = len(resource_matrix.list) - 1  # since the last PE is the memory
-            pos = np.arange(0.5, ilen * 0.5 + 0.5, 0.5)
-            fig = plt.figure(figsize=(10, 6))
-            # fig = plt.figure(figsize=(10,3.5))
-            ax = fig.add_subplot(111)
-            color_choices = ['red', 'blue', 'green', 'cyan', 'magenta']
-            for i in range(len(resource_matrix.list)):
-                for ii, task in enumerate(common.TaskQueues.completed.list):
-                    if (i == task.PE_ID):
-                        end_time = task.finish_time
-                        start_time = task.start_time
-                        ax.barh((i * 0.5) + 0.5, end_time - start_time, left=start_time,
-                                height=0.3, align='center', edgecolor='black', color='white', alpha=0.95)
-                        # Retrieve the job ID which the current task belongs to
-                        for iii, job in enumerate(jobs.list):
-                            if (job.name == task.jobname):
-                                job_ID = iii
-                        ax.text(0.5 * (start_time + end_time - len(str(task.ID)) - 0.25), (i * 0.5) + 0.5 - 0.03125,
-                                task.ID, color=color_choices[(task.jobID) % 5], fontweight='bold', fontsize=18, alpha=0.75)
-            # color_choices[(task.jobID)% 5]
-            # color_choices[job_ID]
-            # locsy, labelsy = plt.yticks(pos, ['P0','P1','P2']) #
-            locsy, labelsy = plt.yticks(pos, range(len(resource_matrix.list)))
-            plt.ylabel('Processing Element', fontsize=18)
-            plt.xlabel('Time', fontsize=18)
-            plt.tick_params(labelsize=16)
-            # plt.title('DASH-Sim - %s' %(common.scheduler), fontsize =18)
-            plt.setp(labelsy, fontsize=18)
-            ax.set_ylim(bottom=-0.1, top=ilen * 0.5 + 0.5)
-            ax.set_xlim(left=-5)
-            ax.grid(color='g', linestyle=':', alpha=0.5)
-            plt.show()
-            
-        
+        # Record the timeline and the DAGs, which are rendered according to plot_mode (see DASH_Sim_plots.py)
+        sim.timeline = DASH_Sim_plots.get_timeline(sim)
+        sim.DAGs = DASH_Sim_plots.get_DAGs(jobs)
+        if (common.plot_mode == 'show'):
+            DASH_Sim_plots.show(sim.timeline, len(resource_matrix.list), sim.DAGs)
+        elif (common.plot_mode == 'file'):
+            DASH_Sim_plots.render_files(sim.timeline, len(resource_matrix.list), sim.DAGs, common.plot_dir)
+        elif (common.plot_mode == 'background'):
+            DASH_Sim_plots.render_in_background(sim.timeline, len(resource_matrix.list), sim.DAGs, common.plot_dir)
+
     # end of if (common.simulation_mode == 'validation'):
 
     if (common.simulation_mode == 'performance'):
@@ -261,136 +517,113 @@ def run_simulator(scale_values=common.scale_values_list):
         ave_EDP = [0]*len(common.scale_values_list)                                 # The list contains the average EDP for each lambda value
         
         
+        # The continuations that are forked after the warmup period, or only the configured scheduler
+        if common.warmup_forks:
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                raise common.ConfigurationError('Forking the simulation after the warmup period is not supported on this platform\n'
+                                                'Please leave warmup_forks empty in config_file.ini')
+            for continuation in common.warmup_forks:
+                if continuation.split(':')[0] not in scheduler.registry:
+                    raise common.ConfigurationError('Could not find the scheduler of the continuation %s\n'
+                                                    'Please check warmup_forks in config_file.ini' % continuation)
+            continuations = common.warmup_forks
+        else:
+            continuations = [common.scheduler]
+
+        if common.num_of_processes > 1:
+            # Simulate the (scale, iteration) points in a process pool, the results are merged below in the serial order
+            pool_results = run_iterations_in_pool(sim, resource_matrix, jobs)
+
         for (ind,scale) in enumerate(common.scale_values_list):
-            common.scale = scale  # Assign each value in $scale_values_list to common.scale
             lamd_values_list[ind] = 1 / scale
 
             if (common.INFO_JOB):
                 print('%10s'%('')+'[I] Simulation starts for scale value %s' %(scale))
 
             # Iterate over a fixed number of iterations
-            job_execution_time  = 0.0
-            job_injection_rate  = 0.0
-            job_completion_rate = 0.0
-            concurrent_jobs     = 0.0
-            active_time         = [0]*len(resource_matrix.list)
-            blocking_time       = [0]*len(resource_matrix.list)
-            energy              = 0.0
-            EDP                 = 0.0
+            # (the results are accumulated for each continuation)
+            job_execution_time  = dict.fromkeys(continuations, 0.0)
+            job_injection_rate  = dict.fromkeys(continuations, 0.0)
+            job_completion_rate = dict.fromkeys(continuations, 0.0)
+            concurrent_jobs     = dict.fromkeys(continuations, 0.0)
+            active_time         = {continuation: [0]*len(resource_matrix.list) for continuation in continuations}
+            blocking_time       = {continuation: [0]*len(resource_matrix.list) for continuation in continuations}
+            energy              = dict.fromkeys(continuations, 0.0)
+            EDP                 = dict.fromkeys(continuations, 0.0)
 
             for iteration in range(common.num_of_iterations):                       # Repeat the simulation for a given number of numbers for each lambda value
-                
-                ## Initialize variables at simulation start
-                DASH_Sim_utils.init_variables_at_sim_start()
-
-                ## Set a global iteration variable
-                common.iteration = iteration
-
-                random.seed(iteration)                                              # user can regenerate the same results by assigning a value to $random_seed in configuration file
-                np.random.seed(iteration)
-
-                # Instantiate the PerfStatics object that contains all the performance statics
-                common.results = common.PerfStatics()
-                common.computation_dict = {}
-                common.current_dag = nx.DiGraph()
-
-                # Set up the Python Simulation (simpy) environment
-                env = simpy.Environment(initial_time=0)
-                sim_done = env.event()
-
-                # Construct the processing elements in the target DSSoC
-                DASH_resources = []
-                for i,resource in enumerate(resource_matrix.list):
-                    # Define the PEs (resources) in simpy environment
-                    new_PE = processing_element.PE(env, resource.type, resource.name,
-                                                   resource.ID, resource.cluster_ID, resource.capacity) # Generate a new PE with this generic process
-                    DASH_resources.append(new_PE)
-                # end for
-
-                # Construct the scheduler
-                DASH_scheduler = scheduler.Scheduler(env, resource_matrix, common.scheduler,
-                                                     DASH_resources, jobs)
-
-                if (common.INFO_JOB):
-                    print('[I] Starting iteration: %d' %(iteration+1))
-
-                job_gen = job_generator.JobGenerator(env, resource_matrix, jobs, DASH_scheduler, DASH_resources)
-
-                sim_core = DASH_Sim_core.SimulationManager(env, sim_done, job_gen, DASH_scheduler, DASH_resources,
-                                                           jobs, resource_matrix)
-
-                if common.inject_fixed_num_jobs is False:
-                    env.run(until = common.simulation_length)
+                if common.num_of_processes > 1:
+                    iteration_results = pool_results[ind, iteration]
                 else:
-                    env.run(until = sim_done)
-
-                # Now, the simulation has completed
-                # Next, process the results
-                if (common.INFO_JOB):
-                    print('[I] Completed iteration: %d' %(iteration+1))
-                    print('[I] Number of injected jobs: %d' %(common.results.injected_jobs))
-                    print('[I] Number of completed jobs: %d' %(common.results.completed_jobs))
-                    try:
-                        print('[I] Ave latency: %f'
-                        %(common.results.cumulative_exe_time/common.results.completed_jobs))
-                    except ZeroDivisionError:
-                        print('[I] No completed jobs')
-                    print("[I] %-30s : %-20s" % ("Execution time(us)", round(common.results.execution_time - common.warmup_period, 2)))
-                    print("[I] %-30s : %-20s" % ("Cumulative Execution time(us)", round(common.results.cumulative_exe_time, 2)))
-                    print("[I] %-30s : %-20s" % ("Total energy consumption(J)",
-                                                 round(common.results.cumulative_energy_consumption, 6)))
-                    print("[I] %-30s : %-20s" % ("EDP",
-                                                 round((common.results.execution_time - common.warmup_period) * common.results.cumulative_energy_consumption, 2)))
-                    print("[I] %-30s : %-20s" % ("Average concurrent jobs", round(common.results.average_job_number, 2)))
-                    
-                    result_exec_time = common.results.execution_time - common.warmup_period
-                    result_energy_cons = common.results.cumulative_energy_consumption
-                    result_EDP = result_exec_time * result_energy_cons
-                    header_list = ['Execution time(us)', 'Total energy consumption(J)', 'EDP']
-                    result_list = [result_exec_time, result_energy_cons, result_EDP]
-                    DASH_Sim_utils.trace_system()
-                    if not os.path.exists(common.RESULTS):
-                        with open(common.RESULTS, 'w', newline='') as csvfile:
-                            result_file = csv.writer(csvfile, delimiter=',')
-                            result_file.writerow(header_list)
-                    with open(common.RESULTS, 'a', newline='') as csvfile:
-                        result_file = csv.writer(csvfile, delimiter=',')
-                        result_file.writerow(result_list)
-
-                try:
-                    job_execution_time += common.results.cumulative_exe_time / common.results.completed_jobs                    # find the mean job duration value for this iteration
-                except ZeroDivisionError:
-                    job_execution_time += 0
+                    iteration_results = run_iteration(sim, resource_matrix, jobs, scale, iteration)
 
                 # Add the results obtained for this iteration into a list
-                job_injection_rate += common.results.injected_jobs / (common.results.execution_time - common.warmup_period)      
-                job_completion_rate += common.results.completed_jobs / (common.results.execution_time - common.warmup_period)    
-                concurrent_jobs += common.results.average_job_number
-                for i, resource in enumerate(DASH_resources):
-                    active_time[i] += resource.active/common.results.execution_time
-                    blocking_time[i] += resource.blocking/common.results.execution_time
-                energy += common.results.cumulative_energy_consumption
-                EDP += (common.results.execution_time - common.warmup_period) * common.results.cumulative_energy_consumption
+                for continuation, result in iteration_results.items():
+                    sim.iteration_results[scale, iteration, continuation] = result
+                    write_results(result)
+                    job_execution_time[continuation] += result['job_execution_time']
+                    job_injection_rate[continuation] += result['job_injection_rate']
+                    job_completion_rate[continuation] += result['job_completion_rate']
+                    concurrent_jobs[continuation] += result['concurrent_jobs']
+                    for i in range(len(resource_matrix.list)):
+                        active_time[continuation][i] += result['active_time'][i]
+                        blocking_time[continuation][i] += result['blocking_time'][i]
+                    energy[continuation] += result['energy']
+                    EDP[continuation] += result['EDP']
             # end of for iteration in range(common.num_of_iterations):
 
             # Calculate average values of the results from all iterations
-            ave_job_execution_time[ind] = job_execution_time / common.num_of_iterations
-            ave_job_injection_rate[ind] = job_injection_rate / common.num_of_iterations
-            ave_job_completion_rate[ind] = job_completion_rate / common.num_of_iterations
-            ave_concurrent_jobs[ind] = concurrent_jobs / common.num_of_iterations
-            ave_active_time[ind] = [x / common.num_of_iterations for x in active_time]
-            ave_blocking_time[ind] = [x / common.num_of_iterations for x in blocking_time]
-            ave_energy[ind] = energy / common.num_of_iterations
-            ave_EDP[ind] = EDP / common.num_of_iterations
+            ave_job_execution_time[ind] = {continuation: job_execution_time[continuation] / common.num_of_iterations for continuation in continuations}
+            ave_job_injection_rate[ind] = {continuation: job_injection_rate[continuation] / common.num_of_iterations for continuation in continuations}
+            ave_job_completion_rate[ind] = {continuation: job_completion_rate[continuation] / common.num_of_iterations for continuation in continuations}
+            ave_concurrent_jobs[ind] = {continuation: concurrent_jobs[continuation] / common.num_of_iterations for continuation in continuations}
+            ave_active_time[ind] = {continuation: [x / common.num_of_iterations for x in active_time[continuation]] for continuation in continuations}
+            ave_blocking_time[ind] = {continuation: [x / common.num_of_iterations for x in blocking_time[continuation]] for continuation in continuations}
+            ave_energy[ind] = {continuation: energy[continuation] / common.num_of_iterations for continuation in continuations}
+            ave_EDP[ind] = {continuation: EDP[continuation] / common.num_of_iterations for continuation in continuations}
+            for continuation in continuations:
+                sim.averages[scale, continuation] = {'job_execution_time'  : ave_job_execution_time[ind][continuation],
+                                                     'job_injection_rate'  : ave_job_injection_rate[ind][continuation],
+                                                     'job_completion_rate' : ave_job_completion_rate[ind][continuation],
+                                                     'concurrent_jobs'     : ave_concurrent_jobs[ind][continuation],
+                                                     'active_time'         : ave_active_time[ind][continuation],
+                                                     'blocking_time'       : ave_blocking_time[ind][continuation],
+                                                     'energy'              : ave_energy[ind][continuation],
+                                                     'EDP'                 : ave_EDP[ind][continuation]}
             
 
             if (common.INFO_JOB):
-                print('[I] Completed all %d iterations for scale = %d,'
-                      %(common.num_of_iterations,scale), end='')
-                print(' injection rate:%f, completion rate:%f, ave_execution_time:%f'
-                      % (ave_job_injection_rate[ind], ave_job_completion_rate[ind], ave_job_execution_time[ind]))
+                for continuation in continuations:
+                    label = (' with %s' % continuation) if common.warmup_forks else ''
+                    print('[I] Completed all %d iterations for scale = %d%s,'
+                          %(common.num_of_iterations,scale,label), end='')
+                    print(' injection rate:%f, completion rate:%f, ave_execution_time:%f'
+                          % (ave_job_injection_rate[ind][continuation], ave_job_completion_rate[ind][continuation], ave_job_execution_time[ind][continuation]))
 
         # end of for (ind,scale) in enumerate(common.scale_values_list):
 
+    return sim
+# end of def run_simulator(scale_values=None)
+
+def simulate(config=None, scale_values=None):
+    '''!
+    Run a simulation with an in-memory configuration, e.g., to embed DASH-Sim in an optimization loop.
+    No file is written, unless traces are enabled in the configuration.
+    @param config: The configuration, as a ConfigParser object or a dictionary of sections
+                   (e.g., {'DEFAULT': {'scheduler': 'MET'}, 'SIMULATION MODE': {'scale_values': '[100, 200]'}}).
+                   The options that are not given take their values from common.default_config, config_file.ini is not read.
+                   The configuration replaces the configuration of the process (see run_simulator), it is not private to this call
+    @param scale_values: Optional input to select specific scale values. Default value is defined in the configuration
+    @return The Results object of the simulation
+    @exception common.ConfigurationError: The configuration, or a SoC or job file, has an invalid value
+    '''
+    common.load_config(config if config is not None else {})
+    sim = run_simulator(scale_values)
+    return common.Results(sim)
+# end of def simulate(config=None, scale_values=None)
+
 if __name__ == '__main__':
-    run_simulator(common.config_scale_values)
+    try:
+        run_simulator()
+    except common.ConfigurationError as error:
+        common.exit_with_error(error)
@@ -1,17 +1,37 @@
 '''!
 @brief This file contains the code to parse DASH-SoC given in config_file.ini file.
 '''
-import sys
 import platform
 import numpy as np
 
 import common                                                                   # The common parameters used in DASH-Sim are defined in common_parameters.py
 import clusters
+import DASH_Sim_utils
 
 
-def resource_parse(resource_matrix, file_name):
+def resource_parse(sim, resource_matrix, file_name):
+    '''!
+    Load the SoC configuration from its compiled version, or parse and compile it if the SoC file changed since it was compiled.
+    @param sim: The Simulation object, which stores the clusters and the communication bandwidth matrix
+    @param resource_matrix: Object to the resource matrix
+    @param file_name: SoC file name, as specified in the config_file.ini
+    '''
+    compiled_file = DASH_Sim_utils.get_compiled_file(file_name, [__file__, common.__file__, clusters.__file__], [])
+    compiled_SoC = DASH_Sim_utils.load_compiled(compiled_file)
+    if compiled_SoC is not None:
+        resource_matrix.list, sim.cluster_list, sim.comm_band = compiled_SoC
+    else:
+        resource_parse_text(sim, resource_matrix, file_name)
+        DASH_Sim_utils.store_compiled(compiled_file, (resource_matrix.list, sim.cluster_list, sim.comm_band))
+
+    # Number of resources, ignore the memory
+    common.num_PEs_TRACE = len(sim.cluster_list) - 1
+# end of def resource_parse(sim, resource_matrix, file_name)
+
+def resource_parse_text(sim, resource_matrix, file_name):
     '''!
     Read and parse the SoC configuration.
+    @param sim: The Simulation object, which stores the clusters and the communication bandwidth matrix
     @param resource_matrix: Object to the resource matrix
     @param file_name: SoC file name, as specified in the config_file.ini
     '''
@@ -30,9 +50,8 @@ def resource_parse(resource_matrix, file_name):
 
 
     except IOError:
-        print("[E] Could not read configuration file that contains available resources in DASH-SoC")
-        print("[E] Please check if the file 'config_file.ini' has the correct file name")
-        sys.exit()                                                              # Print an error message, if the input file cannot be opened
+        raise common.ConfigurationError("Could not read configuration file that contains available resources in DASH-SoC (%s)\n"
+                                        "Please check if the file 'config_file.ini' has the correct file name" % file_name) from None
 
     # Now, the file is open. Read the input lines one by one
 
@@ -47,7 +66,7 @@ def resource_parse(resource_matrix, file_name):
     cluster_ID = 0
     comm_band_self = 1
 
-    common.ClusterManager.cluster_list = []
+    sim.cluster_list = []
     
     for line in input_file:
         input_line = line.strip("\n\r ")                                        # Remove the end of line character
@@ -90,14 +109,14 @@ def resource_parse(resource_matrix, file_name):
                     resource_matrix.list.append(new_resource)
                     new_cluster.PE_list.append(new_resource.ID)
                 
-                common.ResourceManager.comm_band = np.ones((len(resource_list),
+                sim.comm_band = np.ones((len(resource_list),
                                                              len(resource_list))) # Initialize the communication volume matrix
 
                 new_cluster.DVFS = current_line[12]  # Obtain the DVFS mode for the given PE
 
                 found_new_resource = True                                       # Set the flag to indicate that the following lines define the funtionalities
                 last_PE_ID += capacity
-                common.ClusterManager.cluster_list.append(new_cluster)
+                sim.cluster_list.append(new_cluster)
 
             elif current_line[0] == 'comm_band_self':
                 comm_band_self = current_line[1]
@@ -114,7 +133,7 @@ def resource_parse(resource_matrix, file_name):
                     comm_band_index_dest = 0
                     source_index_updated = False
                     dest_index_updated = False
-                    for cluster in common.ClusterManager.cluster_list:
+                    for cluster in sim.cluster_list:
                         if cluster_source != cluster.ID:
                             if not source_index_updated:
                                 comm_band_index_source += cluster.num_active_cores
@@ -137,28 +156,27 @@ def resource_parse(resource_matrix, file_name):
                                         comm_value = comm_band_self
                                     else:
                                         comm_value = comm_band_value
-                                    common.ResourceManager.comm_band[comm_band_index_source + core_source, comm_band_index_dest + core_dest] = comm_value
-                                    common.ResourceManager.comm_band[comm_band_index_dest + core_dest, comm_band_index_source + core_source] = comm_value
+                                    sim.comm_band[comm_band_index_source + core_source, comm_band_index_dest + core_dest] = comm_value
+                                    sim.comm_band[comm_band_index_dest + core_dest, comm_band_index_source + core_source] = comm_value
                             break
             else:
-                print("[E] Cannot recognize the input line in resource file:", input_line )
-                sys.exit()
+                raise common.ConfigurationError("Cannot recognize the input line in resource file: %s" % input_line)
 
         # end of: if not(found_new_resource)
 
         else: # if not(found_new_resource) (i.e., found a new resource)
 
             if current_line[0] == 'opp':
-                # print("Reading a new OPP tuple for resource ID {0}: <{1},{2}>".format(common.ClusterManager.cluster_list[cluster_ID].ID, current_line[1], current_line[2]))
-                common.ClusterManager.cluster_list[cluster_ID].OPP.append((int(current_line[1]), int(current_line[2])))
+                # print("Reading a new OPP tuple for resource ID {0}: <{1},{2}>".format(sim.cluster_list[cluster_ID].ID, current_line[1], current_line[2]))
+                sim.cluster_list[cluster_ID].OPP.append((int(current_line[1]), int(current_line[2])))
             elif current_line[0] == 'trip_freq':
                 for i, freq in enumerate(current_line):
                     if i != 0:
-                        common.ClusterManager.cluster_list[cluster_ID].trip_freq.append(int(freq))
+                        sim.cluster_list[cluster_ID].trip_freq.append(int(freq))
             elif current_line[0] == 'DTPM_trip_freq':
                 for i, freq in enumerate(current_line):
                     if i != 0:
-                        common.ClusterManager.cluster_list[cluster_ID].DTPM_trip_freq.append(int(freq))
+                        sim.cluster_list[cluster_ID].DTPM_trip_freq.append(int(freq))
             elif current_line[0] == 'power_profile':
                 power_profile_list = []
                 frequency_threshold = 0
@@ -167,7 +185,7 @@ def resource_parse(resource_matrix, file_name):
                         frequency_threshold = int(val)
                     if i > 1:
                         power_profile_list.append(float(val))
-                common.ClusterManager.cluster_list[cluster_ID].power_profile.update({frequency_threshold: power_profile_list})
+                sim.cluster_list[cluster_ID].power_profile.update({frequency_threshold: power_profile_list})
             elif current_line[0] == 'PG_profile':
                 power_profile_list = []
                 frequency_threshold = 0
@@ -176,7 +194,7 @@ def resource_parse(resource_matrix, file_name):
                         frequency_threshold = int(val)
                     if i > 1:
                         power_profile_list.append(float(val))
-                common.ClusterManager.cluster_list[cluster_ID].PG_profile.update({frequency_threshold: power_profile_list})
+                sim.cluster_list[cluster_ID].PG_profile.update({frequency_threshold: power_profile_list})
             elif (current_line[0] == 'mesh_information'):
                 for ii in range(capacity):
 
@@ -215,13 +233,15 @@ def resource_parse(resource_matrix, file_name):
                         if (each_PE_functionality == len(resource_matrix.list[ind_PE].supported_functionalities) and ii == (capacity-1)):
                             found_new_resource = False
                             each_PE_functionality = 0
-                            common.ClusterManager.cluster_list[cluster_ID].OPP = sorted(common.ClusterManager.cluster_list[cluster_ID].OPP)
-                            common.ClusterManager.cluster_list[cluster_ID].num_active_cores = len(common.ClusterManager.cluster_list[cluster_ID].PE_list)
-                            common.ClusterManager.cluster_list[cluster_ID].num_total_cores = len(common.ClusterManager.cluster_list[cluster_ID].PE_list)
+                            sim.cluster_list[cluster_ID].OPP = sorted(sim.cluster_list[cluster_ID].OPP)
+                            sim.cluster_list[cluster_ID].num_active_cores = len(sim.cluster_list[cluster_ID].PE_list)
+                            sim.cluster_list[cluster_ID].num_total_cores = len(sim.cluster_list[cluster_ID].PE_list)
 
         # end of else: # if not(found_new_resource)
 
-    # Number of resources, ignore the memory
-    common.num_PEs_TRACE = len(common.ClusterManager.cluster_list) - 1
+    # The runtimes are read-only tables, like comm_band, which are shared by the simulations that load the compiled SoC
+    for resource in resource_matrix.list:
+        resource.performance = np.array(resource.performance, dtype=float)
+# end of def resource_parse_text(sim, resource_matrix, file_name)
 
 
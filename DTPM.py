@@ -2,9 +2,8 @@
 @brief This file contains the code for the DTPM module.
 
 The DTPM class is used to initialize the power models and evaluate the PE state at each control epoch.
-The two main methods are evaluate_PE and evaluate_idle_PEs, which invoke the DTPM policies, tracing and throttling mechanisms, and update the power numbers for the clusters.
+The main methods are evaluate_PE, evaluate_planned_tasks and evaluate_idle_PEs, which invoke the DTPM policies, tracing and throttling mechanisms, and update the power numbers for the clusters.
 '''
-import sys
 import common
 import DTPM_power_models
 import DASH_Sim_utils
@@ -14,19 +13,22 @@ class DTPMmodule:
     '''!
     The DTPM module is responsible for evaluating the PE utilization and changing the V/f according to the defined policy
     '''
-    def __init__(self, env, resource_matrix, PEs):
+    def __init__(self, sim, env, resource_matrix, PEs):
         '''!
+        @param sim: The Simulation object
         @param env: Pointer to the current simulation environment
         @param resource_matrix: Resource matrix comprising all PEs
         @param PEs: The PEs available in the current SoC
         '''
+        self.sim = sim
         self.env = env
         self.resource_matrix = resource_matrix
         self.PEs = PEs
         self.timestamp_last_update = [-1] * len(PEs)
-        self.timestamp_last_update_cluster = [-1] * len(common.ClusterManager.cluster_list)
+        self.timestamp_last_update_cluster = [-1] * len(self.sim.cluster_list)
+        self.planned_tasks = []                                                 # Running tasks that wait in one step until their last window (RunningTask objects)
 
-        DTPM_power_models.initialize_B_model()
+        DTPM_power_models.initialize_B_model(self.sim)
 
         if (common.DEBUG_CONFIG):
             print('[D] DVFS module was initialized')
@@ -43,7 +45,7 @@ class DTPMmodule:
 
             self.timestamp_last_update[current_PE.ID] = timestamp
 
-            DASH_Sim_utils.update_PE_utilization_and_info(current_PE, timestamp)
+            DASH_Sim_utils.update_PE_utilization_and_info(self.sim, current_PE, timestamp)
 
             if timestamp > common.warmup_period:
                 current_PE.utilization_list.append(current_PE.utilization)
@@ -51,7 +53,7 @@ class DTPMmodule:
             # if (common.DEBUG_SIM):
             #     print('%12s' % (''), 'Utilization for %s is %.2f' % (current_PE.name, current_PE.utilization))
 
-            if common.ClusterManager.cluster_list[current_PE.cluster_ID].DVFS != 'none':
+            if self.sim.cluster_list[current_PE.cluster_ID].DVFS != 'none':
                 DASH_Sim_utils.trace_PEs(self.env.now, current_PE)
 
         # Apply cluster decisions if the cluster was not updated in this sample and all other PEs in that cluster are already updated
@@ -59,7 +61,7 @@ class DTPMmodule:
 
             self.timestamp_last_update_cluster[current_PE.cluster_ID] = timestamp
 
-            current_cluster = common.ClusterManager.cluster_list[current_PE.cluster_ID]
+            current_cluster = self.sim.cluster_list[current_PE.cluster_ID]
 
             current_cluster.snippet_power_list.append(current_cluster.current_power_cluster)
             num_tasks = DASH_Sim_utils.get_num_tasks_being_executed(current_cluster, self.PEs)
@@ -69,26 +71,26 @@ class DTPMmodule:
                     str(current_cluster.DVFS).startswith("constant"):
                 # The only DVFS mode that does not require OPPs is the performance one
                 if len(current_cluster.OPP) == 0:
-                    print("[E] PEs using %s DVFS mode must have at least one OPP, please check the resource file" % common.ClusterManager.cluster_list[current_PE.cluster_ID].DVFS)
-                    sys.exit()
+                    raise common.ConfigurationError("PEs using %s DVFS mode must have at least one OPP, please check the resource file"
+                                                    % self.sim.cluster_list[current_PE.cluster_ID].DVFS)
 
             # Custom DVFS policies -------------------------
             if current_cluster.DVFS == 'ondemand':
-                DTPM_policies.ondemand_policy(current_cluster, self.PEs, self.env.now)
+                DTPM_policies.ondemand_policy(self.sim, current_cluster, self.PEs, self.env.now)
             #-----------------------------------------------
 
             # Update temperature
             if timestamp % common.sampling_rate_temperature == 0 and self.timestamp_last_update_cluster.count(timestamp) == (len(self.timestamp_last_update_cluster) - 1):
-                common.current_temperature_vector = DTPM_power_models.predict_temperature()
-                common.snippet_temp_list.append(max(common.current_temperature_vector))
+                self.sim.current_temperature_vector = DTPM_power_models.predict_temperature(self.sim)
+                self.sim.snippet_temp_list.append(max(self.sim.current_temperature_vector))
 
                 # Evaluate and apply throttling
                 if common.enable_throttling and common.enable_DTPM_throttling:
-                    print('[E] Both regular and DTPM throttling are enabled, please enable only one')
-                    sys.exit()
+                    raise common.ConfigurationError('Both regular and DTPM throttling are enabled, please enable only one')
                 if common.enable_throttling or common.enable_DTPM_throttling:
+                    current_OPP = [(cluster.current_frequency, cluster.current_voltage) for cluster in self.sim.cluster_list]
                     input_frequency = []
-                    for i, cluster in enumerate(common.ClusterManager.cluster_list):
+                    for i, cluster in enumerate(self.sim.cluster_list):
                         if cluster.DVFS == 'performance':
                             input_frequency.append(DTPM_power_models.get_max_freq(cluster.OPP))
                         elif cluster.DVFS == 'powersave':
@@ -98,15 +100,50 @@ class DTPMmodule:
                             input_frequency.append(int(DVFS_str_split[1]))
                         elif cluster.DVFS != 'none':
                             input_frequency.append(cluster.current_frequency)
-                    DTPM_power_models.evaluate_throttling(timestamp, input_frequency, common.trip_temperature, 'regular')
-                    DTPM_power_models.evaluate_throttling(timestamp, input_frequency, common.DTPM_trip_temperature, 'DTPM')
+                    DTPM_power_models.evaluate_throttling(self.sim, timestamp, input_frequency, common.trip_temperature, 'regular')
+                    DTPM_power_models.evaluate_throttling(self.sim, timestamp, input_frequency, common.DTPM_trip_temperature, 'DTPM')
 
-                DASH_Sim_utils.trace_temperature(timestamp)
+                    # The tasks planned in one step on the throttled clusters must follow the new frequency
+                    for i, cluster in enumerate(self.sim.cluster_list):
+                        if (cluster.current_frequency, cluster.current_voltage) != current_OPP[i]:
+                            self.replan_tasks(cluster)
+
+                DASH_Sim_utils.trace_temperature(self.sim, timestamp)
 
             if current_cluster.DVFS != 'none' and self.timestamp_last_update_cluster.count(timestamp) == (len(self.timestamp_last_update_cluster) - 1):
-                DASH_Sim_utils.trace_frequency(self.env.now)
+                DASH_Sim_utils.trace_frequency(self.sim, self.env.now)
             if self.timestamp_last_update_cluster.count(timestamp) == (len(self.timestamp_last_update_cluster) - 1):
-                DASH_Sim_utils.trace_load(timestamp, self.PEs)
+                DASH_Sim_utils.trace_load(self.sim, timestamp, self.PEs)
+
+    def evaluate_planned_tasks(self):
+        '''!
+        Evaluate the PEs that run tasks planned in one step and account the energy of the next window of these tasks,
+        since they do not wake up at each sample.
+        '''
+        for running_task in list(self.planned_tasks):
+            # Skip the tasks that were re-planned, that start their last window now (the PE evaluates itself),
+            # or whose current window started after the last sample
+            if running_task.planned and running_task.window_end == self.env.now and running_task.last_sample > self.env.now:
+                current_PE = running_task.PE
+                task = running_task.task
+                self.evaluate_PE(running_task.resource, current_PE, self.env.now)
+                if running_task.planned:
+                    simulation_step, task.task_elapsed_time_max_freq, task_complete = current_PE.get_simulation_step(running_task.task_runtime_max_freq, task.task_elapsed_time_max_freq, self.env.now)
+                    current_PE.compute_window_energy(running_task, self.PEs, simulation_step)
+                    running_task.window_end = self.env.now + simulation_step
+    # end def evaluate_planned_tasks()
+
+    def replan_tasks(self, cluster):
+        '''!
+        Interrupt the tasks planned in one step on a cluster whose frequency changed, so that they continue sample by sample.
+        @param cluster: Cluster object
+        '''
+        for running_task in self.planned_tasks:
+            if self.sim.cluster_list[running_task.PE.cluster_ID] is cluster and running_task.last_sample > running_task.window_end:
+                running_task.planned = False
+                running_task.process.interrupt()
+        self.planned_tasks = [running_task for running_task in self.planned_tasks if running_task.planned]
+    # end def replan_tasks(cluster)
 
     def evaluate_idle_PEs(self):
         '''!
@@ -118,30 +155,30 @@ class DTPMmodule:
         base_energy = base_power * common.sampling_rate * 1e-6 / (len(self.resource_matrix.list) - 1)
         for i, resource in enumerate(self.resource_matrix.list):
             current_PE = self.PEs[i]
-            if common.ClusterManager.cluster_list[current_PE.cluster_ID].type != 'MEM':
+            if self.sim.cluster_list[current_PE.cluster_ID].type != 'MEM':
                 if current_PE.process.count == 0:
                     # Only evaluate the PE if there is no process running, otherwise the PE itself will call the DVFS evaluation
                     self.evaluate_PE(resource, current_PE, self.env.now)
                     # Update the power dissipation to be only the static power as the PE is currently idle
-                    current_PE.current_leakage_core = DTPM_power_models.compute_static_power_dissipation(current_PE.cluster_ID)
-                    if DASH_Sim_utils.get_num_tasks_being_executed(common.ClusterManager.cluster_list[current_PE.cluster_ID], self.PEs) == 0:
-                        common.ClusterManager.cluster_list[current_PE.cluster_ID].current_power_cluster = current_PE.current_leakage_core * common.ClusterManager.cluster_list[current_PE.cluster_ID].num_active_cores
-                        common.ClusterManager.cluster_list[current_PE.cluster_ID].current_power_cluster += base_power
+                    current_PE.current_leakage_core = DTPM_power_models.compute_static_power_dissipation(self.sim, current_PE.cluster_ID)
+                    if DASH_Sim_utils.get_num_tasks_being_executed(self.sim.cluster_list[current_PE.cluster_ID], self.PEs) == 0:
+                        self.sim.cluster_list[current_PE.cluster_ID].current_power_cluster = current_PE.current_leakage_core * self.sim.cluster_list[current_PE.cluster_ID].num_active_cores
+                        self.sim.cluster_list[current_PE.cluster_ID].current_power_cluster += base_power
                 if current_PE.process.count < current_PE.capacity:
                     # Add leakage power for the idle cores in the PE
                     energy_sample = current_PE.current_leakage_core * common.sampling_rate * 1e-6 + base_energy
-                    common.results.energy_consumption += energy_sample
+                    self.sim.results.energy_consumption += energy_sample
                     if (common.simulation_mode == "performance" and self.env.now >= common.warmup_period) or common.simulation_mode == "validation":
                         current_PE.snippet_energy += energy_sample
                         current_PE.total_energy += energy_sample
-                        common.results.cumulative_energy_consumption += energy_sample
+                        self.sim.results.cumulative_energy_consumption += energy_sample
                 else:
                     # Add base energy when all cores are being used
-                    common.results.energy_consumption += base_energy
+                    self.sim.results.energy_consumption += base_energy
                     if (common.simulation_mode == "performance" and self.env.now >= common.warmup_period) or common.simulation_mode == "validation":
                         current_PE.snippet_energy += base_energy
                         current_PE.total_energy += base_energy
-                        common.results.cumulative_energy_consumption += base_energy
+                        self.sim.results.cumulative_energy_consumption += base_energy
     # end def evaluate_idle_PEs()
 
 # end class DTPM
@@ -11,7 +11,6 @@ Steps to include other user-defined DVFS policies:
 - Add a call for the new DVFS policy in the evaluate_PE method of DTPM.py
 '''
 
-import sys
 import math
 import csv
 import os
@@ -49,10 +48,11 @@ def initialize_frequency(cluster):
             cluster.current_voltage = DTPM_power_models.get_voltage_constant_mode(cluster.OPP, constantFrequency)
             cluster.policy_frequency = constantFrequency
 
-def ondemand_policy(cluster, PEs, timestamp):
+def ondemand_policy(sim, cluster, PEs, timestamp):
     '''!
     Default Linux's ondemand policy.
     High and low utilization thresholds are configured in config_file.ini (util_high_threshold and util_low_threshold).
+    @param sim: The Simulation object
     @param cluster: Cluster object
     @param PEs: The PEs available in the current SoC
     @param timestamp: Current timestamp
@@ -64,13 +64,12 @@ def ondemand_policy(cluster, PEs, timestamp):
         DTPM_power_models.keep_frequency(cluster, timestamp)
     elif utilization > common.util_high_threshold:
         # Only modify the frequency if the cluster is not being throttled
-        if common.throttling_state == -1:
+        if sim.throttling_state == -1:
             # Set the maximum frequency
             DTPM_power_models.set_max_frequency(cluster, timestamp)
     elif utilization < common.util_low_threshold:
         # Decrease the frequency
         DTPM_power_models.decrease_frequency(cluster, timestamp)
     else:
-        print("[E] Error while evaluating the PE utilization in the DVFS module, all test cases must be previously covered")
-        sys.exit()
+        raise RuntimeError("Error while evaluating the PE utilization in the DVFS module, all test cases must be previously covered")
     cluster.policy_frequency = cluster.current_frequency
@@ -5,7 +5,6 @@ This file contains the analytical models used for power and thermal, it computes
 '''
 from math import exp
 import numpy as np
-import sys
 import copy
 
 import DASH_Sim_utils
@@ -70,10 +69,11 @@ def compute_DVFS_performance_slowdown(cluster):
         return slowdown_ratio - 1
 # end compute_DVFS_performance_slowdown(cluster)
 
-def compute_Cdyn_and_alpha(resource, max_power_consumption, freq_threshold, OPP=None):
+def compute_Cdyn_and_alpha(sim, resource, max_power_consumption, freq_threshold, OPP=None):
     '''!
     Based on the maximum frequency, voltage, and measured power dissipation, compute the capacitance C times the switching activity Alpha for the given task.
     Pdyn = Cdyn * alpha * f * V^2
+    @param sim: The Simulation object
     @param resource: Current resource object
     @param max_power_consumption: Baseline maximum power consumption
     @param freq_threshold: Frequency at which the baseline power consumption was profiled (based on the configurations defined in the SoC file)
@@ -82,8 +82,8 @@ def compute_Cdyn_and_alpha(resource, max_power_consumption, freq_threshold, OPP=
     '''
     max_freq = get_frequency_in_Hz(freq_threshold)
     if OPP is None:
-        max_volt = get_voltage_in_V(get_voltage_constant_mode(common.ClusterManager.cluster_list[resource.cluster_ID].OPP, freq_threshold))
-        if len(common.ClusterManager.cluster_list[resource.cluster_ID].OPP) > 0:
+        max_volt = get_voltage_in_V(get_voltage_constant_mode(sim.cluster_list[resource.cluster_ID].OPP, freq_threshold))
+        if len(sim.cluster_list[resource.cluster_ID].OPP) > 0:
             Cdyn_alpha = max_power_consumption / (max_freq * max_volt ** 2)
         else:
             Cdyn_alpha = 0
@@ -94,30 +94,31 @@ def compute_Cdyn_and_alpha(resource, max_power_consumption, freq_threshold, OPP=
         else:
             Cdyn_alpha = 0
     return Cdyn_alpha
-# end compute_Cdyn_and_alpha(resource, max_power_consumption, freq_threshold, OPP=None)
+# end compute_Cdyn_and_alpha(sim, resource, max_power_consumption, freq_threshold, OPP=None)
 
-def compute_static_power_dissipation(cluster_ID, input_temperature=None, input_voltage=None):
+def compute_static_power_dissipation(sim, cluster_ID, input_temperature=None, input_voltage=None):
     '''!
     Compute the static power dissipation of the PE.
+    @param sim: The Simulation object
     @param cluster_ID: ID of the current cluster
     @param input_temperature: If specified, use an input temperature vector. Otherwise, use the current one. (Optional)
     @param input_voltage: If specified, use an input voltage. Otherwise, use the current one. (Optional)
     '''
-    if common.ClusterManager.cluster_list[cluster_ID].type == "ACC":
+    if sim.cluster_list[cluster_ID].type == "ACC":
         static_power_core = 0
     else:
         if input_temperature is None:
-            current_temperature = max(common.current_temperature_vector)
+            current_temperature = max(sim.current_temperature_vector)
         else:
             current_temperature = max(input_temperature)
         if input_voltage is None:
-            current_voltage = common.ClusterManager.cluster_list[cluster_ID].current_voltage
+            current_voltage = sim.cluster_list[cluster_ID].current_voltage
         else:
             current_voltage = input_voltage
         temp_K = 273 + current_temperature # Convert the temperature to Kelvin
         voltage_V = get_voltage_in_V(current_voltage)
         static_power_cluster = voltage_V * common.C1 * temp_K * temp_K * exp(-common.C2/temp_K) + common.Igate*voltage_V
-        if common.ClusterManager.cluster_list[cluster_ID].type == "LTL":
+        if sim.cluster_list[cluster_ID].type == "LTL":
             static_power_cluster /= 4 # Scaling the leakage power based on the area differece between big and little cores. (C1 and C2 are obtained for the big cluster)
         static_power_core = static_power_cluster / 4  # Max 4 cores per cluster
     return static_power_core
@@ -145,7 +146,7 @@ def get_execution_time_max_frequency(task, resource):
     @return Execution time of the current task
     '''
     task_ind = resource.supported_functionalities.index(task.name)                  # Retrieve the index of the task
-    execution_time = resource.performance[task_ind]                                 # Retrieve the mean execution time of a task
+    execution_time = float(resource.performance[task_ind])                          # Retrieve the mean execution time of a task
     if(resource.performance[task_ind]):
         # Randomize the execution time based on a gaussian distribution
         #randomized_execution_time = max(round(
@@ -192,70 +193,71 @@ def get_max_power_consumption(cluster, PEs, N_tasks=None, N_cores=None):
                     return v[num_tasks - 1], int(k)
                 else:
                     return v[num_cores - 1], int(k)
-        print("[E] Power profile (Cluster {} ID {}) does not have a frequency threshold higher than {}".format(cluster.type, cluster.ID, cluster.current_frequency))
-        sys.exit()
+        raise common.ConfigurationError("Power profile (Cluster {} ID {}) does not have a frequency threshold higher than {}".format(cluster.type, cluster.ID, cluster.current_frequency))
     else:
         return 0, 0
 # end get_execution_time_max_frequency(cluster, PEs, N_tasks=None, N_cores=None)
 
-def initialize_B_model():
+def initialize_B_model(sim):
     '''!
     Initialize the B_model matrix, used in the temperature prediction.
+    @param sim: The Simulation object
     '''
-    common.B_model = B_model_mem
-    common.B_model = np.append(common.B_model, B_model_gpu, axis=1)
-    for cluster in common.ClusterManager.cluster_list:
+    sim.B_model = B_model_mem
+    sim.B_model = np.append(sim.B_model, B_model_gpu, axis=1)
+    for cluster in sim.cluster_list:
         if cluster.type != "MEM":
             if cluster.type == "BIG":
-                common.B_model = np.append(common.B_model, B_model_big, axis=1)
+                sim.B_model = np.append(sim.B_model, B_model_big, axis=1)
             elif cluster.type == "LTL":
-                common.B_model = np.append(common.B_model, B_model_little, axis=1)
+                sim.B_model = np.append(sim.B_model, B_model_little, axis=1)
             else:
-                common.B_model = np.append(common.B_model, B_model_acc, axis=1)
-# end initialize_B_model()
+                sim.B_model = np.append(sim.B_model, B_model_acc, axis=1)
+# end initialize_B_model(sim)
 
-def predict_temperature():
+def predict_temperature(sim):
     '''!
     Predict the temperature based on the current status of the clusters.
+    @param sim: The Simulation object
     @return Current temperature vector for the SoC
     '''
     power_list = []
     power_list.append(P_mem) # Memory model
     power_list.append(P_GPU) # GPU model
-    for cluster in common.ClusterManager.cluster_list:
+    for cluster in sim.cluster_list:
         if cluster.type != "MEM":
             power_list.append(cluster.current_power_cluster)
 
-    predicted_temperature = np.matmul(A_model, np.array(common.current_temperature_vector) - common.T_ambient) + \
-                            np.matmul(common.B_model, np.array(power_list)) + common.T_ambient
+    predicted_temperature = np.matmul(A_model, np.array(sim.current_temperature_vector) - common.T_ambient) + \
+                            np.matmul(sim.B_model, np.array(power_list)) + common.T_ambient
     return predicted_temperature
-# end predict_temperature()
+# end predict_temperature(sim)
 
-def evaluate_throttling(timestamp, input_freq, input_trip_temperature, throttling_type):
+def evaluate_throttling(sim, timestamp, input_freq, input_trip_temperature, throttling_type):
     '''!
     Apply throttling if the temperature exceeds the trip points.
+    @param sim: The Simulation object
     @param timestamp: Current timestamp
     @param input_freq: Current frequency
     @param input_trip_temperature: List of trip points to be evaluated
     @param throttling_type: Define the throttling type: regular or DTPM
     '''
     if (common.enable_throttling and throttling_type == 'regular') or (common.enable_DTPM_throttling and throttling_type == 'DTPM'):
-        current_temp = max(common.current_temperature_vector)
+        current_temp = max(sim.current_temperature_vector)
         for trip_point, trip_temp in enumerate(input_trip_temperature):
             # If temperature is higher than the trip temp, throttle the PEs
             if current_temp > trip_temp:
                 # Check if the PEs are already being throttled
-                if common.throttling_state < trip_point:
+                if sim.throttling_state < trip_point:
                     freq_list = []
-                    for i, cluster in enumerate(common.ClusterManager.cluster_list):
+                    for i, cluster in enumerate(sim.cluster_list):
                         if cluster.DVFS != 'none':
                             if throttling_type == 'regular':
                                 current_trip_freq = cluster.trip_freq[trip_point]
                             elif throttling_type == 'DTPM':
                                 current_trip_freq = cluster.DTPM_trip_freq[trip_point]
                             else:
-                                print('[E] Invalid throttling type, please check evaluate_throttling method')
-                                sys.exit()
+                                raise RuntimeError('Invalid throttling type, please check evaluate_throttling method')
                             if current_trip_freq != -1:
                                 if input_freq[i] > current_trip_freq:
                                     freq_list.append(current_trip_freq)
@@ -264,28 +266,27 @@ def evaluate_throttling(timestamp, input_freq, input_trip_temperature, throttlin
                             else:
                                 freq_list.append(input_freq[i])
                     freq_list = [ x / 1000 for x in freq_list]
-                    set_frequency(timestamp, freq_list, True)
-                    common.throttling_state = trip_point
-                if common.snippet_throttle < trip_point:
-                    common.snippet_throttle = trip_point
+                    set_frequency(sim, timestamp, freq_list, True)
+                    sim.throttling_state = trip_point
+                if sim.snippet_throttle < trip_point:
+                    sim.snippet_throttle = trip_point
             else:
-                if common.throttling_state == trip_point and current_temp < trip_temp - common.trip_hysteresis[trip_point]:
+                if sim.throttling_state == trip_point and current_temp < trip_temp - common.trip_hysteresis[trip_point]:
                     # PEs were throttled, but now the temperature has reduced, restore frequency to the previous trip point
-                    common.throttling_state -= 1
+                    sim.throttling_state -= 1
                     freq_list = []
                     # If trip point is 0, restore the input frequency, otherwise restore the previous trip point
                     if trip_point == 0:
                         freq_list = input_freq
                     else:
-                        for i, cluster in enumerate(common.ClusterManager.cluster_list):
+                        for i, cluster in enumerate(sim.cluster_list):
                             if cluster.DVFS != 'none':
                                 if throttling_type == 'regular':
                                     current_trip_freq = cluster.trip_freq[trip_point - 1]
                                 elif throttling_type == 'DTPM':
                                     current_trip_freq = cluster.DTPM_trip_freq[trip_point - 1]
                                 else:
-                                    print('[E] Invalid throttling type, please check evaluate_throttling method')
-                                    sys.exit()
+                                    raise RuntimeError('Invalid throttling type, please check evaluate_throttling method')
                                 if current_trip_freq != -1:
                                     if input_freq[i] > current_trip_freq:
                                         freq_list.append(current_trip_freq)
@@ -294,8 +295,8 @@ def evaluate_throttling(timestamp, input_freq, input_trip_temperature, throttlin
                                 else:
                                     freq_list.append(input_freq[i])
                     freq_list = [ x / 1000 for x in freq_list]
-                    set_frequency(timestamp, freq_list, True)
-# end evaluate_throttling(timestamp, input_freq, input_trip_temperature, throttling_type)
+                    set_frequency(sim, timestamp, freq_list, True)
+# end evaluate_throttling(sim, timestamp, input_freq, input_trip_temperature, throttling_type)
 
 def get_voltage_constant_mode(OPP_list, constantFrequency):
     '''!
@@ -305,16 +306,13 @@ def get_voltage_constant_mode(OPP_list, constantFrequency):
     @return Voltage related to the input frequency, following the OPP list
     '''
     if constantFrequency < get_min_freq(OPP_list):
-        print("[E] The frequency set in the constant DVFS mode is lower than the minimum frequency that the PE supports, please check the resource file")
-        sys.exit()
+        raise common.ConfigurationError("The frequency set in the constant DVFS mode is lower than the minimum frequency that the PE supports, please check the resource file")
     for OPP_i, OPP in enumerate(OPP_list):
         if constantFrequency == OPP[0]:
             return OPP[1]
     if constantFrequency > get_max_freq(OPP_list):
-        print("[E] The frequency set in the constant DVFS mode is higher than the maximum frequency that the PE supports, please check the resource file")
-        sys.exit()
-    print("[E] Target frequency was not found in the OPP list:", constantFrequency)
-    sys.exit()
+        raise common.ConfigurationError("The frequency set in the constant DVFS mode is higher than the maximum frequency that the PE supports, please check the resource file")
+    raise common.ConfigurationError("Target frequency was not found in the OPP list: %s" % constantFrequency)
 # end get_voltage_constant_mode(OPP_list, constantFrequency)
 
 def get_max_freq(OPP_list):
@@ -437,16 +435,17 @@ def increase_frequency(cluster, timestamp):
                 return True
 # end increase_frequency(cluster, timestamp)
 
-def increase_frequency_all_PEs(current_frequency_list):
+def increase_frequency_all_PEs(sim, current_frequency_list):
     '''!
     Increase the frequency of all PEs by one step (based on the respective defined OPPs).
+    @param sim: The Simulation object
     @param current_frequency_list: List with current frequencies for all clusters
     @return Return whether all PEs are at maximum frequency and the updated frequency list
     '''
     max_freq_counter = 0
-    num_PEs = len(common.ClusterManager.cluster_list) - 1
+    num_PEs = len(sim.cluster_list) - 1
     for cluster_ID in range(num_PEs):
-        current_OPP = common.ClusterManager.cluster_list[cluster_ID].OPP
+        current_OPP = sim.cluster_list[cluster_ID].OPP
         for OPP_i, OPP_tuple in enumerate(current_OPP):
             if float(OPP_tuple[0] / 1000) == current_frequency_list[cluster_ID]:
                 if OPP_i == len(current_OPP) - 1:
@@ -461,7 +460,7 @@ def increase_frequency_all_PEs(current_frequency_list):
         return (True, current_frequency_list)
     else:
         return (False, current_frequency_list)
-# end increase_frequency_all_PEs(current_frequency_list)
+# end increase_frequency_all_PEs(sim, current_frequency_list)
 
 def increase_num_cores_all_PEs(current_num_cores):
     '''!
@@ -506,14 +505,15 @@ def keep_frequency(cluster, timestamp):
         print('[D] Time %d: Cluster %s - The frequency was not modified: %d' % (timestamp, cluster.name, cluster.current_frequency))
 # end keep_frequency(cluster, timestamp)
 
-def set_frequency(timestamp, frequency_list, throttling):
+def set_frequency(sim, timestamp, frequency_list, throttling):
     '''!
     Set a given frequency to the respective clusters.
+    @param sim: The Simulation object
     @param timestamp: Current timestamp
     @param frequency_list: List of frequncies for all clusters
     @param throttling: Throttling variable that indicates whether throttling is being applied
     '''
-    for i, cluster in enumerate(common.ClusterManager.cluster_list):
+    for i, cluster in enumerate(sim.cluster_list):
         if cluster.DVFS != "none":
             frequency_MHz = int(frequency_list[i] * 1000)
             freq_search = [item for item in cluster.OPP if item[0] == frequency_MHz]
@@ -523,9 +523,8 @@ def set_frequency(timestamp, frequency_list, throttling):
                 if not throttling:
                     cluster.policy_frequency = frequency_MHz
             else:
-                print("[E] Time %d: Frequency %d not supported by the Cluster %d (set_frequency method)" % (timestamp, frequency_MHz, cluster.ID))
-                sys.exit()
-# end set_frequency(timestamp, frequency_list, throttling)
+                raise common.ConfigurationError("Time %d: Frequency %d not supported by the Cluster %d (set_frequency method)" % (timestamp, frequency_MHz, cluster.ID))
+# end set_frequency(sim, timestamp, frequency_list, throttling)
 
 def set_active_cores(cluster, PEs, num_cores):
     '''!
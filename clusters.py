@@ -25,3 +25,15 @@ class Cluster:
         self.current_power_cluster  = 0     # Indicate the current power dissipation for the cluster (dynamic + static)
         self.snippet_power_list     = []    # List of power values for the current snippet
         self.snippet_num_tasks_list = []    # List of num_tasks for the current snippet
+
+    def init_variables_at_sim_start(self):
+        '''!
+        Initialize the variables that change while a simulation runs, so that an iteration does not start from the state of the previous one.
+        The frequency is set again by the DVFS policy when the simulation starts.
+        '''
+        self.current_frequency      = 0
+        self.policy_frequency       = 0
+        self.current_voltage        = 0
+        self.current_power_cluster  = 0
+        self.snippet_power_list     = []
+        self.snippet_num_tasks_list = []
@@ -5,9 +5,11 @@ import configparser
 import sys
 import os
 import ast
-import networkx as nx
 import pickle
 import numpy as np
+import heapq
+import bisect
+import collections
 
 #time_at_sim_termination = -1
 
@@ -31,151 +33,282 @@ def str_to_list(x):
 # end of def str_to_list(x)
 
 
-config = configparser.ConfigParser()
-config.read('config_file.ini')
-
-# Assign debug variable to be true to check the flow of the program
-DEBUG_CONFIG    = config.getboolean('DEBUG', 'debug_config')                    # Debug variable to check the DASH-Sim configuration related debug messages
-DEBUG_SIM       = config.getboolean('DEBUG', 'debug_sim')                       # Debug variable to check the Simulation core related debug messages
-DEBUG_JOB       = config.getboolean('DEBUG', 'debug_job')                       # Debug variable to check the Job generator related debug messages
-DEBUG_SCH       = config.getboolean('DEBUG', 'debug_sch')                       # Debug variable to check the Scheduler related debug messages
-
-# Assign info variable to be true to get the information about the flow of the program
-INFO_SIM        = config.getboolean('INFO', 'info_sim')                         # Info variable to check the Simulation core related info messages
-INFO_JOB        = config.getboolean('INFO', 'info_job')                         # Info variable to check the job generator related info messages
-INFO_SCH        = config.getboolean('INFO', 'info_sch')                         # Info variable to check the Scheduler related info messages
-
-## DEFAULT
-scheduler               = config['DEFAULT']['scheduler']                        # Assign scheduler name variable
-seed                    = int(config['DEFAULT']['random_seed'])                 # Specify a seed value for the random number generator
-simulation_clk          = int(config['DEFAULT']['clock'])                       # The core simulation engine tick with simulation_clk
-simulation_length       = int(config['DEFAULT']['simulation_length'])           # The length of the simulation (in us)
-standard_deviation      = float(config['DEFAULT']['standard_deviation'])        # Standard deviation for randomization of execution time
-job_probabilities       = str_to_list(config['DEFAULT']['job_probabilities'])   # Probability of each app for being selected as the new job
-inject_jobs_ASAP        = config.getboolean('DEFAULT', 'inject_jobs_asap')
-fixed_injection_rate    = config.getboolean('DEFAULT', 'fixed_injection_rate')
-max_jobs_in_parallel    = int(config['DEFAULT']['max_jobs_in_parallel'])
-
-job_list = str_to_list(config['DEFAULT']['job_list'])                           # List containing the number of jobs that should be executed for each application
-if len(job_list) > 0:
-    current_job_list = job_list[0]
-    snippet_size = sum(job_list[0])
-    max_num_jobs = snippet_size*len(job_list)
-    inject_fixed_num_jobs = True
-else:
-    current_job_list = []
-    max_num_jobs = int(config['DEFAULT']['max_jobs'])
-    snippet_size = max_num_jobs
-    inject_fixed_num_jobs = config.getboolean('DEFAULT', 'inject_fixed_num_jobs')
-job_counter_list = [0] * len(current_job_list)                                  # List to count the number of injected jobs for each application
-
-## TRACE
-# Assign trace variable to be true to save traces from the execution
-CLEAN_TRACES                        = config.getboolean('TRACE', 'clean_traces')              # Flag used to clear previous traces
-TRACE_TASKS                         = config.getboolean('TRACE', 'trace_tasks')               # Trace information from each task
-TRACE_SYSTEM                        = config.getboolean('TRACE', 'trace_system')              # Trace information from the whole system
-TRACE_FREQUENCY                     = config.getboolean('TRACE', 'trace_frequency')           # Trace frequency variation information
-TRACE_PES                           = config.getboolean('TRACE', 'trace_PEs')                 # Trace information from each PE
-TRACE_IL_PREDICTIONS                = config.getboolean('TRACE', 'trace_IL_predictions')      # Trace the predictions of the IL policy
-TRACE_TEMPERATURE                   = config.getboolean('TRACE', 'trace_temperature')         # Trace temperature information
-TRACE_LOAD                          = config.getboolean('TRACE', 'trace_load')                # Trace system load information
-CREATE_DATASET_DTPM                 = config.getboolean('TRACE', 'create_dataset_DTPM')       # Create dataset for the ML algorithm
-TRACE_FILE_TASKS                    = config['TRACE']['trace_file_tasks']                     # Trace file name for the task trace
-TRACE_FILE_SYSTEM                   = config['TRACE']['trace_file_system']                    # Trace file name for the system trace
-TRACE_FILE_FREQUENCY                = config['TRACE']['trace_file_frequency']                 # Trace file name for the frequency trace
-TRACE_FILE_PES                      = config['TRACE']['trace_file_PEs']                       # Trace file name for the PE trace
-TRACE_FILE_TEMPERATURE              = config['TRACE']['trace_file_temperature']               # Trace file name for the temperature trace
-TRACE_FILE_TEMPERATURE_WORKLOAD     = config['TRACE']['trace_file_temperature_workload']      # Trace file name for the temperature trace (workload)
-TRACE_FILE_LOAD                     = config['TRACE']['trace_file_load']                      # Trace file name for the load trace
-RESULTS                             = config['TRACE']['results']                              # Trace file name for the results of the simulation, including exec time, energy, etc.
-
-## POWER MANAGEMENT
-sampling_rate                   = int(config['POWER MANAGEMENT']['sampling_rate'])                      # Specify the sampling rate for the DVFS mechanism
-sampling_rate_temperature       = int(config['POWER MANAGEMENT']['sampling_rate_temperature'])          # Specify the sampling rate for the temperature update
-util_high_threshold             = float(config['POWER MANAGEMENT']['util_high_threshold'])              # Specify the high threshold (ondemand mode)
-util_low_threshold              = float(config['POWER MANAGEMENT']['util_low_threshold'])               # Specify the low threshold  (ondemand mode)
-enable_throttling               = config.getboolean('POWER MANAGEMENT', 'enable_throttling')            # Flag to enable the thermal throttling
-enable_DTPM_throttling          = config.getboolean('POWER MANAGEMENT', 'enable_DTPM_throttling')       # Flag to enable the thermal throttling for the custom DTPM policies
-C1                              = float(config['POWER MANAGEMENT']['C1'])                               # Coefficient for the leakage model
-C2                              = int(config['POWER MANAGEMENT']['C2'])                                 # Coefficient for the leakage model
-Igate                           = float(config['POWER MANAGEMENT']['Igate'])                            # Coefficient for the leakage model
-T_ambient                       = float(config['POWER MANAGEMENT']['T_ambient'])                        # Ambient temperature
-
-trip_temperature                = str_to_list(config['POWER MANAGEMENT']['trip_temperature'])           # List of temperature trip points
-trip_hysteresis                 = str_to_list(config['POWER MANAGEMENT']['trip_hysteresis'])            # List of hysteresis trip points
-DTPM_trip_temperature           = str_to_list(config['POWER MANAGEMENT']['DTPM_trip_temperature'])      # List of temperature trip points for the custom DTPM policies
-
-## SIMULATION MODE
-simulation_mode = config['SIMULATION MODE']['simulation_mode']                  # Defines under which mode, the simulation will be run
-
-if simulation_mode not in ('validation','performance') :
-    print('[E] Please choose a valid simulation mode')
-    print(simulation_mode)
-    sys.exit()
-
-# variables used under performance mode
-warmup_period       = int(config['SIMULATION MODE']['warmup_period'])                   # is the time period till which no result will be recorded
-num_of_iterations   = int(config['SIMULATION MODE']['num_of_iterations'])               # The number of iteration at each job injection rate
-config_scale_values = config['SIMULATION MODE']['scale_values']
-scale_values_list = str_to_list(config_scale_values)                                    # List of scale values which will determine the job arrival rate under performance mode
-
-# variables used under validation mode
-scale = int(config['SIMULATION MODE']['scale'])                                 # The variable used to adjust the mean value of the job inter-arrival time
-if (simulation_mode == 'validation'):
-    warmup_period = 0                                                           # Warmup period is zero under validation mode
+## The default values of the options that are not given in the configuration (see load_config)
+## The INFO messages and the cleaning of the traces are disabled by default, so that nothing is printed or written unless requested
+default_config = {
+    'DEFAULT'            : {'resource_file': 'SoC.MULTIPLE_BAL.txt',
+                            'job_file': 'job_WIFI_5TXM.txt,job_WIFI_5RXM.txt,job_LAG.txt,job_SCT.txt,job_SCR.txt,job_TEMP_MIT.txt',
+                            'compiled_config_dir': '',
+                            'job_probabilities': '[0.2,0.2,0.2,0.1,0.1,0.2]',
+                            'job_list': '[]',
+                            'inject_fixed_num_jobs': 'yes',
+                            'max_jobs': '100',
+                            'simulation_length': '100000',
+                            'clock': '1',
+                            'engine_mode': 'tick',
+                            'scheduler': 'ETF',
+                            'inject_jobs_asap': 'no',
+                            'fixed_injection_rate': 'no',
+                            'max_jobs_in_parallel': '12',
+                            'random_seed': '1',
+                            'standard_deviation': '0.0'},
+    'TRACE'              : {'clean_traces': 'no',
+                            'trace_tasks': 'no',
+                            'trace_system': 'no',
+                            'trace_frequency': 'no',
+                            'trace_PEs': 'no',
+                            'trace_IL_predictions': 'no',
+                            'trace_temperature': 'no',
+                            'trace_load': 'no',
+                            'create_dataset_DTPM': 'no',
+                            'trace_file_tasks': 'trace_tasks.csv',
+                            'trace_file_system': 'trace_system.csv',
+                            'trace_file_frequency': 'trace_frequency.csv',
+                            'trace_file_PEs': 'trace_PEs.csv',
+                            'trace_file_temperature': 'trace_temperature.csv',
+                            'trace_file_temperature_workload': 'trace_temperature_workload.csv',
+                            'trace_file_load': 'trace_load.csv',
+                            'results': 'results.csv',
+                            'plot_mode': 'none',
+                            'plot_dir': 'plots'},
+    'POWER MANAGEMENT'   : {'sampling_rate': '10',
+                            'sampling_rate_temperature': '20',
+                            'plan_fixed_frequency_tasks': 'no',
+                            'util_high_threshold': '0.8',
+                            'util_low_threshold': '0.3',
+                            'DVFS_mode': '',
+                            'enable_throttling': 'no',
+                            'trip_temperature': '[85, 90, 95]',
+                            'trip_hysteresis': '[3, 3, 3]',
+                            'enable_DTPM_throttling': 'no',
+                            'DTPM_trip_temperature': '[95, 100, 105]',
+                            'C1': '0.002488',
+                            'C2': '2660',
+                            'Igate': '0.000519',
+                            'T_ambient': '42'},
+    'SIMULATION MODE'    : {'simulation_mode': 'performance',
+                            'scale': '100',
+                            'warmup_period': '0',
+                            'completed_jobs_window': '15',
+                            'warmup_forks': '[]',
+                            'num_of_processes': '1',
+                            'result_cache_dir': '',
+                            'result_cache_size': '100',
+                            'num_of_iterations': '1',
+                            'scale_values': '500-501-1'},
+    'COMMUNICATION MODE' : {'packet_size': '256',
+                            'PE_to_PE': 'yes',
+                            'shared_memory': 'no'},
+    'DEBUG'              : {'debug_config': 'no',
+                            'debug_sim': 'no',
+                            'debug_job': 'no',
+                            'debug_sch': 'no'},
+    'INFO'               : {'info_sim': 'no',
+                            'info_job': 'no',
+                            'info_sch': 'no'}}
+
+class ConfigurationError(Exception):
+    '''!
+    Define the ConfigurationError exception, which is raised when the configuration, or a SoC or job file, has an invalid value.
+    '''
+# end class ConfigurationError
+
+config_loaded = False                           # Whether the configuration variables were assigned by load_config
+
+def parse_options(config):
+    '''!
+    Parse the options of the configuration into the configuration variables of DASH-Sim (see parse_config).
+    @param config: The configuration, as a ConfigParser object or a dictionary of sections, or None for config_file.ini
+    @return Dictionary of the configuration variables, indexed by name
+    '''
+    parser = configparser.ConfigParser()
+    parser.read_dict(default_config)
+    if config is None:
+        parser.read('config_file.ini')
+    else:
+        parser.read_dict(config)
+    config = parser
+
+    # Assign debug variable to be true to check the flow of the program
+    DEBUG_CONFIG    = config.getboolean('DEBUG', 'debug_config')                    # Debug variable to check the DASH-Sim configuration related debug messages
+    DEBUG_SIM       = config.getboolean('DEBUG', 'debug_sim')                       # Debug variable to check the Simulation core related debug messages
+    DEBUG_JOB       = config.getboolean('DEBUG', 'debug_job')                       # Debug variable to check the Job generator related debug messages
+    DEBUG_SCH       = config.getboolean('DEBUG', 'debug_sch')                       # Debug variable to check the Scheduler related debug messages
+
+    # Assign info variable to be true to get the information about the flow of the program
+    INFO_SIM        = config.getboolean('INFO', 'info_sim')                         # Info variable to check the Simulation core related info messages
+    INFO_JOB        = config.getboolean('INFO', 'info_job')                         # Info variable to check the job generator related info messages
+    INFO_SCH        = config.getboolean('INFO', 'info_sch')                         # Info variable to check the Scheduler related info messages
+
+    ## DEFAULT
+    resource_file           = config['DEFAULT']['resource_file']                    # SoC configuration file (in config_SoC)
+    job_files               = str_to_list(config['DEFAULT']['job_file'])            # Application configuration files (in config_Jobs)
+    compiled_config_dir     = config.get('DEFAULT', 'compiled_config_dir', fallback='')    # Directory of the compiled SoC and job configurations (empty disables them)
+    scheduler               = config['DEFAULT']['scheduler']                        # Assign scheduler name variable
+    seed                    = int(config['DEFAULT']['random_seed'])                 # Specify a seed value for the random number generator
+    simulation_clk          = int(config['DEFAULT']['clock'])                       # The core simulation engine tick with simulation_clk
+    engine_mode             = config.get('DEFAULT', 'engine_mode', fallback='tick') # Defines whether the core wakes at every tick or only at the ticks with events
+    simulation_length       = int(config['DEFAULT']['simulation_length'])           # The length of the simulation (in us)
+    standard_deviation      = float(config['DEFAULT']['standard_deviation'])        # Standard deviation for randomization of execution time
+    job_probabilities       = str_to_list(config['DEFAULT']['job_probabilities'])   # Probability of each app for being selected as the new job
+    inject_jobs_ASAP        = config.getboolean('DEFAULT', 'inject_jobs_asap')
+    fixed_injection_rate    = config.getboolean('DEFAULT', 'fixed_injection_rate')
+    max_jobs_in_parallel    = int(config['DEFAULT']['max_jobs_in_parallel'])
+
+    job_list = str_to_list(config['DEFAULT']['job_list'])                           # List containing the number of jobs that should be executed for each application
+    if len(job_list) > 0:
+        snippet_size = sum(job_list[0])
+        max_num_jobs = snippet_size*len(job_list)
+        inject_fixed_num_jobs = True
+    else:
+        max_num_jobs = int(config['DEFAULT']['max_jobs'])
+        snippet_size = max_num_jobs
+        inject_fixed_num_jobs = config.getboolean('DEFAULT', 'inject_fixed_num_jobs')
+
+    if engine_mode not in ('tick', 'event'):
+        raise ConfigurationError('Please choose a valid engine mode, i.e., tick or event (engine_mode = %s)' % engine_mode)
+
+    ## TRACE
+    # Assign trace variable to be true to save traces from the execution
+    CLEAN_TRACES                        = config.getboolean('TRACE', 'clean_traces')              # Flag used to clear previous traces
+    TRACE_TASKS                         = config.getboolean('TRACE', 'trace_tasks')               # Trace information from each task
+    TRACE_SYSTEM                        = config.getboolean('TRACE', 'trace_system')              # Trace information from the whole system
+    TRACE_FREQUENCY                     = config.getboolean('TRACE', 'trace_frequency')           # Trace frequency variation information
+    TRACE_PES                           = config.getboolean('TRACE', 'trace_PEs')                 # Trace information from each PE
+    TRACE_IL_PREDICTIONS                = config.getboolean('TRACE', 'trace_IL_predictions')      # Trace the predictions of the IL policy
+    TRACE_TEMPERATURE                   = config.getboolean('TRACE', 'trace_temperature')         # Trace temperature information
+    TRACE_LOAD                          = config.getboolean('TRACE', 'trace_load')                # Trace system load information
+    CREATE_DATASET_DTPM                 = config.getboolean('TRACE', 'create_dataset_DTPM')       # Create dataset for the ML algorithm
+    TRACE_FILE_TASKS                    = config['TRACE']['trace_file_tasks']                     # Trace file name for the task trace
+    TRACE_FILE_SYSTEM                   = config['TRACE']['trace_file_system']                    # Trace file name for the system trace
+    TRACE_FILE_FREQUENCY                = config['TRACE']['trace_file_frequency']                 # Trace file name for the frequency trace
+    TRACE_FILE_PES                      = config['TRACE']['trace_file_PEs']                       # Trace file name for the PE trace
+    TRACE_FILE_TEMPERATURE              = config['TRACE']['trace_file_temperature']               # Trace file name for the temperature trace
+    TRACE_FILE_TEMPERATURE_WORKLOAD     = config['TRACE']['trace_file_temperature_workload']      # Trace file name for the temperature trace (workload)
+    TRACE_FILE_LOAD                     = config['TRACE']['trace_file_load']                      # Trace file name for the load trace
+    RESULTS                             = config['TRACE']['results']                              # Trace file name for the results of the simulation, including exec time, energy, etc. (empty disables the file)
+    plot_mode                           = config.get('TRACE', 'plot_mode', fallback='show')       # How the Gantt chart and the DAGs are rendered under validation mode (show, file, background or none)
+    plot_dir                            = config.get('TRACE', 'plot_dir', fallback='plots')       # Directory of the rendered plots
+
+    if plot_mode not in ('show', 'file', 'background', 'none'):
+        raise ConfigurationError('Please choose a valid plot mode, i.e., show, file, background or none (plot_mode = %s)' % plot_mode)
+
+    ## POWER MANAGEMENT
+    sampling_rate                   = int(config['POWER MANAGEMENT']['sampling_rate'])                      # Specify the sampling rate for the DVFS mechanism
+    sampling_rate_temperature       = int(config['POWER MANAGEMENT']['sampling_rate_temperature'])          # Specify the sampling rate for the temperature update
+    plan_fixed_frequency_tasks      = config.getboolean('POWER MANAGEMENT', 'plan_fixed_frequency_tasks')   # Flag to plan the tasks of the clusters with a fixed frequency in one step
+    util_high_threshold             = float(config['POWER MANAGEMENT']['util_high_threshold'])              # Specify the high threshold (ondemand mode)
+    util_low_threshold              = float(config['POWER MANAGEMENT']['util_low_threshold'])               # Specify the low threshold  (ondemand mode)
+    enable_throttling               = config.getboolean('POWER MANAGEMENT', 'enable_throttling')            # Flag to enable the thermal throttling
+    enable_DTPM_throttling          = config.getboolean('POWER MANAGEMENT', 'enable_DTPM_throttling')       # Flag to enable the thermal throttling for the custom DTPM policies
+    C1                              = float(config['POWER MANAGEMENT']['C1'])                               # Coefficient for the leakage model
+    C2                              = int(config['POWER MANAGEMENT']['C2'])                                 # Coefficient for the leakage model
+    Igate                           = float(config['POWER MANAGEMENT']['Igate'])                            # Coefficient for the leakage model
+    T_ambient                       = float(config['POWER MANAGEMENT']['T_ambient'])                        # Ambient temperature
+    DVFS_mode                       = config.get('POWER MANAGEMENT', 'DVFS_mode', fallback='')              # DVFS mode of all clusters with DVFS, overriding the SoC file (empty keeps the SoC file)
+
+    trip_temperature                = str_to_list(config['POWER MANAGEMENT']['trip_temperature'])           # List of temperature trip points
+    trip_hysteresis                 = str_to_list(config['POWER MANAGEMENT']['trip_hysteresis'])            # List of hysteresis trip points
+    DTPM_trip_temperature           = str_to_list(config['POWER MANAGEMENT']['DTPM_trip_temperature'])      # List of temperature trip points for the custom DTPM policies
+
+    ## SIMULATION MODE
+    simulation_mode = config['SIMULATION MODE']['simulation_mode']                  # Defines under which mode, the simulation will be run
+
+    if simulation_mode not in ('validation','performance') :
+        raise ConfigurationError('Please choose a valid simulation mode, i.e., validation or performance (simulation_mode = %s)' % simulation_mode)
+
+    # variables used under performance mode
+    warmup_period       = int(config['SIMULATION MODE']['warmup_period'])                   # is the time period till which no result will be recorded
+    num_of_iterations   = int(config['SIMULATION MODE']['num_of_iterations'])               # The number of iteration at each job injection rate
+    config_scale_values = config['SIMULATION MODE']['scale_values']
+    scale_values_list = str_to_list(config_scale_values)                                    # List of scale values which will determine the job arrival rate under performance mode
+    completed_jobs_window = config.getint('SIMULATION MODE', 'completed_jobs_window', fallback=15)    # Number of most recent jobs whose completed tasks are kept
+    warmup_forks = str_to_list(config.get('SIMULATION MODE', 'warmup_forks', fallback='[]'))        # Continuations (scheduler[:DVFS policy]) forked from a single warmup
+    num_of_processes = config.getint('SIMULATION MODE', 'num_of_processes', fallback=1)        # Number of worker processes that simulate the (scale, iteration) points
+    result_cache_dir = config.get('SIMULATION MODE', 'result_cache_dir', fallback='')          # Directory of the result cache of the sweep points (empty disables the cache)
+    result_cache_size = config.getfloat('SIMULATION MODE', 'result_cache_size', fallback=100)  # Maximum size of the result cache (in MB)
+
+    # variables used under validation mode
+    scale = int(config['SIMULATION MODE']['scale'])                                 # The variable used to adjust the mean value of the job inter-arrival time
+    if (simulation_mode == 'validation'):
+        warmup_period = 0                                                           # Warmup period is zero under validation mode
+        completed_jobs_window = -1                                                  # All completed tasks are kept for the Gantt chart under validation mode
+        warmup_forks = []                                                           # There is no warmup period to fork from under validation mode
+
+    ## COMMUNICATION MODE
+    packet_size      = int(config['COMMUNICATION MODE']['packet_size'])               # The packet size (in bits)
+    PE_to_PE         = config.getboolean('COMMUNICATION MODE', 'PE_to_PE')            # The communication mode in which data is sent, directly, from a PE to a PE
+    shared_memory    = config.getboolean('COMMUNICATION MODE', 'shared_memory')       # The communication mode in which data is sent from a PE to a PE through a shared memory
+
+    if (PE_to_PE) and (shared_memory):
+        raise ConfigurationError('Please chose only one of the communication modes')
+    elif (not PE_to_PE) and (not shared_memory):
+        raise ConfigurationError('Please chose one of the communication modes')
+
+    return {name: value for name, value in locals().items() if name != 'parser'}
+# end of def parse_options(config)
+
+def parse_config(config=None):
+    '''!
+    Parse a configuration without assigning its variables, e.g., to check it.
+    The options that are not given in the configuration take their values from default_config.
+    @param config: The configuration, as a ConfigParser object or a dictionary of sections, or None for config_file.ini
+    @return Dictionary of the configuration variables, indexed by name
+    @exception ConfigurationError: The configuration has an invalid value
+    '''
+    try:
+        return parse_options(config)
+    except (ValueError, SyntaxError) as error:                                  # A number or a list that cannot be parsed
+        raise ConfigurationError('Invalid value in the configuration: %s' % error) from None
+# end of def parse_config(config=None)
+
+def load_config(config=None):
+    '''!
+    Assign the configuration variables of DASH-Sim (e.g., scheduler or scale_values_list), which are used by all modules.
+    The options that are not given in the configuration take their values from default_config.
+    @param config: The configuration, as a ConfigParser object or a dictionary of sections (e.g., {'DEFAULT': {'scheduler': 'MET'}}).
+                   config_file.ini is read if no configuration is given
+    @exception ConfigurationError: The configuration has an invalid value
+    '''
+    global config_loaded
+
+    globals().update(parse_config(config))
+    config_loaded = True
+# end of def load_config(config=None)
+
+def exit_with_error(error):
+    '''!
+    Print the message of an error, e.g., a ConfigurationError, and exit.
+    Only the scripts of DASH-Sim exit (in their __main__ section), the other functions raise the error.
+    @param error: The error, whose message may have several lines
+    '''
+    for line in str(error).split('\n'):
+        print('[E] %s' % line)
+    sys.exit(1)
+# end of def exit_with_error(error)
+
+def __getattr__(name):
+    '''!
+    Read config_file.ini when a configuration variable is used before load_config is called, e.g., by the scripts of DASH-Sim.
+    Therefore, importing this module does not read any file.
+    @param name: Name of the variable
+    @return Value of the variable
+    '''
+    if not config_loaded and not name.startswith('__'):
+        load_config()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+# end of def __getattr__(name)
 
 ## COMMUNICATION MODE
-packet_size      = int(config['COMMUNICATION MODE']['packet_size'])               # The packet size (in bits)
-PE_to_PE         = config.getboolean('COMMUNICATION MODE', 'PE_to_PE')            # The communication mode in which data is sent, directly, from a PE to a PE
-shared_memory    = config.getboolean('COMMUNICATION MODE', 'shared_memory')       # The communication mode in which data is sent from a PE to a PE through a shared memory
 write_time       = -1
 read_time        = -1
 PE_to_Cache      = {}
 
-if (PE_to_PE) and (shared_memory):
-    print('[E] Please chose only one of the communication modes')
-    sys.exit()
-elif (not PE_to_PE) and (not shared_memory):
-    print('[E] Please chose one of the communication modes')
-    sys.exit()
-
-iteration = 0
-
-# The variables used by table-based schedulers
-table   = -1
-table_2 = -1
-table_3 = -1
-table_4 = -1
-temp_list = []
-# Additional variables used by list-based schedulers
-current_dag      = nx.DiGraph()
-computation_dict = {}
-power_dict       = {}
-
 ## DTPM
-current_temperature_vector  = [T_ambient,                  # Indicate the current PE temperature for each hotspot
-                               T_ambient,
-                               T_ambient,
-                               T_ambient,
-                               T_ambient]
-B_model = []
-throttling_state = -1
 trace_file_num = 0
 DVFS_cfg_list = []
-
-# Snippet_inj is incremented every time a snippet finishes being injected
-snippet_ID_inj                      = -1
-# Snippet_exec is incremented every time a snippet finishes being executed
-snippet_ID_exec                     = 0
-snippet_throttle                    = -1
-snippet_temp_list                   = []
-snippet_initial_temp                = [T_ambient,
-                                       T_ambient,
-                                       T_ambient,
-                                       T_ambient,
-                                       T_ambient]
-
-snippet_start_time                  = 0
 ## End of DTPM
 
 class PerfStatics:
@@ -196,18 +329,16 @@ class PerfStatics:
         self.sampling_rate_list = []
 # end class PerfStatics
 
-# Instantiate the object that will store the performance statistics
-global results
-
 class Validation:
     '''!
     Define the Validation class to compare the generated and completed jobs.
     '''
-    start_times = []
-    finish_times = []
-    generated_jobs = []
-    injected_jobs = []
-    completed_jobs = []
+    def __init__(self):
+        self.start_times = []
+        self.finish_times = []
+        self.generated_jobs = []
+        self.injected_jobs = []
+        self.completed_jobs = []
 # end class Validation
 
 class Resource:
@@ -223,7 +354,7 @@ class Resource:
         self.capacity = 1                       # Number tasks that a resource can run simultaneously. Default value is 1.
         self.num_of_functionalites = 0          # This variable shows how many different task this resource can run
         self.supported_functionalities = []     # List of all tasks can be executed by Resource
-        self.performance = []                   # List of runtime (in micro seconds) for each supported task
+        self.performance = []                   # Runtime (in micro seconds) of each supported task, a read-only array after parsing
         self.idle = True                        # initial state of Resource which idle and ready for a task (normalized to the number of instructions)
         self.mesh_name = -1
         self.position = -1
@@ -252,59 +383,539 @@ class Tasks:
     '''!
     Define the Tasks class to maintain the list of tasks.
     It stores properties of the tasks.
+    The attributes are declared in __slots__ to keep the tasks compact when a large number of jobs is injected.
     '''
+    __slots__ = ('name', 'ID', 'predecessors', 'successors', 'remaining_predecessors', 'est', 'deadline',
+                 'head', 'tail', 'jobID', 'jobname', 'app_ID', 'base_ID', 'head_ID', 'dag_depth', 'PE_ID',
+                 'start_time', 'finish_time', 'order', 'dynamic_dependencies', 'pending_dynamic_dependencies',
+                 'ready_wait_time', 'execution_wait_time', 'PE_to_PE_wait_time', 'task_elapsed_time_max_freq',
+                 'job_start', 'time_stamp', 'input_packet_size', 'output_packet_size')
+
     def __init__(self):
         self.name = ''                          # The name of the task
         self.ID = -1                            # This is the unique ID of the task. "-1" means it is not initialized
         self.predecessors = []                  # List of all task IDs to identify task dependency
+        self.successors = []                    # List of tasks that depend on this task (populated when the job is generated)
+        self.remaining_predecessors = 0         # Number of predecessors that are not completed yet
         self.est = -1                           # This variable represents the earliest time that a task can start
         self.deadline = -1                      # This variable represents the deadline for a task
         self.head = False                       # If head is true, this task is the leading (the first) element in a task graph
         self.tail = False                       # If tail is true, this task is the end (the last) element in a task graph
         self.jobID = -1                         # This task belongs to job with this ID
         self.jobname = ''                       # This task belongs to job with this name
+        self.app_ID = -1                        # This task belongs to the application with this ID (index in the application table)
         self.base_ID = -1                       # This ID will be used to calculate the data volume from one task to another
+        self.head_ID = -1                       # ID of the head task of the job of this task
+        self.dag_depth = -1                     # Distance of the task from the deepest task of its DAG
         self.PE_ID = -1                         # Holds the PE ID on which the task will be executed
         self.start_time = -1                    # Execution start time of a task
         self.finish_time = -1                   # Execution finish time of a task
-        self.order = -1                         # Relative ordering of this task on a particular PE
-        self.dynamic_dependencies = []          # List of dynamic dependencies that a scheduler requests are satisfied before task launch
-        self.ready_wait_times = []              # List holding wait times for a task for being ready due to communication time from its predecessor
-        self.execution_wait_times = []          # List holding wait times for a task for being execution-ready due to communication time between memory and a PE 
-        self.PE_to_PE_wait_time = []            # List holding wait times for a task for being execution-ready due to PE to PE communication time
         self.order = -1                         # Execution order if a list based scheduler is used, e.g., ILP
+        self.dynamic_dependencies = ()          # IDs of the dynamic dependencies that a scheduler requests are satisfied before task launch
+        self.pending_dynamic_dependencies = 0   # Number of dynamic dependencies that are not completed yet
+        self.ready_wait_time = -1               # Latest time at which the task is ready due to the communication time from its predecessors
+        self.execution_wait_time = -1           # Latest time at which the task is execution-ready due to the communication time between memory and a PE
+        self.PE_to_PE_wait_time = -1            # Latest time at which the task is execution-ready due to the PE to PE communication time
         self.task_elapsed_time_max_freq = 0     # Indicate the current execution time for a given task
         self.job_start = -1                     # Holds the execution start time of a head task (also execution start time for a job)
         self.time_stamp = -1                    # This values used to check whether all data for the task is transferred or not
         self.input_packet_size = -1
         self.output_packet_size = -1
+
+    def instantiate(self, jobID, offset):
+        '''!
+        Create the task of a new job from this task of the application.
+        Only the fields parsed from the job file are taken from the application task, the rest of the fields start from their initial values.
+        @param jobID: ID of the new job
+        @param offset: ID of the first task of the new job
+        @return Tasks object of the new job
+        '''
+        task = Tasks()
+        task.name = self.name
+        task.ID = self.base_ID + offset
+        task.base_ID = self.base_ID
+        task.jobID = jobID
+        task.jobname = self.jobname
+        task.app_ID = self.app_ID
+        task.predecessors = [predecessor + offset for predecessor in self.predecessors]
+        task.est = self.est
+        task.deadline = self.deadline
+        task.head = self.head
+        task.tail = self.tail
+        task.dag_depth = self.dag_depth
+        task.input_packet_size = self.input_packet_size
+        task.output_packet_size = self.output_packet_size
+        return task
 # end class Tasks
 
 class TaskManager:
     '''!
     Define the TaskManager class to maintain the list of the tasks in our DASH-SoC model.
     '''
-    def __init__(self):
-        self.list = []                          # List of available tasks
+    def __init__(self, task_list=None):
+        '''!
+        @param task_list: Container of the tasks, a TaskList by default
+        '''
+        if task_list is None:
+            task_list = TaskList()
+        self.list = task_list                   # List of available tasks
 # end class TaskManager
 
+class TaskList:
+    '''!
+    Define the TaskList class to store the tasks of a queue indexed by their IDs.
+    The tasks are kept in insertion order and they can be added, removed and looked up in constant time.
+    The list operations used by the simulator and the schedulers (iteration, indexing, sort, pop, etc.) are also supported.
+    '''
+    def __init__(self, tasks=()):
+        '''!
+        @param tasks: Initial tasks of the list
+        '''
+        self.tasks = {}                         # Tasks in insertion order, indexed by their IDs
+        for task in tasks:
+            self.append(task)
+
+    def append(self, task):
+        '''!
+        Add a task to the end of the list.
+        @param task: Task to be added
+        '''
+        self.tasks[task.ID] = task
+
+    def extend(self, tasks):
+        '''!
+        Add several tasks to the end of the list.
+        @param tasks: Tasks to be added
+        '''
+        for task in tasks:
+            self.append(task)
+
+    def remove(self, task):
+        '''!
+        Remove a task from the list.
+        @param task: Task to be removed
+        '''
+        if self.tasks.pop(task.ID, None) is None:
+            raise ValueError('TaskList.remove(x): x not in list')
+
+    def get(self, ID, default=None):
+        '''!
+        Look up a task by its ID.
+        @param ID: ID of the task
+        @param default: Value returned if the task is not in the list
+        @return The task with the given ID, or default
+        '''
+        return self.tasks.get(ID, default)
+
+    def pop(self, index=-1):
+        '''!
+        Remove a task from the list and return it.
+        @param index: Position of the task, the last task by default
+        @return The removed task
+        '''
+        if index == -1 and self.tasks:
+            return self.tasks.popitem()[1]
+        return self.tasks.pop(self.get_ID(index))
+
+    def sort(self, key=None, reverse=False):
+        '''!
+        Sort the list in place, the sort is stable as list.sort.
+        @param key: Function that returns the comparison key of a task
+        @param reverse: If True, sort in descending order
+        '''
+        self.tasks = {task.ID: task for task in sorted(self.tasks.values(), key=key, reverse=reverse)}
+
+    def index(self, task):
+        '''!
+        @param task: Task to be found
+        @return Position of the task in the list
+        '''
+        for i, ID in enumerate(self.tasks):
+            if ID == task.ID:
+                return i
+        raise ValueError('TaskList.index(x): x not in list')
+
+    def clear(self):
+        '''!
+        Remove all tasks from the list.
+        '''
+        self.tasks.clear()
+
+    def get_ID(self, index):
+        '''!
+        @param index: Position of a task in the list
+        @return ID of the task at the given position
+        '''
+        if index == 0 and self.tasks:
+            return next(iter(self.tasks))
+        if index == -1 and self.tasks:
+            return next(reversed(self.tasks))
+        return list(self.tasks)[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.tasks.values())[index]
+        return self.tasks[self.get_ID(index)]
+
+    def __setitem__(self, index, task):
+        # A task can only appear once in the list. If the new task is already in the list,
+        # it is swapped with the task at the given position, e.g., a, b = b, a swaps two tasks
+        tasks = list(self.tasks.values())
+        old_task = tasks[index]
+        if task.ID in self.tasks:
+            tasks[self.index(task)] = old_task
+        tasks[index] = task
+        self.tasks = {task.ID: task for task in tasks}
+
+    def __delitem__(self, index):
+        del self.tasks[self.get_ID(index)]
+
+    def __contains__(self, task):
+        return task.ID in self.tasks
+
+    def __iter__(self):
+        # Iterate over a snapshot so that tasks can be removed from the list while iterating over it
+        return iter(tuple(self.tasks.values()))
+
+    def __reversed__(self):
+        return iter(tuple(reversed(self.tasks.values())))
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __add__(self, other):
+        return list(self.tasks.values()) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self.tasks.values())
+
+    def __repr__(self):
+        return 'TaskList(%s)' % list(self.tasks.values())
+# end class TaskList
+
+class TimedTaskList(TaskList):
+    '''!
+    Define the TimedTaskList class to store the tasks that wait for their time stamps, i.e., the wait_ready and executable queues.
+    The tasks that are not due yet are kept in a heap ordered by (time_stamp, jobID), so that only the due tasks are visited at each tick.
+    The due tasks are bucketed by the PE they are assigned to, so that the number of due tasks of a PE is available in constant time.
+    The time stamp and the PE of a task must be set before the task is added to the list.
+    '''
+    def __init__(self, tasks=()):
+        '''!
+        @param tasks: Initial tasks of the list
+        '''
+        self.heap = []                          # Heap of (time_stamp, jobID, sequence number, task ID) for the tasks that are not due yet
+        self.due = {}                           # Sorted lists of (jobID, sequence number, task ID) for the due tasks, indexed by PE ID
+        self.due_PE = {}                        # PE ID of the bucket of each due task
+        self.sequence = {}                      # Sequence number of each task, i.e., the order in which the tasks were added
+        self.counter = 0                        # Sequence number of the next task
+        TaskList.__init__(self, tasks)
+
+    def append(self, task):
+        TaskList.append(self, task)
+        self.sequence[task.ID] = self.counter
+        heapq.heappush(self.heap, (task.time_stamp, task.jobID, self.counter, task.ID))
+        self.counter += 1
+
+    def remove(self, task):
+        # The entries in the heap are discarded when they reach the top of the heap
+        TaskList.remove(self, task)
+        sequence = self.sequence.pop(task.ID)
+        if task.ID in self.due_PE:
+            bucket = self.due[self.due_PE.pop(task.ID)]
+            del bucket[bisect.bisect_left(bucket, (task.jobID, sequence, task.ID))]
+
+    def pop(self, index=-1):
+        task = self[index]
+        self.remove(task)
+        return task
+
+    def clear(self):
+        TaskList.clear(self)
+        self.heap.clear()
+        self.due.clear()
+        self.due_PE.clear()
+        self.sequence.clear()
+
+    def __delitem__(self, index):
+        self.remove(self[index])
+
+    def sort_key(self, task):
+        '''!
+        @param task: Task in the list
+        @return Key that orders the tasks by job ID, and by the order in which they were added for the same job ID
+        '''
+        return (task.jobID, self.sequence[task.ID])
+
+    def update_due(self, timestamp):
+        '''!
+        Move the tasks whose time stamp is smaller than or equal to the given timestamp to the due buckets.
+        @param timestamp: Current timestamp
+        '''
+        while self.heap and self.heap[0][0] <= timestamp:
+            time_stamp, jobID, sequence, ID = heapq.heappop(self.heap)
+            if self.sequence.get(ID) == sequence:
+                PE_ID = self.tasks[ID].PE_ID
+                bisect.insort(self.due.setdefault(PE_ID, []), (jobID, sequence, ID))
+                self.due_PE[ID] = PE_ID
+
+    def get_due(self, timestamp):
+        '''!
+        Get the tasks whose time stamp is smaller than or equal to the given timestamp.
+        @param timestamp: Current timestamp
+        @return List of due tasks ordered by sort_key
+        '''
+        self.update_due(timestamp)
+        return [self.tasks[entry[2]] for entry in heapq.merge(*self.due.values())]
+
+    def get_due_per_PE(self, timestamp):
+        '''!
+        Get the tasks whose time stamp is smaller than or equal to the given timestamp for each PE.
+        @param timestamp: Current timestamp
+        @return Dictionary that maps each PE ID to the list of its due tasks ordered by sort_key
+        '''
+        self.update_due(timestamp)
+        return {PE_ID: [self.tasks[entry[2]] for entry in bucket] for PE_ID, bucket in self.due.items() if bucket}
+
+    def get_num_due(self, timestamp, PE_ID):
+        '''!
+        @param timestamp: Current timestamp
+        @param PE_ID: ID of the PE
+        @return Number of due tasks assigned to the PE
+        '''
+        self.update_due(timestamp)
+        return len(self.due.get(PE_ID, ()))
+
+    def pop_due(self, timestamp):
+        '''!
+        Remove the tasks whose time stamp is smaller than or equal to the given timestamp.
+        @param timestamp: Current timestamp
+        @return List of due tasks in the order in which they were added
+        '''
+        due_tasks = sorted(self.get_due(timestamp), key=lambda task: self.sequence[task.ID])
+        for task in due_tasks:
+            self.remove(task)
+        return due_tasks
+
+    def next_time_stamp(self, timestamp):
+        '''!
+        @param timestamp: Current timestamp
+        @return The earliest time stamp that is larger than the given timestamp, None if all tasks are due
+        '''
+        self.update_due(timestamp)
+        while self.heap and self.sequence.get(self.heap[0][3]) != self.heap[0][2]:
+            heapq.heappop(self.heap)
+        if self.heap:
+            return self.heap[0][0]
+        return None
+# end class TimedTaskList
+
+class CompletionRecords:
+    '''!
+    Define the CompletionRecords class to keep the PE ID and the finish time of the completed tasks, indexed by task ID.
+    The records of the tasks dropped from the completed queue are removed. Since the task IDs increase with the job IDs,
+    the tasks of the dropped jobs are known to be completed from a watermark, i.e., the first task ID after the dropped jobs.
+    '''
+    def __init__(self):
+        self.records = {}                       # (PE ID, finish time) of each completed task, indexed by task ID
+        self.dropped_ID = 0                     # The tasks with a lower ID belong to the jobs dropped from the completed queue
+
+    def add(self, task):
+        '''!
+        Record a completed task.
+        @param task: Task that just completed execution
+        '''
+        self.records[task.ID] = (task.PE_ID, task.finish_time)
+
+    def remove(self, ID, end_ID):
+        '''!
+        Remove the record of a task that is dropped from the completed queue with its job, the tasks of the job are still known to be completed.
+        @param ID: ID of the task
+        @param end_ID: ID of the first task after the job of the task
+        '''
+        self.records.pop(ID, None)
+        self.dropped_ID = max(self.dropped_ID, end_ID)
+
+    def is_completed(self, ID):
+        '''!
+        @param ID: ID of the task
+        @return True if the task completed execution or its job is dropped from the completed queue
+        '''
+        return ID < self.dropped_ID or ID in self.records
+
+    def get(self, ID):
+        '''!
+        @param ID: ID of the task
+        @return (PE ID, finish time) of the task, (-1, -1) if there is no record of the task
+        '''
+        return self.records.get(ID, (-1, -1))
+# end class CompletionRecords
+
+class CompletedTaskList(TaskList):
+    '''!
+    Define the CompletedTaskList class to keep the history of the completed tasks.
+    The tasks are grouped in per-job buckets, kept in a deque ordered by job ID, so that the tasks of the oldest job are dropped at once.
+    The tasks are also kept per PE in order of their finish times, until they finish before the current sampling period of the utilization.
+    '''
+    def __init__(self, window=-1):
+        '''!
+        @param window: Number of most recent jobs whose tasks are kept (-1 keeps all tasks)
+        '''
+        self.window = window
+        self.job_IDs = collections.deque()      # IDs of the jobs with completed tasks, in increasing order
+        self.job_buckets = {}                   # Completed tasks of each job, indexed by job ID
+        self.PE_history = {}                    # Completed tasks of each PE in order of their finish times, indexed by PE ID
+        TaskList.__init__(self)
+
+    def append(self, task):
+        TaskList.append(self, task)
+        if task.jobID not in self.job_buckets:
+            if not self.job_IDs or task.jobID > self.job_IDs[-1]:
+                self.job_IDs.append(task.jobID)
+            else:
+                self.job_IDs.insert(bisect.bisect(self.job_IDs, task.jobID), task.jobID)
+            self.job_buckets[task.jobID] = []
+        self.job_buckets[task.jobID].append(task)
+        self.PE_history.setdefault(task.PE_ID, collections.deque()).append(task)
+
+    def remove(self, task):
+        TaskList.remove(self, task)
+        bucket = self.job_buckets[task.jobID]
+        bucket.remove(task)
+        if not bucket:
+            del self.job_buckets[task.jobID]
+            self.job_IDs.remove(task.jobID)
+        if task in self.PE_history.get(task.PE_ID, ()):
+            self.PE_history[task.PE_ID].remove(task)
+
+    def pop(self, index=-1):
+        task = self[index]
+        self.remove(task)
+        return task
+
+    def clear(self):
+        TaskList.clear(self)
+        self.job_IDs.clear()
+        self.job_buckets.clear()
+        self.PE_history.clear()
+
+    def __delitem__(self, index):
+        self.remove(self[index])
+
+    def get_job(self, jobID):
+        '''!
+        @param jobID: ID of the job
+        @return List of the completed tasks of the job
+        '''
+        return self.job_buckets.get(jobID, [])
+
+    def drop_old_jobs(self):
+        '''!
+        Drop the tasks of the oldest jobs until the kept jobs fit in the window.
+        The tasks stay in the history of their PE for the utilization.
+        @return List of the dropped tasks
+        '''
+        dropped_tasks = []
+        if self.window < 0:
+            return dropped_tasks
+        while self.job_IDs and (self.job_IDs[-1] - self.job_IDs[0]) > self.window:
+            for task in self.job_buckets.pop(self.job_IDs.popleft()):
+                del self.tasks[task.ID]
+                dropped_tasks.append(task)
+        return dropped_tasks
+
+    def get_PE_history(self, PE_ID, lower_bound):
+        '''!
+        Get the tasks completed by a PE that finished at or after the lower bound.
+        The lower bound must not decrease between the calls, since the tasks that finished before are forgotten.
+        @param PE_ID: ID of the PE
+        @param lower_bound: Start time of the window under consideration
+        @return Completed tasks of the PE in order of their finish times
+        '''
+        history = self.PE_history.get(PE_ID, collections.deque())
+        while history and history[0].finish_time < lower_bound:
+            history.popleft()
+        return history
+# end class CompletedTaskList
+
+class DynamicDependencies:
+    '''!
+    Define the DynamicDependencies class to keep track of the dynamic dependencies that a scheduler requests.
+    Each task counts its dynamic dependencies that are not completed yet, the counter is decremented when a dependency completes.
+    '''
+    def __init__(self, completion_records):
+        '''!
+        @param completion_records: CompletionRecords object of the simulation, whose completed tasks satisfy the dependencies
+        '''
+        self.completion_records = completion_records
+        self.dependents = {}                    # Tasks waiting for the completion of each task, indexed by task ID
+
+    def set(self, task, dependencies):
+        '''!
+        Replace the dynamic dependencies of a task.
+        @param task: Task whose dynamic dependencies are set
+        @param dependencies: IDs of the tasks that must complete before the task is launched
+        '''
+        for ID in task.dynamic_dependencies:
+            if task in self.dependents.get(ID, ()):
+                self.dependents[ID].remove(task)
+        task.dynamic_dependencies = list(dependencies)
+        task.pending_dynamic_dependencies = 0
+        for ID in task.dynamic_dependencies:
+            if not self.completion_records.is_completed(ID):
+                task.pending_dynamic_dependencies += 1
+                self.dependents.setdefault(ID, []).append(task)
+
+    def complete(self, task):
+        '''!
+        Clear the dynamic dependencies on a task that just completed execution.
+        @param task: Completed task
+        '''
+        for dependent in self.dependents.pop(task.ID, ()):
+            dependent.pending_dynamic_dependencies -= 1
+# end class DynamicDependencies
+
 class Applications:
     '''!
     Define the Applications class to maintain all information about an application (job)
     '''
     def __init__(self):
         self.name =  ''                         # The name of the application
+        self.ID = -1                            # The ID of the application, i.e., its index in the application table
         self.task_list = []                     # List of all tasks in an application
+        self.task_names = []                    # Names of the tasks, indexed by their base IDs
+        self.predecessors = []                  # Predecessors of the tasks, indexed by their base IDs
         self.comm_vol = []                      # This variable represents the communication volume matrix
         # i.e. each entry is data volume should be transferred from one task to another
+        self.head_ID = -1                       # ID of the head task, if this is a job
+
+    def instantiate(self, jobID, offset):
+        '''!
+        Create a new job, i.e., an instance of this application.
+        The tables of the application (task names, predecessors and communication volumes) are shared by all its jobs,
+        and only the tasks of the job are created.
+        @param jobID: ID of the new job
+        @param offset: ID of the first task of the new job
+        @return Applications object of the new job
+        '''
+        job = Applications()
+        job.name = self.name
+        job.ID = self.ID
+        job.task_names = self.task_names
+        job.predecessors = self.predecessors
+        job.comm_vol = self.comm_vol
+        job.task_list = [task.instantiate(jobID, offset) for task in self.task_list]
+        return job
 # end class Applications
 
 class ApplicationManager:
     '''!
     Define the ApplicationManager class to maintain the list of the applications (jobs) in our DASH-SoC model.
+    The list is the application table, i.e., an application is found by indexing the list with its ID.
     '''
     def __init__(self):
-        self.list = []                          # List of all applications
+        self.list = []                          # List of all applications, indexed by application ID
+        self.IDs = {}                           # Application IDs, indexed by application name
 # end class ApplicationManager
 
 class TaskQueues:
@@ -318,8 +929,90 @@ class TaskQueues:
         self.completed = []                     # List of completed tasks
         self.wait_ready = []                    # List of task waiting for being pushed into ready queue because of memory communication time
         self.executable = []                    # List of task waiting for being executed because of memory communication time 
+        self.completion_records = {}            # PE ID and finish time of the completed tasks
+        self.dynamic_dependencies = {}          # Tasks waiting for the completion of their dynamic dependencies
 # end class TaskQueues
 
+class Simulation:
+    '''!
+    Define the Simulation class that holds the state of a simulation.
+    The configuration parameters stay in this module, while everything that changes while a simulation runs is kept here,
+    so that several simulations can live in the same process.
+    '''
+    def __init__(self):
+        if not config_loaded:
+            load_config()
+        variables = globals()                   # The configuration variables, which are assigned by load_config
+
+        self.TaskQueues = TaskQueues()          # Task queues, populated by the job generator
+        self.results = PerfStatics()            # Performance statistics of the simulation
+        self.validation = Validation()          # Generated, injected and completed jobs under validation mode
+        self.cluster_list = []                  # List of available clusters, populated by the SoC parser
+        self.comm_band = []                     # Communication bandwidth matrix between the resources, populated by the SoC parser
+        self.iteration = 0                      # Iteration of the simulation for the current scale value
+        self.continuations = {}                 # Results of the continuations forked after the warmup period, indexed by continuation
+        self.averages = {}                      # Results averaged over the iterations, indexed by (scale, continuation) under performance mode
+        self.iteration_results = {}             # Results of each iteration, indexed by (scale, iteration, continuation) under performance mode
+        self.timeline = []                      # Timeline of the completed tasks under validation mode (see DASH_Sim_plots.get_timeline)
+        self.DAGs = []                          # DAGs of the applications under validation mode (see DASH_Sim_plots.get_DAGs)
+        self.scale = variables['scale']         # Current scale value, which determines the job arrival rate
+
+        # The variables used by table-based schedulers
+        self.table   = -1
+        self.table_2 = -1
+        self.table_3 = -1
+        self.table_4 = -1
+        self.temp_list = []
+        self.ilp_job_list = []
+        # Additional variables used by list-based schedulers
+        self.current_dag      = None            # DAG of the outstanding tasks, if a list-based scheduler builds one (networkx.DiGraph)
+        self.computation_dict = {}
+        self.power_dict       = {}
+
+        job_list = variables['job_list']
+        if len(job_list) > 0:
+            self.current_job_list = job_list[0]                                 # The snippet that is currently injected
+        else:
+            self.current_job_list = []
+
+        self.init_variables_at_sim_start()
+    # end of def __init__(self)
+
+    def init_variables_at_sim_start(self):
+        '''!
+        Initialize the variables that are reset at the start of each simulation.
+        '''
+        T_ambient = globals()['T_ambient']                                      # Assigned by load_config
+        ## DTPM
+        self.current_temperature_vector = [T_ambient,                           # Indicate the current PE temperature for each hotspot
+                                           T_ambient,
+                                           T_ambient,
+                                           T_ambient,
+                                           T_ambient]
+        self.B_model = []
+        self.throttling_state = -1
+
+        # Snippet_inj is incremented every time a snippet finishes being injected
+        self.snippet_ID_inj = -1
+        # Snippet_exec is incremented every time a snippet finishes being executed
+        self.snippet_ID_exec = 0
+        self.snippet_throttle = -1
+        self.snippet_temp_list = []
+        self.snippet_initial_temp = [T_ambient,
+                                     T_ambient,
+                                     T_ambient,
+                                     T_ambient,
+                                     T_ambient]
+        self.snippet_start_time = globals()['warmup_period']
+        ## End of DTPM
+
+        self.job_counter_list = [0] * len(self.current_job_list)                # List to count the number of injected jobs for each application
+
+        for cluster in self.cluster_list:                                       # The clusters are parsed once, and their DVFS state is reset for each simulation
+            cluster.init_variables_at_sim_start()
+    # end of def init_variables_at_sim_start(self)
+# end class Simulation
+
 # =============================================================================
 # def clear_screen():
 #     '''
@@ -336,3 +1029,19 @@ class TaskQueues:
 # # end of def clear_screen()
 # =============================================================================
 
+class Results:
+    '''!
+    Define the Results class, which holds the results of a simulation run by DASH_Sim_v0.simulate.
+    '''
+    def __init__(self, sim):
+        '''!
+        @param sim: The Simulation object of the simulation
+        '''
+        self.scale_results = sim.averages                   # Results averaged over the iterations, indexed by (scale, continuation) under performance mode
+        self.iteration_results = sim.iteration_results      # Results of each iteration (e.g., energy or active_time of each PE), indexed by (scale, iteration, continuation)
+        self.statistics = sim.results                       # PerfStatics object of the last iteration (or of the simulation under validation mode)
+        self.continuations = sim.continuations              # PerfStatics objects of the continuations of the last iteration, indexed by continuation
+        self.timeline = sim.timeline                        # Timeline of the completed tasks under validation mode, which can be rendered with DASH_Sim_plots
+        self.DAGs = sim.DAGs                                # DAGs of the applications under validation mode
+    # end of def __init__(self, sim)
+# end class Results
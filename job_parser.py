@@ -1,16 +1,35 @@
 '''!
 @brief This file contains the code to parse jobs given in config_file.ini file.
 '''
-import sys
 import platform
 import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
 import math
 
 import common                                                                    # The common parameters used in DASH-Sim are defined in common_parameters.py
+import DASH_Sim_utils
 
 def job_parse(jobs, file_name):
+    '''!
+    Load the specified job file from its compiled version, or parse and compile it if the job file changed since it was compiled.
+    @param jobs: List that stores all new jobs that are parsed
+    @param file_name: Name of the job file to be parsed
+    '''
+    compiled_file = DASH_Sim_utils.get_compiled_file(file_name, [__file__, common.__file__], [common.packet_size])
+    new_job = DASH_Sim_utils.load_compiled(compiled_file)
+    if new_job is not None:
+        new_job.ID = len(jobs.list)                                             # The ID of the application is its index in the application table
+        for task in new_job.task_list:
+            task.app_ID = new_job.ID
+        jobs.list.append(new_job)
+        jobs.IDs[new_job.name] = new_job.ID
+    else:
+        job_parse_text(jobs, file_name)
+        new_job = jobs.list[-1]
+        DASH_Sim_utils.store_compiled(compiled_file, new_job)
+
+# end of def job_parse(jobs, file_name)
+
+def job_parse_text(jobs, file_name):
     '''!
     Parse the specified job file.
     @param jobs: List that stores all new jobs that are parsed
@@ -29,9 +48,8 @@ def job_parse(jobs, file_name):
             input_file = open(file_name, 'r')                                   # Read the configuration file
 
     except IOError:
-        print("[E] Could not read configuration file that contains all tasks")  # Print an error message, if the input file cannot be opened                                
-        print("[E] Please check if the file 'config_file.ini' has the correct file name")
-        sys.exit()
+        raise common.ConfigurationError("Could not read configuration file that contains all tasks (%s)\n"
+                                        "Please check if the file 'config_file.ini' has the correct file name" % file_name) from None
 
     found_new_task = False                                                      # The input lines do not correspond to a particular task
                                                                                 # unless found_new_task = = true;
@@ -56,7 +74,9 @@ def job_parse(jobs, file_name):
         if not(found_new_task):                                                 # new_task = common.Tasks()
             if current_line[0] == 'job_name':                               
                 new_job.name = current_line[1]                                  # record new job's name and, 
+                new_job.ID = len(jobs.list)                                     # its ID in the application table and,
                 jobs.list.append(new_job)                                       # append the job list with the new job
+                jobs.IDs[new_job.name] = new_job.ID
             
                 
             elif (current_line[0] == 'add_new_tasks'):                          # The key word "add_new_task" implies that the config file defines a new task
@@ -74,8 +94,7 @@ def job_parse(jobs, file_name):
                 new_job.comm_vol[int(current_line[1])][int(current_line[2])] = int(current_line[3])
             
             else:
-                print("[E] Cannot recognize the input line in task file: ", input_line)
-                sys.exit() 
+                raise common.ConfigurationError("Cannot recognize the input line in task file: %s" % input_line)
         # end of: if not(found_new_task)
         
         else: # if not(found_new_task) (i.e., found a new task)
@@ -120,6 +139,7 @@ def job_parse(jobs, file_name):
 
                 #print('This task belongs to application %s' %(new_job.name))
                 new_task.jobname = new_job.name
+                new_task.app_ID = new_job.ID
                 
                 #print("The predecessors for this task: ", current_line[2]);
                 # The rest of the inputs are predecessors (may be more than one)
@@ -156,17 +176,13 @@ def job_parse(jobs, file_name):
     for task in new_job.task_list :
         task.dag_depth = new_job.dag_depth['DAG'] - new_job.dag_depth[task.ID]
 
-    
-    
-    if (common.simulation_mode == 'validation'):
-        plt.figure()
-        # show the directed acyclic task graph
-        dag = nx.DiGraph(new_job.comm_vol)
-        dag.remove_edges_from(
-            # Remove all edges with weight of 0 since we have no placeholder for "this edge doesn't exist" in the input file
-            [edge for edge in dag.edges() if dag.get_edge_data(*edge)['weight'] == '0']
-        )
-        # Change 0-based node labels to 1-based
-        nx.relabel_nodes(dag, lambda idx: idx + 0, copy=False)
-        nx.draw(dag, pos=nx.nx_pydot.graphviz_layout(dag, prog='dot'), with_labels=True)
-       
+    ## The jobs are instantiated from the tasks of the application, whose base IDs must be their indices
+    for ii, task in enumerate(new_job.task_list):
+        if task.base_ID != ii:
+            raise common.ConfigurationError("The tasks of application %s must be listed in the order of their IDs, found task %d at position %d"
+                                            % (new_job.name, task.base_ID, ii))
+
+    ## Fill the per-task tables of the application, indexed by base ID
+    new_job.task_names = [task.name for task in new_job.task_list]
+    new_job.predecessors = [task.predecessors for task in new_job.task_list]
+# end of def job_parse_text(jobs, file_name)
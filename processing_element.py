@@ -13,8 +13,9 @@ class PE:
     '''!
     A processing element (PE) is the basic resource that defines the simpy processes.
     '''
-    def __init__(self, env, type, name, ID, cluster_ID, capacity):
+    def __init__(self, sim, env, type, name, ID, cluster_ID, capacity):
         '''!
+        @param sim: The Simulation object
         @param env: Pointer to the current simulation environment
         @param type: Type of the PE (e.g., BIG, LTL, ACC, MEM, etc.)
         @param name: Name of the current processing element
@@ -22,6 +23,7 @@ class PE:
         @param cluster_ID: ID of the cluster to which this PE belongs
         @param capacity: Number tasks that a resource can run simultaneously
         '''
+        self.sim = sim
         self.env = env
         self.type = type
         self.name = name
@@ -67,99 +69,77 @@ class PE:
             with self.process.request() as req:                                 # Requesting the resource for the task
                 yield req
 
-                if common.ClusterManager.cluster_list[self.cluster_ID].current_frequency == 0:                                 # Initialize the frequency if it was not set yet
+                if self.sim.cluster_list[self.cluster_ID].current_frequency == 0:                                 # Initialize the frequency if it was not set yet
                     # Depending on the DVFS policy on this PE, set the initial frequency and voltage accordingly
-                    if common.ClusterManager.cluster_list[self.cluster_ID].DVFS != 'none' or len(common.ClusterManager.cluster_list[self.cluster_ID].OPP) != 0:
-                        DTPM_policies.initialize_frequency(common.ClusterManager.cluster_list[self.cluster_ID])
+                    if self.sim.cluster_list[self.cluster_ID].DVFS != 'none' or len(self.sim.cluster_list[self.cluster_ID].OPP) != 0:
+                        DTPM_policies.initialize_frequency(self.sim.cluster_list[self.cluster_ID])
 
-                        DASH_Sim_utils.trace_frequency(self.env.now)
+                        DASH_Sim_utils.trace_frequency(self.sim, self.env.now)
 
                 self.idle = False                                               # Since the PE starts execution of a task, it is not idle anymore
-                common.TaskQueues.running.list.append(task)                     # Since the execution started for the task we should add it to the running queue 
+                self.sim.TaskQueues.running.list.append(task)                   # Since the execution started for the task we should add it to the running queue 
                 task.start_time = self.env.now                                  # When a resource starts executing the task, record it as the start time
 
                 # if this is the leading task of this job, increment the injection counter
                 if ((task.head == True) and
                     (self.env.now >= common.warmup_period)):
-                    common.results.injected_jobs += 1
+                    self.sim.results.injected_jobs += 1
                     if (common.DEBUG_JOB):
                         print('[D] Time %d: Total injected jobs becomes: %d'
-                              %(self.env.now, common.results.injected_jobs))
+                              %(self.env.now, self.sim.results.injected_jobs))
 
                     # Store the injected job for validation
                     if (common.simulation_mode == 'validation'):
-                       common.Validation.injected_jobs.append(task.jobID)
+                       self.sim.validation.injected_jobs.append(task.jobID)
                 # end of if ( (next_task.head == True) and ...
 
                 if (common.DEBUG_JOB):
                     print('[D] Time %d: Task %s execution is started with frequency %d by PE-%d %s'
-                      % (self.env.now, task.ID, common.ClusterManager.cluster_list[self.cluster_ID].current_frequency, self.ID, self.name))
+                      % (self.env.now, task.ID, self.sim.cluster_list[self.cluster_ID].current_frequency, self.ID, self.name))
 
                 # Retrieve the execution time and power consumption from the model
                 task_runtime_max_freq, randomization_factor = DTPM_power_models.get_execution_time_max_frequency(task, resource)           # Get the run time and power consumption
 
-                dynamic_energy = 0
-                static_energy = 0
+                running_task = RunningTask(self, task, resource, task_runtime_max_freq, self.env.active_process)
+                # If enabled and the frequency cannot change while the task runs, the PE waits in one step until its last window
+                # and the energy of the windows in between is accounted by the DTPM module at each sample
+                planned = common.plan_fixed_frequency_tasks and self.is_frequency_fixed()
                 task_complete = False
-                task_elapsed_time = task.task_elapsed_time_max_freq
                 while task_complete is False:
-                    # The predicted time takes into account the current frequency and subtracts the time that the task already executed
-                    predicted_exec_time = (task_runtime_max_freq - task_elapsed_time) + (task_runtime_max_freq - task_elapsed_time) * DTPM_power_models.compute_DVFS_performance_slowdown(common.ClusterManager.cluster_list[self.cluster_ID])
-                    window_remaining_time = common.sampling_rate - self.env.now % common.sampling_rate
-                    # Test if the task finished before the next sampling period
-                    if predicted_exec_time - window_remaining_time > 0:
-                        # Run until the next sampling timestamp
-                        simulation_step = window_remaining_time
-                        slowdown = DTPM_power_models.compute_DVFS_performance_slowdown(common.ClusterManager.cluster_list[self.cluster_ID]) + 1
-                        task_elapsed_time += simulation_step / slowdown
-                    else:
-                        # Run until the task ends
-                        simulation_step = predicted_exec_time
-                        task_complete = True
-
-                    # Compute the static energy
-                    current_leakage = DTPM_power_models.compute_static_power_dissipation(self.cluster_ID)
-                    static_energy += current_leakage * simulation_step * 1e-6
-
-                    max_power_consumption, freq_threshold = DTPM_power_models.get_max_power_consumption(common.ClusterManager.cluster_list[self.cluster_ID], sim_manager.PEs)  # of this task on this resource running at max frequency
-
-                    # Based on the total power consumption and the leakage, get the dynamic power
-                    if max_power_consumption > 0:
-                        dynamic_power_cluster = max_power_consumption - current_leakage * len(common.ClusterManager.cluster_list[self.cluster_ID].power_profile[freq_threshold])
-                        # After obtaining the dynamic power for the cluster, divide it by the number of cores being used to get the power per core
-                        dynamic_power_max_freq_core = dynamic_power_cluster / DASH_Sim_utils.get_num_tasks_being_executed(common.ClusterManager.cluster_list[self.cluster_ID], sim_manager.PEs)
-                    else:
-                        dynamic_power_max_freq_core = 0
-
-                    # Compute the capacitance and alpha based on the dynamic power
-                    self.Cdyn_alpha = DTPM_power_models.compute_Cdyn_and_alpha(resource, dynamic_power_max_freq_core, freq_threshold)
-
-                    # Compute the dynamic energy
-                    dynamic_power = DTPM_power_models.compute_dynamic_power_dissipation(common.ClusterManager.cluster_list[self.cluster_ID].current_frequency,
-                                                                                        common.ClusterManager.cluster_list[self.cluster_ID].current_voltage,
-                                                                                        self.Cdyn_alpha)
-                    dynamic_energy +=  dynamic_power * simulation_step * 1e-6
-
-                    # Scale the power based on the number of active cores
-                    common.ClusterManager.cluster_list[self.cluster_ID].current_power_cluster = dynamic_power * DASH_Sim_utils.get_num_tasks_being_executed(common.ClusterManager.cluster_list[self.cluster_ID], sim_manager.PEs) + \
-                                                                                                current_leakage * common.ClusterManager.cluster_list[self.cluster_ID].num_active_cores
-                    self.current_leakage_core = current_leakage
-                    self.current_power_active_core = dynamic_power + current_leakage
-
-                    if (common.simulation_mode == "performance" and self.env.now >= common.warmup_period) or common.simulation_mode == "validation":
-                        energy_sample = (dynamic_power + current_leakage) * simulation_step * 1e-6
-                        self.snippet_energy += energy_sample
-                        self.total_energy += energy_sample
-                        common.results.cumulative_energy_consumption += energy_sample
+                    simulation_step, task.task_elapsed_time_max_freq, task_complete = self.get_simulation_step(task_runtime_max_freq, task.task_elapsed_time_max_freq, self.env.now)
+                    self.compute_window_energy(running_task, sim_manager.PEs, simulation_step)
+                    running_task.window_end = self.env.now + simulation_step
+
+                    # The plan starts once the PE wakes up before the simulation core at the end of the window,
+                    # so that the task keeps the same order with respect to the core as sample by sample
+                    if planned and task_complete is False and sim_manager.next_tick != running_task.window_end:
+                        planned = False
+                        running_task.last_sample = self.get_last_sample(running_task)
+                        if running_task.last_sample > running_task.window_end:
+                            running_task.planned = True
+                            DVFS_module.planned_tasks.append(running_task)
+                            try:
+                                yield self.env.timeout(running_task.last_sample - self.env.now)
+                                DVFS_module.planned_tasks.remove(running_task)
+                                running_task.planned = False
+                            except simpy.Interrupt:
+                                # The frequency changed, continue sample by sample after the window that is already accounted
+                                if running_task.window_end > self.env.now:
+                                    yield self.env.timeout(running_task.window_end - self.env.now)
+                            DVFS_module.evaluate_PE(resource, self, self.env.now)
+                            continue
 
                     yield self.env.timeout(simulation_step)
-                    task.task_elapsed_time_max_freq = task_elapsed_time
                     # At each sample:
                     if self.env.now % common.sampling_rate == 0:
                         # Case 1: If the task is not complete, evaluate this PE at this moment
                         if task_complete is False:
                             DVFS_module.evaluate_PE(resource, self, self.env.now)
 
+                dynamic_energy = running_task.dynamic_energy
+                static_energy = running_task.static_energy
+                dynamic_power_max_freq_core = running_task.dynamic_power_max_freq_core
+
                 task.finish_time = int(self.env.now)
 
                 # As the task finished its execution, reset the task time
@@ -179,50 +159,52 @@ class PE:
                         self.active += task_time
 
                 # If there are no OPPs in the model, use the measured power consumption from the model
-                if len(common.ClusterManager.cluster_list[self.cluster_ID].OPP) == 0:
+                if len(self.sim.cluster_list[self.cluster_ID].OPP) == 0:
                     total_energy_task = dynamic_power_max_freq_core * task_time * 1e-6
                 else:
                     total_energy_task = dynamic_energy + static_energy
 
                 if (task.tail):
-                    common.results.job_counter -= 1
+                    self.sim.results.job_counter -= 1
                     
                     if (common.simulation_mode == 'performance'):
                         sim_manager.update_completed_queue()
 
                     if (self.env.now >= common.warmup_period):
-                        common.results.execution_time = self.env.now
-                        common.results.completed_jobs += 1
+                        self.sim.results.execution_time = self.env.now
+                        self.sim.results.completed_jobs += 1
 
                         # Interrupts the timeout of job generator if the inject_jobs_ASAP flag is active
                         if sim_manager.job_gen.generate_job and common.inject_jobs_ASAP:
                             sim_manager.job_gen.action.interrupt()
 
-                        for completed in common.TaskQueues.completed.list:
-                            if ((completed.head == True) and 
-                                (completed.jobID == task.jobID)):
-                                common.results.cumulative_exe_time += (self.env.now - completed.job_start)
+                        for completed in self.sim.TaskQueues.completed.list.get_job(task.jobID):
+                            if (completed.head == True):
+                                self.sim.results.cumulative_exe_time += (self.env.now - completed.job_start)
 
                                 if (common.DEBUG_JOB):
                                     print('[D] Time %d: Job %d is completed' %(self.env.now, task.jobID+1))
-                    #print('[D] total completed jobs becomes: %d' %(common.results.completed_jobs))
-                    #print('[D] Cumulative execution time: %f' %(common.results.cumulative_exe_time))
+                    #print('[D] total completed jobs becomes: %d' %(self.sim.results.completed_jobs))
+                    #print('[D] Cumulative execution time: %f' %(self.sim.results.cumulative_exe_time))
 
                     # Store the completed job for validation
                     if (common.simulation_mode == 'validation'):
-                        common.Validation.completed_jobs.append(task.jobID)
+                        self.sim.validation.completed_jobs.append(task.jobID)
                 # end of if ((task.tail) and ...
 
                 if (common.INFO_SIM):
                     print('[I] Time %d: Task %s is finished by PE-%d %s with %.2f us and energy consumption %.2f J'
                       % (self.env.now, task.ID, self.ID, self.name, round(task_time,2), round(total_energy_task,2)) )
-                DASH_Sim_utils.trace_tasks(task, self, task_time, total_energy_task)
-                #for i, executable_task in enumerate(common.TaskQueues.executable.list):
+                DASH_Sim_utils.trace_tasks(self.sim, task, self, task_time, total_energy_task)
+                #for i, executable_task in enumerate(self.sim.TaskQueues.executable.list):
                 #    print('Task %d can be executed on PE-%d after time %d'%(executable_task.ID, executable_task.PE_ID, executable_task.time_stamp))
 
                 # Retrieve the energy consumption for the task
                 # that the PE just finished processing
-                common.results.energy_consumption += total_energy_task
+                self.sim.results.energy_consumption += total_energy_task
+
+                # Record the PE and the finish time of the task for its successors
+                self.sim.TaskQueues.completion_records.add(task)
 
                 # Since the current task is processed, it should be removed
                 # from the outstanding task queue 
@@ -232,26 +214,26 @@ class PE:
                 if self.env.now % common.sampling_rate == 0:
                     DVFS_module.evaluate_PE(resource, self, self.env.now)
 
-                if (task.tail) and (self.env.now >= common.warmup_period) and (common.results.completed_jobs % common.snippet_size == 0):
+                if (task.tail) and (self.env.now >= common.warmup_period) and (self.sim.results.completed_jobs % common.snippet_size == 0):
 
                     # Reset energy of the snippet
                     for PE in sim_manager.PEs:
                         PE.snippet_energy = 0
 
-                    common.snippet_start_time = self.env.now
-                    common.snippet_initial_temp = copy.deepcopy(common.current_temperature_vector)
+                    self.sim.snippet_start_time = self.env.now
+                    self.sim.snippet_initial_temp = copy.deepcopy(self.sim.current_temperature_vector)
 
-                    common.snippet_throttle = -1
-                    for cluster in common.ClusterManager.cluster_list:
+                    self.sim.snippet_throttle = -1
+                    for cluster in self.sim.cluster_list:
                         cluster.snippet_power_list = []
-                    common.snippet_temp_list = []
-                    common.snippet_ID_exec += 1
+                    self.sim.snippet_temp_list = []
+                    self.sim.snippet_ID_exec += 1
                     if common.job_list != []:
-                        if common.snippet_ID_exec < common.max_num_jobs / common.snippet_size:
-                            common.current_job_list = common.job_list[common.snippet_ID_exec]
+                        if self.sim.snippet_ID_exec < common.max_num_jobs / common.snippet_size:
+                            self.sim.current_job_list = common.job_list[self.sim.snippet_ID_exec]
 
                     # Ends the simulation if all jobs are executed (if inject_fixed_num_jobs is enabled)
-                    if common.results.completed_jobs == common.max_num_jobs:
+                    if self.sim.results.completed_jobs == common.max_num_jobs:
                         #common.simulation_length = self.env.now
                         sim_manager.sim_done.succeed()
                         
@@ -261,5 +243,121 @@ class PE:
             print('Expect an interrupt at %s' % (self.env.now))
     # end of def run(self, sim_manager, task, resource):
 
+    def is_frequency_fixed(self):
+        '''!
+        Check if the frequency of this PE cannot change while a task runs, i.e., it only changes when throttling or a new DVFS policy is signalled.
+        @return True if the frequency is fixed by the DVFS mode of the cluster
+        '''
+        cluster = self.sim.cluster_list[self.cluster_ID]
+        # The fixed-frequency tasks are sampled by the simulation core, so it must wake up at each sample
+        if common.sampling_rate % common.simulation_clk != 0:
+            return False
+        return cluster.DVFS in ('performance', 'powersave') or str(cluster.DVFS).startswith('constant') or len(cluster.OPP) == 0
+
+    def get_simulation_step(self, task_runtime_max_freq, task_elapsed_time, timestamp):
+        '''!
+        Get the next execution window of a task, which ends at the next sample or when the task finishes.
+        @param task_runtime_max_freq: Execution time of the task at the maximum frequency
+        @param task_elapsed_time: Execution time at the maximum frequency that the task already completed
+        @param timestamp: Start time of the window
+        @return The length of the window, the elapsed time at its end, and whether the task finishes in it
+        '''
+        # The predicted time takes into account the current frequency and subtracts the time that the task already executed
+        predicted_exec_time = (task_runtime_max_freq - task_elapsed_time) + (task_runtime_max_freq - task_elapsed_time) * DTPM_power_models.compute_DVFS_performance_slowdown(self.sim.cluster_list[self.cluster_ID])
+        window_remaining_time = common.sampling_rate - timestamp % common.sampling_rate
+        # Test if the task finished before the next sampling period
+        if predicted_exec_time - window_remaining_time > 0:
+            # Run until the next sampling timestamp
+            slowdown = DTPM_power_models.compute_DVFS_performance_slowdown(self.sim.cluster_list[self.cluster_ID]) + 1
+            return window_remaining_time, task_elapsed_time + window_remaining_time / slowdown, False
+        else:
+            # Run until the task ends
+            return predicted_exec_time, task_elapsed_time, True
+
+    def get_last_sample(self, running_task):
+        '''!
+        Get the sample at which the last execution window of a task starts, assuming that its frequency does not change.
+        The windows are added one by one, so that the finish time is the same as the one of a task that wakes up at each sample.
+        @param running_task: RunningTask object of the task
+        @return Start time of the last window of the task
+        '''
+        timestamp = running_task.window_end
+        task_elapsed_time = running_task.task.task_elapsed_time_max_freq
+        while True:
+            simulation_step, task_elapsed_time, task_complete = self.get_simulation_step(running_task.task_runtime_max_freq, task_elapsed_time, timestamp)
+            if task_complete:
+                return timestamp
+            timestamp += simulation_step
+
+    def compute_window_energy(self, running_task, PEs, simulation_step):
+        '''!
+        Update the power of this PE and its cluster at the start of an execution window, and account the energy of the window.
+        @param running_task: RunningTask object of the task executed in the window
+        @param PEs: The PEs available in the current SoC
+        @param simulation_step: Length of the window
+        '''
+        cluster = self.sim.cluster_list[self.cluster_ID]
+
+        # Compute the static energy
+        current_leakage = DTPM_power_models.compute_static_power_dissipation(self.sim, self.cluster_ID)
+        running_task.static_energy += current_leakage * simulation_step * 1e-6
+
+        max_power_consumption, freq_threshold = DTPM_power_models.get_max_power_consumption(cluster, PEs)  # of this task on this resource running at max frequency
+
+        # Based on the total power consumption and the leakage, get the dynamic power
+        if max_power_consumption > 0:
+            dynamic_power_cluster = max_power_consumption - current_leakage * len(cluster.power_profile[freq_threshold])
+            # After obtaining the dynamic power for the cluster, divide it by the number of cores being used to get the power per core
+            running_task.dynamic_power_max_freq_core = dynamic_power_cluster / DASH_Sim_utils.get_num_tasks_being_executed(cluster, PEs)
+        else:
+            running_task.dynamic_power_max_freq_core = 0
+
+        # Compute the capacitance and alpha based on the dynamic power
+        self.Cdyn_alpha = DTPM_power_models.compute_Cdyn_and_alpha(self.sim, running_task.resource, running_task.dynamic_power_max_freq_core, freq_threshold)
+
+        # Compute the dynamic energy
+        dynamic_power = DTPM_power_models.compute_dynamic_power_dissipation(cluster.current_frequency,
+                                                                            cluster.current_voltage,
+                                                                            self.Cdyn_alpha)
+        running_task.dynamic_energy += dynamic_power * simulation_step * 1e-6
+
+        # Scale the power based on the number of active cores
+        cluster.current_power_cluster = dynamic_power * DASH_Sim_utils.get_num_tasks_being_executed(cluster, PEs) + \
+                                        current_leakage * cluster.num_active_cores
+        self.current_leakage_core = current_leakage
+        self.current_power_active_core = dynamic_power + current_leakage
+
+        if (common.simulation_mode == "performance" and self.env.now >= common.warmup_period) or common.simulation_mode == "validation":
+            energy_sample = (dynamic_power + current_leakage) * simulation_step * 1e-6
+            self.snippet_energy += energy_sample
+            self.total_energy += energy_sample
+            self.sim.results.cumulative_energy_consumption += energy_sample
+    # end of def compute_window_energy(self, running_task, PEs, simulation_step)
 
 # end class PE(object):
+
+class RunningTask:
+    '''!
+    Execution state of a task running on a PE.
+    '''
+    def __init__(self, PE, task, resource, task_runtime_max_freq, process):
+        '''!
+        @param PE: PE that executes the task
+        @param task: Task being executed
+        @param resource: Resource object of the PE
+        @param task_runtime_max_freq: Execution time of the task at the maximum frequency
+        @param process: Simpy process that executes the task
+        '''
+        self.PE = PE
+        self.task = task
+        self.resource = resource
+        self.task_runtime_max_freq = task_runtime_max_freq
+        self.process = process
+
+        self.static_energy = 0                                                  # Static energy consumed by the task so far
+        self.dynamic_energy = 0                                                 # Dynamic energy consumed by the task so far
+        self.dynamic_power_max_freq_core = 0                                    # Dynamic power per core at the maximum frequency in the last window
+        self.window_end = 0                                                     # End of the last window whose energy is accounted
+        self.last_sample = 0                                                    # Start of the last window, if the task is planned in one step
+        self.planned = False                                                    # Indicate if the task waits in one step until its last window
+# end class RunningTask
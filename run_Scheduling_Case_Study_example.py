@@ -1,40 +1,36 @@
-import shutil
-import os
+import configparser
 import matplotlib.pyplot as plt
 
+import common
+import DASH_Sim_sweep
+
 # Some variable initialization
 color_list = ['b','r']
 markers = ["o", "^"]
 result_list = [[],[]]
 
-# Get a configuration file satisfying the needs of the scheduling study
-shutil.copyfile("config_Files/config_file_scheduling.ini", "config_file.ini")
-
-import configparser
-import common
-import DASH_Sim_v0
+# Dynamic config parameters
+scale_list = [600,300,150]                                                      # Different injection rates (data  points) to run simulations 
+scheduler_list = ['MET','ETF']                                                  # Each of above injection rates will be simulated with different schedulers   
 
-# read the initial configuration file to make modification on the parameters needed for different simulations
+# Load the configuration of the scheduling study, config_file.ini is not modified
 config = configparser.ConfigParser()
-config.read('config_file.ini')
+config.read('config_Files/config_file_scheduling.ini')
 
+# Each scheduler and each selected scale value (frame or injection rate) is a point of the sweep, which overrides the configuration
+grid = {'scheduler'             : scheduler_list,
+        'scale_values'          : [[rate] for rate in scale_list]}
 
-# Dynamic  config parameters
-scale_list = [600,300,150]                                                      # Different injection rates (data  points) to run simulations 
-scheduler_list = ['MET','ETF']                                                  # Each of above injection rates will be simulated with different schedulers   
+# Run the simulations, the points run concurrently
+try:
+    common.load_config(config)
+    rows = DASH_Sim_sweep.run_sweep(grid)
+except common.ConfigurationError as error:
+    common.exit_with_error(error)
 
-# Run simulation with each scheduler and each selected scale value (frame or injection rate)
-for i, scheduler in enumerate(scheduler_list):
-    config['DEFAULT']['scheduler'] = scheduler
-    for rate in scale_list:
-        config['SIMULATION MODE']['scale_values'] = "["+str(rate)+"]"
-        with open('config_file.ini', 'w') as configfile:
-            config.write(configfile)
-        DASH_Sim_v0.run_simulator()
-        # Only average execution time results recored for these simulations
-        ave_exec = common.results.cumulative_exe_time/common.results.completed_jobs        
-        injection_rate = common.results.injected_jobs / (common.results.execution_time - common.warmup_period)
-        result_list[i].append((injection_rate, ave_exec))
+# Only average execution time results recored for these simulations
+for row in rows:
+    result_list[scheduler_list.index(row['scheduler'])].append((row['job_injection_rate'], row['job_execution_time']))
 
 # Plot the results (average execution time)
 plt.figure(figsize=(5,3))
@@ -52,5 +48,3 @@ plt.legend()
 plt.tight_layout()
 plt.show()
 
-# Finally, reset the configuratin file to DEFAULT values
-shutil.copyfile("./config_Files/config_file.ini", "./config_file.ini")
@@ -0,0 +1,68 @@
+'''!
+@brief This file measures the startup time of DASH-Sim, i.e., the time to import its modules in a new Python process.
+
+Each module is imported several times in a new process with python -X importtime, and the minimum and median import times are
+printed and appended to startup_benchmark.csv, so that the import cost can be tracked over time.
+The benchmark fails if a heavy dependency, which must only be imported by the features that need it, is imported at startup.
+'''
+import os
+import sys
+import csv
+import time
+import platform
+import statistics
+import subprocess
+
+num_of_runs = 5                                                                 # Number of new processes for each module
+module_list = ['common', 'DASH_Sim_v0', 'DASH_Sim_sweep', 'DASH_Sim_distributed'] # Modules imported at the startup of a simulation or a sweep worker
+heavy_module_list = ['matplotlib', 'networkx', 'docplex', 'pydot']              # Dependencies that must not be imported at startup
+package_dir = os.path.dirname(os.path.abspath(__file__))                        # Directory of DASH-Sim, from which the modules are imported
+benchmark_file = os.path.join(package_dir, 'startup_benchmark.csv')             # File that tracks the import times, next to this script
+
+def get_import_time(module):
+    '''!
+    Import a module in a new Python process.
+    @param module: Name of the module
+    @return Tuple of the import time (in ms), and the list of heavy dependencies imported by the module
+    '''
+    check = 'import sys, %s; print(",".join(m for m in %r if m in sys.modules))' % (module, heavy_module_list)
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], capture_output=True, text=True,
+                             cwd=package_dir)
+    if process.returncode != 0:
+        print('[E] Could not import %s:' % module)
+        print(process.stderr)
+        sys.exit(1)
+    import_time = None
+    for line in process.stderr.splitlines():                                    # e.g., import time:  10462 |  208494 | DASH_Sim_v0
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            import_time = int(fields[1]) / 1000
+    heavy_modules = [m for m in process.stdout.strip().split(',') if m]
+    return import_time, heavy_modules
+# end of def get_import_time(module)
+
+if __name__ == '__main__':
+    print('%-20s %12s %12s   %s' % ('Module', 'Min (ms)', 'Median (ms)', 'Heavy dependencies'))
+    rows = []
+    failed = False
+    for module in module_list:
+        import_times = []
+        for run in range(num_of_runs):
+            import_time, heavy_modules = get_import_time(module)
+            import_times.append(import_time)
+        print('%-20s %12.1f %12.1f   %s' % (module, min(import_times), statistics.median(import_times), ' '.join(heavy_modules) or '-'))
+        rows.append([time.strftime('%Y-%m-%d %H:%M:%S'), platform.python_version(), module,
+                     round(min(import_times), 1), round(statistics.median(import_times), 1), ' '.join(heavy_modules)])
+        if heavy_modules:
+            failed = True
+
+    write_header = not os.path.exists(benchmark_file)
+    with open(benchmark_file, 'a', newline='') as csvfile:
+        result_file = csv.writer(csvfile, delimiter=',')
+        if write_header:
+            result_file.writerow(['Date', 'Python', 'Module', 'Min import time (ms)', 'Median import time (ms)', 'Heavy dependencies'])
+        result_file.writerows(rows)
+
+    if failed:
+        print('[E] Heavy dependencies are imported at startup, please import them only where they are needed')
+        sys.exit(1)
@@ -2,29 +2,65 @@
 @brief This file contains all schedulers in DASH-Sim
 
 Scheduler class is defined in this file which contains different types of scheduler as a member function.
-Developers can add thier own algorithms here and implement in DASH-Sim by add a function caller in DASH_Sim_core.py
+Developers can add thier own algorithms here, or in their own module, and register them with the register_scheduler decorator.
+The registered name is the one given as scheduler in config_file.ini.
 '''
-import networkx as nx
 import numpy as np
-import copy
 
 import common                                                                   # The common parameters used in DASH-Sim are defined in common_parameters.py
 import DTPM_power_models
 
 import pickle
 
+## Registry of the schedulers, indexed by scheduler name
+registry = {}
+
+def register_scheduler(name):
+    '''!
+    Decorator to register a scheduling function under the given name.
+    The function is called with the Scheduler object and a SchedulingBatch, and returns the list of (task, PE ID) assignments
+    in the order in which the tasks are moved to the executable queue.
+    @param name: Name of the scheduler, as given in config_file.ini
+    @return Decorator that registers the function
+    '''
+    def register(function):
+        registry[name] = function
+        return function
+    return register
+# end of def register_scheduler(name)
+
+class SchedulingBatch:
+    '''!
+    Define the SchedulingBatch class that gives a scheduler the ready tasks and the state of the PEs at a scheduling instance.
+    '''
+    def __init__(self, scheduler, list_of_ready):
+        '''!
+        @param scheduler: The Scheduler object
+        @param list_of_ready: The list of ready tasks
+        '''
+        self.time = scheduler.env.now                                           # Time of the scheduling instance
+        self.tasks = list(list_of_ready)                                        # Ready tasks, in the order of the ready queue
+        self.exec_times = {}                                                    # Execution time of each ready task on each PE (np.inf if the PE does not support the task), indexed by task ID
+        for task in self.tasks:
+            self.exec_times[task.ID] = scheduler.exec_time_table.get(task.name, scheduler.unsupported)
+        self.enabled = [PE.enabled for PE in scheduler.PEs]                     # Whether each PE is enabled
+        self.idle = [PE.idle for PE in scheduler.PEs]                           # Whether each PE is idle
+# end class SchedulingBatch
+
 class Scheduler:
     '''!
     The Scheduler class constains all schedulers implemented in DASH-Sim
     '''
-    def __init__(self, env, resource_matrix, name, PE_list, jobs):
+    def __init__(self, sim, env, resource_matrix, name, PE_list, jobs):
         '''!
+        @param sim: The Simulation object
         @param env: Pointer to the current simulation environment
         @param resource_matrix: The data structure that defines power/performance characteristics of the PEs for each supported task
         @param name : The name of the requested scheduler
         @param PE_list: The PEs available in the current SoCs
         @param jobs: The list of all jobs given to DASH-Sim
         '''
+        self.sim = sim
         self.env = env
         self.resource_matrix = resource_matrix
         self.name = name
@@ -32,6 +68,20 @@ class Scheduler:
         self.jobs = jobs
         self.assigned = [0] * (len(self.PEs))
 
+        if self.name not in registry:
+            raise common.ConfigurationError('Could not find the requested scheduler (%s)\n'
+                                            'Please check "config_file.ini" and enter a proper name\n'
+                                            'or check "scheduler.py" if the scheduler exist' % self.name)
+
+        # Table of the execution time of each task on each PE, indexed by task name
+        # (the first entry of a task in the resource file is used, as in supported_functionalities.index())
+        self.unsupported = [np.inf] * len(self.resource_matrix.list)
+        self.exec_time_table = {}
+        for i, resource in enumerate(self.resource_matrix.list):
+            for ind in reversed(range(len(resource.supported_functionalities))):
+                name = resource.supported_functionalities[ind]
+                self.exec_time_table.setdefault(name, list(self.unsupported))[i] = float(resource.performance[ind])
+
         # At the end of this function, the scheduler class has a copy of the
         # the power/performance characteristics of the resource matrix and
         # name of the requested scheduler name
@@ -39,40 +89,59 @@ class Scheduler:
 
     # end  def __init__(self, env, resource_matrix, scheduler_name)
 
+    def schedule(self, list_of_ready):
+        '''!
+        Call the requested scheduler with the ready tasks and apply its assignments.
+        The ready queue is reordered as returned by the scheduler.
+        @param list_of_ready: The list of ready tasks
+        '''
+        batch = SchedulingBatch(self, list_of_ready)
+        assignments = registry[self.name](self, batch)
+
+        for task, PE_ID in assignments:
+            task.PE_ID = PE_ID
+
+        # The tasks that are not assigned, if any, stay behind the assigned ones
+        assigned_tasks = [task for task, PE_ID in assignments]
+        assigned_IDs = set(task.ID for task in assigned_tasks)
+        unassigned_tasks = [task for task in batch.tasks if task.ID not in assigned_IDs]
+        list_of_ready.clear()
+        list_of_ready.extend(assigned_tasks + unassigned_tasks)
+    # end of def schedule(list_of_ready)
+
     # Specific scheduler instances can be defined below
-    def CPU_only(self, list_of_ready):
+    # Each scheduler receives a SchedulingBatch and returns the list of (task, PE ID) assignments
+    @register_scheduler('CPU_only')
+    def CPU_only(self, batch):
         '''!
         This scheduler always select the resource with ID 0 (CPU) to execute all outstanding tasks without any comparison between
         available resources
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments
         '''
-        for task in list_of_ready:
-            task.PE_ID = 0
+        return [(task, 0) for task in batch.tasks]
 
-    # end def CPU_only(list_of_ready):
+    # end def CPU_only(batch):
 
 
-    def MET(self, list_of_ready):
+    @register_scheduler('MET')
+    def MET(self, batch):
         '''!
         This scheduler compares the execution times of the current task for available resources and returns the ID of the resource
         with minimum execution time for the current task.
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments
         '''
         # Initialize a list to record number of assigned tasks to a PE
         # for every scheduling instance
         assigned = [0]*(len(self.PEs))
+        assignments = []
 
         # go over all ready tasks for scheduling and make a decision
-        for task in list_of_ready:
-
-            exec_times = [np.inf]*(len(self.PEs))                                             # Initialize a list to keep execution times of task for each PE
-
-            for i in range(len(self.resource_matrix.list)):
-                if self.PEs[i].enabled:
-                    if (task.name in self.resource_matrix.list[i].supported_functionalities):
+        for task in batch.tasks:
 
-                        ind = self.resource_matrix.list[i].supported_functionalities.index(task.name)
-                        exec_times[i] = self.resource_matrix.list[i].performance[ind]
+            # Keep execution times of task for each enabled PE
+            exec_times = [exec_time if batch.enabled[i] else np.inf for i, exec_time in enumerate(batch.exec_times[task.ID])]
 
             min_of_exec_times = min(exec_times)                                                 # $min_of_exec_times is the minimum of execution time of the task among all PEs
             count_minimum = exec_times.count(min_of_exec_times)                                 # also, record how many times $min_of_exec_times is seen in the list
@@ -87,7 +156,7 @@ class Scheduler:
                 min_PE_IDs = [i for i, x in enumerate(exec_times) if x == min_of_exec_times]
 
                 # then check whether those PEs are busy or idle
-                PE_check_list = [True if not self.PEs[index].idle else False for i, index in enumerate(min_PE_IDs)]
+                PE_check_list = [True if not batch.idle[index] else False for i, index in enumerate(min_PE_IDs)]
 
                 # assign tasks to the idle PEs instead of the ones that are currently busy
                 if (True in PE_check_list) and (False in PE_check_list):
@@ -103,7 +172,7 @@ class Scheduler:
                 PE_ID_index = assigned_tasks.index(min(assigned_tasks))
 
                 # finally, choose the best available PE for the task
-                task.PE_ID = min_PE_IDs[PE_ID_index]
+                PE_ID = min_PE_IDs[PE_ID_index]
 
 # =============================================================================
 #                 # assign tasks to the idle PEs instead of the ones that are currently busy
@@ -123,39 +192,44 @@ class Scheduler:
 
 
                 # finally, choose the best available PE for the task
-                task.PE_ID = min_PE_IDs[PE_ID_index]
+                PE_ID = min_PE_IDs[PE_ID_index]
 
             else:
-                task.PE_ID = exec_times.index(min_of_exec_times)
+                PE_ID = exec_times.index(min_of_exec_times)
             # end of if count_minimum >1:
             # since one task is just assigned to a PE, increase the number by 1
-            assigned[task.PE_ID] += 1
+            assigned[PE_ID] += 1
 
-            if (task.PE_ID == -1):
+            if (PE_ID == -1):
                 print ('[E] Time %s: %s can not be assigned to any resource, please check SoC.**.txt file'
                        % (self.env.now,task.name))
                 print ('[E] or job_**.txt file')
-                assert(task.PE_ID >= 0)
+                assert(PE_ID >= 0)
             else:
                 if (common.INFO_SCH):
                     print ('[I] Time %s: The scheduler assigns the %s task to resource PE-%s: %s'
-                           %(self.env.now, task.ID, task.PE_ID,
-                             self.resource_matrix.list[task.PE_ID].type))
-            # end of if task.PE_ID == -1:
-        # end of for task in list_of_ready:
+                           %(self.env.now, task.ID, PE_ID,
+                             self.resource_matrix.list[PE_ID].type))
+            # end of if PE_ID == -1:
+            assignments.append((task, PE_ID))
+        # end of for task in batch.tasks:
         # At the end of this loop, we should have a valid (non-negative ID)
         # that can run next_task
 
-    # end of MET(list_of_ready)
+        return assignments
+    # end of MET(batch)
 
-    def EFT(self, list_of_ready):
+    @register_scheduler('EFT')
+    def EFT(self, batch):
         '''!
         This scheduler compares the execution times of the current task for available resources and also considers if a resource has
         already a task running. it picks the resource which will give the earliest finish time for the task
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments
         '''
+        assignments = []
 
-        for task in list_of_ready:
+        for task in batch.tasks:
 
             comparison = [np.inf]*len(self.PEs)                                     # Initialize the comparison vector
             comm_ready = [0]*len(self.PEs)                                          # A list to store the max communication times for each PE
@@ -165,11 +239,9 @@ class Scheduler:
                        %(self.env.now, task.ID))
 
             for i in range(len(self.resource_matrix.list)):
-                if self.PEs[i].enabled:
-                    # if the task is supported by the resource, retrieve the index of the task
-                    if (task.name in self.resource_matrix.list[i].supported_functionalities):
-                        ind = self.resource_matrix.list[i].supported_functionalities.index(task.name)
-
+                if batch.enabled[i]:
+                    # if the task is supported by the resource, retrieve the execution time of the task
+                    if (batch.exec_times[task.ID][i] != np.inf):
 
                         # $PE_comm_wait_times is a list to store the estimated communication time
                         # (or the remaining communication time) of all predecessors of a task for a PE
@@ -182,35 +254,22 @@ class Scheduler:
                         # till that PE is available if the PE is currently running a task
                         PE_wait_time = []
 
-                        job_ID = -1                                                     # Initialize the job ID
-
-                        # Retrieve the job ID which the current task belongs to
-                        for ii, job in enumerate(self.jobs.list):
-                            if job.name == task.jobname:
-                                job_ID = ii
+                        job_ID = task.app_ID                                            # Retrieve the job ID which the current task belongs to
 
-                        for predecessor in self.jobs.list[job_ID].task_list[task.base_ID].predecessors:
+                        for predecessor in self.jobs.list[job_ID].predecessors[task.base_ID]:
                             # data required from the predecessor for $ready_task
                             c_vol = self.jobs.list[job_ID].comm_vol[predecessor, task.base_ID]
 
                             # retrieve the real ID  of the predecessor based on the job ID
                             real_predecessor_ID = predecessor + task.ID - task.base_ID
 
-                            # Initialize following two variables which will be used if
-                            # PE to PE communication is utilized
-                            predecessor_PE_ID = -1
-                            predecessor_finish_time = -1
-
-
-                            for completed in common.TaskQueues.completed.list:
-                                if completed.ID == real_predecessor_ID:
-                                    predecessor_PE_ID = completed.PE_ID
-                                    predecessor_finish_time = completed.finish_time
-                                    #print(predecessor, predecessor_finish_time, predecessor_PE_ID)
+                            # Retrieve the PE ID and the finish time of the predecessor, which will be used if
+                            # PE to PE communication is utilized (-1 if the predecessor is not recorded)
+                            predecessor_PE_ID, predecessor_finish_time = self.sim.TaskQueues.completion_records.get(real_predecessor_ID)
 
                             if (common.PE_to_PE):
                                 # Compute the PE to PE communication time
-                                PE_to_PE_band = common.ResourceManager.comm_band[predecessor_PE_ID, i]
+                                PE_to_PE_band = self.sim.comm_band[predecessor_PE_ID, i]
                                 PE_to_PE_comm_time = int(c_vol/PE_to_PE_band)
 
                                 PE_comm_wait_times.append(max((predecessor_finish_time + PE_to_PE_comm_time - self.env.now), 0))
@@ -225,8 +284,8 @@ class Scheduler:
                                 # since the task passed the 1st phase (PE to memory communication)
                                 # and its status changed to ready
 
-                                #PE_to_memory_band = common.ResourceManager.comm_band[predecessor_PE_ID, -1]
-                                memory_to_PE_band = common.ResourceManager.comm_band[self.resource_matrix.list[-1].ID, i]
+                                #PE_to_memory_band = self.sim.comm_band[predecessor_PE_ID, -1]
+                                memory_to_PE_band = self.sim.comm_band[self.resource_matrix.list[-1].ID, i]
                                 shared_memory_comm_time = int(c_vol/memory_to_PE_band)
 
                                 PE_comm_wait_times.append(shared_memory_comm_time)
@@ -247,46 +306,51 @@ class Scheduler:
 
 
                         # update the comparison vector accordingly
-                        comparison[i] = self.resource_matrix.list[i].performance[ind] + max(comm_ready[i], PE_wait_time[-1])
-                    # end of if (task.name in...
+                        comparison[i] = batch.exec_times[task.ID][i] + max(comm_ready[i], PE_wait_time[-1])
+                    # end of if (batch.exec_times[task.ID][i] != np.inf):
             # end of for i in range(len(self.resource_matrix.list)):
 
             # after going over each resource, choose the one which gives the minimum result
-            task.PE_ID = comparison.index(min(comparison))
+            PE_ID = comparison.index(min(comparison))
 
-            if task.PE_ID == -1:
+            if PE_ID == -1:
                 print ('[E] Time %s: %s can not be assigned to any resource, please check SoC.**.txt file'
                        % (self.env.now,task.ID))
                 print ('[E] or job_**.txt file')
-                assert(task.PE_ID >= 0)
+                assert(PE_ID >= 0)
             else:
                 if (common.DEBUG_SCH):
                     print('[D] Time %s: Estimated execution times for each PE with task %s, respectively'
                               %(self.env.now, task.ID))
                     print('%12s'%(''), comparison)
                     print ('[D] Time %s: The scheduler assigns task %s to resource %s: %s'
-                           %(self.env.now, task.ID, task.PE_ID, self.resource_matrix.list[task.PE_ID].type))
+                           %(self.env.now, task.ID, PE_ID, self.resource_matrix.list[PE_ID].type))
 
             # Finally, update the estimated available time of the resource to which
             # a task is just assigned
-            self.PEs[task.PE_ID].available_time = self.env.now + comparison[task.PE_ID]
+            self.PEs[PE_ID].available_time = self.env.now + comparison[PE_ID]
+            assignments.append((task, PE_ID))
 
             # At the end of this loop, we should have a valid (non-negative ID)
             # that can run next_task
 
-        # end of for task in list_of_ready:
+        # end of for task in batch.tasks:
 
-    #end of EFT(list_of_ready)
+        return assignments
+    #end of EFT(batch)
 
-    def STF(self, list_of_ready):
+    @register_scheduler('STF')
+    def STF(self, batch):
         '''!
         This scheduler compares the execution times of the current task for available resources and returns the ID of the resource
         with minimum execution time for the current task. The only difference between STF and MET is the order in which the tasks 
         are scheduled onto resources
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments
         '''
 
-        ready_list = copy.deepcopy(list_of_ready)
+        ready_list = list(batch.tasks)
+        PE_IDs = {}                                                                                 # PE ID of each task, indexed by task ID
 
         # Iterate through the list of ready tasks until all of them are scheduled
         while (len(ready_list) > 0) :
@@ -299,13 +363,12 @@ class Scheduler:
                 min_time = np.inf                                                                   # Initialize the best performance found so far as a large number
 
                 for i in range(len(self.resource_matrix.list)):
-                    if self.PEs[i].enabled:
-                        if (task.name in self.resource_matrix.list[i].supported_functionalities):
-                            ind = self.resource_matrix.list[i].supported_functionalities.index(task.name)
+                    if batch.enabled[i]:
+                        if (batch.exec_times[task.ID][i] != np.inf):
 
 
-                            if (self.resource_matrix.list[i].performance[ind] < min_time):              # Found resource with smaller execution time
-                                min_time    = self.resource_matrix.list[i].performance[ind]                # Update the best time found so far
+                            if (batch.exec_times[task.ID][i] < min_time):                               # Found resource with smaller execution time
+                                min_time    = batch.exec_times[task.ID][i]                                 # Update the best time found so far
                                 resource_id = self.resource_matrix.list[i].ID                           # Record the ID of the resource
                                 #task.PE_ID = i                                                          # Record the corresponding resource
 
@@ -317,55 +380,55 @@ class Scheduler:
                     shortest_task           = task
                 # end of if (min_time < shortest_task_exec_time)
 
-            # end of for task in list_of_ready:
+            # end of for task in ready_list:
             # At the end of this loop, we should have the minimum execution time
             # of a task across all resources
 
             # Assign PE ID of the shortest task
-            index = [i for i,x in enumerate(list_of_ready) if x.ID == shortest_task.ID][0]
-            list_of_ready[index].PE_ID = shortest_task_pe_id
-            shortest_task.PE_ID        = shortest_task_pe_id
+            PE_IDs[shortest_task.ID] = shortest_task_pe_id
 
             if (common.DEBUG_SCH):
                 print ('[I] Time %s: The scheduler function found task %d to be shortest on resource %d with %.1f'
-                       %(self.env.now, shortest_task.ID, shortest_task.PE_ID, shortest_task_exec_time))
+                       %(self.env.now, shortest_task.ID, shortest_task_pe_id, shortest_task_exec_time))
 
-            if list_of_ready[index].PE_ID == -1:
+            if shortest_task_pe_id == -1:
                 print ('[E] Time %s: %s can not be assigned to any resource, please check SoC.**.txt file'
                        % (self.env.now,shortest_task.name))
                 print ('[E] or job_**.txt file')
-                assert(shortest_task.PE_ID >= 0)
+                assert(shortest_task_pe_id >= 0)
             else:
                 if (common.INFO_SCH):
                     print ('[I] Time %s: The scheduler assigns the %s task to resource PE-%s: %s'
-                           %(self.env.now, shortest_task.ID, shortest_task.PE_ID,
-                             self.resource_matrix.list[shortest_task.PE_ID].type))
-            # end of if shortest_task.PE_ID == -1:
+                           %(self.env.now, shortest_task.ID, shortest_task_pe_id,
+                             self.resource_matrix.list[shortest_task_pe_id].type))
+            # end of if shortest_task_pe_id == -1:
 
             # Remove the task which got a schedule successfully
             for i, task in enumerate(ready_list) :
                 if task.ID == shortest_task.ID :
                     ready_list.remove(task)
 
-        # end of for task in list_of_ready:
+        # end of while (len(ready_list) > 0):
         # At the end of this loop, all ready tasks are assigned to the resources
         # on which the execution times are minimum. The tasks will execute
         # in the order of increasing execution times
 
+        return [(task, PE_IDs[task.ID]) for task in batch.tasks]
+    # end of STF(batch)
 
-    # end of STF(list_of_ready)
-
-    def ETF_LB(self, list_of_ready):
+    @register_scheduler('ETF_LB')
+    def ETF_LB(self, batch):
         '''!
         This scheduler compares the execution times of the current task for available resources and also considers if a resource has
         already a task running. it picks the resource which will give the earliest finish time for the task. Additionally, the task 
         with the lowest earliest finish time is scheduled first
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments, in the order in which the tasks are scheduled
         '''
 
-        ready_list = copy.deepcopy(list_of_ready)
+        ready_list = list(batch.tasks)
+        assignments = []
 
-        task_counter = 0
         assigned = self.assigned
 
         # Iterate through the list of ready tasks until all of them are scheduled
@@ -385,10 +448,9 @@ class Scheduler:
                           % (self.env.now, task.ID))
 
                 for i in range(len(self.resource_matrix.list)):
-                    if self.PEs[i].enabled:
-                        # if the task is supported by the resource, retrieve the index of the task
-                        if (task.name in self.resource_matrix.list[i].supported_functionalities):
-                            ind = self.resource_matrix.list[i].supported_functionalities.index(task.name)
+                    if batch.enabled[i]:
+                        # if the task is supported by the resource, retrieve the execution time of the task
+                        if (batch.exec_times[task.ID][i] != np.inf):
 
                             # $PE_comm_wait_times is a list to store the estimated communication time
                             # (or the remaining communication time) of all predecessors of a task for a PE
@@ -401,35 +463,22 @@ class Scheduler:
                             # till that PE is available if the PE is currently running a task
                             PE_wait_time = []
 
-                            job_ID = -1  # Initialize the job ID
+                            job_ID = task.app_ID  # Retrieve the job ID which the current task belongs to
 
-                            # Retrieve the job ID which the current task belongs to
-                            for ii, job in enumerate(self.jobs.list):
-                                if job.name == task.jobname:
-                                    job_ID = ii
-
-                            for predecessor in self.jobs.list[job_ID].task_list[task.base_ID].predecessors:
+                            for predecessor in self.jobs.list[job_ID].predecessors[task.base_ID]:
                                 # data required from the predecessor for $ready_task
                                 c_vol = self.jobs.list[job_ID].comm_vol[predecessor, task.base_ID]
 
                                 # retrieve the real ID  of the predecessor based on the job ID
                                 real_predecessor_ID = predecessor + task.ID - task.base_ID
 
-                                # Initialize following two variables which will be used if
-                                # PE to PE communication is utilized
-                                predecessor_PE_ID = -1
-                                predecessor_finish_time = -1
-
-                                for completed in common.TaskQueues.completed.list:
-                                    if completed.ID == real_predecessor_ID:
-                                        predecessor_PE_ID = completed.PE_ID
-                                        predecessor_finish_time = completed.finish_time
-                                        # print(predecessor, predecessor_finish_time, predecessor_PE_ID)
-                                        break
+                                # Retrieve the PE ID and the finish time of the predecessor, which will be used if
+                                # PE to PE communication is utilized (-1 if the predecessor is not recorded)
+                                predecessor_PE_ID, predecessor_finish_time = self.sim.TaskQueues.completion_records.get(real_predecessor_ID)
 
                                 if (common.PE_to_PE):
                                     # Compute the PE to PE communication time
-                                    PE_to_PE_band = common.ResourceManager.comm_band[predecessor_PE_ID, i]
+                                    PE_to_PE_band = self.sim.comm_band[predecessor_PE_ID, i]
                                     PE_to_PE_comm_time = int(c_vol / PE_to_PE_band)
 
                                     PE_comm_wait_times.append(max((predecessor_finish_time + PE_to_PE_comm_time - self.env.now), 0))
@@ -444,8 +493,8 @@ class Scheduler:
                                     # since the task passed the 1st phase (PE to memory communication)
                                     # and its status changed to ready
 
-                                    # PE_to_memory_band = common.ResourceManager.comm_band[predecessor_PE_ID, -1]
-                                    memory_to_PE_band = common.ResourceManager.comm_band[self.resource_matrix.list[-1].ID, i]
+                                    # PE_to_memory_band = self.sim.comm_band[predecessor_PE_ID, -1]
+                                    memory_to_PE_band = self.sim.comm_band[self.resource_matrix.list[-1].ID, i]
                                     shared_memory_comm_time = int(c_vol / memory_to_PE_band)
 
                                     PE_comm_wait_times.append(shared_memory_comm_time)
@@ -465,8 +514,8 @@ class Scheduler:
                             PE_wait_time.append(max((self.PEs[i].available_time - self.env.now), 0))
 
                             # update the comparison vector accordingly
-                            comparison[i] = self.resource_matrix.list[i].performance[ind] * (1 + DTPM_power_models.compute_DVFS_performance_slowdown(common.ClusterManager.cluster_list[self.PEs[i].cluster_ID])) + max(comm_ready[i], PE_wait_time[-1])
-                        # end of if (task.name in...
+                            comparison[i] = batch.exec_times[task.ID][i] * (1 + DTPM_power_models.compute_DVFS_performance_slowdown(self.sim.cluster_list[self.PEs[i].cluster_ID])) + max(comm_ready[i], PE_wait_time[-1])
+                        # end of if (batch.exec_times[task.ID][i] != np.inf):
                 # end of for i in range(len(self.resource_matrix.list)):
 
                 if min(comparison) < shortest_task_exec_time:
@@ -486,70 +535,67 @@ class Scheduler:
                         PE_ID_index = assigned_tasks.index(min(assigned_tasks))
 
                         # finally, choose the best available PE for the task
-                        task.PE_ID = min_PE_IDs[PE_ID_index]
-                    #   print(count_minimum, task.PE_ID)
+                        candidate_PE_ID = min_PE_IDs[PE_ID_index]
+                    #   print(count_minimum, candidate_PE_ID)
                     else:
-                        task.PE_ID = comparison.index(shortest_task_exec_time)
+                        candidate_PE_ID = comparison.index(shortest_task_exec_time)
                     # end of if count_minimum >1:
 
                     # since one task is just assigned to a PE, increase the number by 1
-                    assigned[task.PE_ID] += 1
+                    assigned[candidate_PE_ID] += 1
 
-                    resource_id = task.PE_ID
+                    resource_id = candidate_PE_ID
                     shortest_task_pe_id = resource_id
                     shortest_task = task
-                    shortest_comparison = copy.deepcopy(comparison)
+                    shortest_comparison = list(comparison)
 
             # assign PE ID of the shortest task
-            index = [i for i, x in enumerate(list_of_ready) if x.ID == shortest_task.ID][0]
-            list_of_ready[index].PE_ID = shortest_task_pe_id
-            list_of_ready[index], list_of_ready[task_counter] = list_of_ready[task_counter], list_of_ready[index]
-            shortest_task.PE_ID = shortest_task_pe_id
+            assignments.append((shortest_task, shortest_task_pe_id))
 
-            if shortest_task.PE_ID == -1:
+            if shortest_task_pe_id == -1:
                 print('[E] Time %s: %s can not be assigned to any resource, please check SoC.**.txt file'
                       % (self.env.now, shortest_task.ID))
                 print('[E] or job_**.txt file')
-                assert (task.PE_ID >= 0)
+                assert (shortest_task_pe_id >= 0)
             else:
                 if (common.DEBUG_SCH):
                     print('[D] Time %s: Estimated execution times for each PE with task %s, respectively'
                           % (self.env.now, shortest_task.ID))
                     print('%12s' % (''), comparison)
                     print('[D] Time %s: The scheduler assigns task %s to PE-%s: %s'
-                          % (self.env.now, shortest_task.ID, shortest_task.PE_ID, self.resource_matrix.list[shortest_task.PE_ID].name))
+                          % (self.env.now, shortest_task.ID, shortest_task_pe_id, self.resource_matrix.list[shortest_task_pe_id].name))
 
             # Finally, update the estimated available time of the resource to which
             # a task is just assigned
-            index_min_available_time = self.PEs[shortest_task.PE_ID].available_time_list.index(min(self.PEs[shortest_task.PE_ID].available_time_list))
-            self.PEs[shortest_task.PE_ID].available_time_list[index_min_available_time] = self.env.now + shortest_comparison[shortest_task.PE_ID]
+            index_min_available_time = self.PEs[shortest_task_pe_id].available_time_list.index(min(self.PEs[shortest_task_pe_id].available_time_list))
+            self.PEs[shortest_task_pe_id].available_time_list[index_min_available_time] = self.env.now + shortest_comparison[shortest_task_pe_id]
 
-            self.PEs[shortest_task.PE_ID].available_time = min(self.PEs[shortest_task.PE_ID].available_time_list)
+            self.PEs[shortest_task_pe_id].available_time = min(self.PEs[shortest_task_pe_id].available_time_list)
 
             # Remove the task which got a schedule successfully
-            for i, task in enumerate(ready_list):
-                if task.ID == shortest_task.ID:
-                    ready_list.remove(task)
+            ready_list.remove(shortest_task)
 
-            task_counter += 1
             # At the end of this loop, we should have a valid (non-negative ID)
             # that can run next_task
 
         # end of while len(ready_list) > 0 :
 
-    # end of ETF_LB( list_of_ready)
+        return assignments
+    # end of ETF_LB(batch)
 
-    def ETF(self, list_of_ready):
+    @register_scheduler('ETF')
+    def ETF(self, batch):
         '''
         This scheduler compares the execution times of the current
         task for available resources and also considers if a resource has
         already a task running. it picks the resource which will give the
         earliest finish time for the task. Additionally, the task with the
         lowest earliest finish time  is scheduled first
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments, in the order in which the tasks are scheduled
         '''
-        ready_list = copy.deepcopy(list_of_ready)
-    
-        task_counter = 0
+        ready_list = list(batch.tasks)
+        assignments = []
     
         # Iterate through the list of ready tasks until all of them are scheduled
         while len(ready_list) > 0 :
@@ -568,9 +614,8 @@ class Scheduler:
                            %(self.env.now, task.ID))
                     
                 for i in range(len(self.resource_matrix.list)):
-                    # if the task is supported by the resource, retrieve the index of the task
-                    if (task.name in self.resource_matrix.list[i].supported_functionalities):
-                        ind = self.resource_matrix.list[i].supported_functionalities.index(task.name)
+                    # if the task is supported by the resource, retrieve the execution time of the task
+                    if (batch.exec_times[task.ID][i] != np.inf):
                         
                             
                         # $PE_comm_wait_times is a list to store the estimated communication time 
@@ -584,37 +629,24 @@ class Scheduler:
                         # till that PE is available if the PE is currently running a task
                         PE_wait_time = []
                           
-                        job_ID = -1                                                     # Initialize the job ID
-                        
-                        # Retrieve the job ID which the current task belongs to
-                        for ii, job in enumerate(self.jobs.list):
-                            if job.name == task.jobname:
-                                job_ID = ii
+                        job_ID = task.app_ID                                            # Retrieve the job ID which the current task belongs to
                                 
-                        for predecessor in self.jobs.list[job_ID].task_list[task.base_ID].predecessors:
+                        for predecessor in self.jobs.list[job_ID].predecessors[task.base_ID]:
                             # data required from the predecessor for $ready_task
                             c_vol = self.jobs.list[job_ID].comm_vol[predecessor, task.base_ID]
                             
                             # retrieve the real ID  of the predecessor based on the job ID
                             real_predecessor_ID = predecessor + task.ID - task.base_ID
                             
-                            # Initialize following two variables which will be used if 
-                            # PE to PE communication is utilized
-                            predecessor_PE_ID = -1
-                            predecessor_finish_time = -1
-                            
-                            
-                            for completed in common.TaskQueues.completed.list:
-                                if (completed.ID == real_predecessor_ID):
-                                    predecessor_PE_ID = completed.PE_ID
-                                    predecessor_finish_time = completed.finish_time
-                                    #print(predecessor, predecessor_finish_time, predecessor_PE_ID)
+                            # Retrieve the PE ID and the finish time of the predecessor, which will be used if
+                            # PE to PE communication is utilized (-1 if the predecessor is not recorded)
+                            predecessor_PE_ID, predecessor_finish_time = self.sim.TaskQueues.completion_records.get(real_predecessor_ID)
                                     
                             
                             if (common.PE_to_PE):
                                 # Compute the PE to PE communication time
                                 #PE_to_PE_band = self.resource_matrix.comm_band[predecessor_PE_ID, i]
-                                PE_to_PE_band = common.ResourceManager.comm_band[predecessor_PE_ID, i]
+                                PE_to_PE_band = self.sim.comm_band[predecessor_PE_ID, i]
                                 PE_to_PE_comm_time = int(c_vol/PE_to_PE_band)
                                 
                                 PE_comm_wait_times.append(max((predecessor_finish_time + PE_to_PE_comm_time - self.env.now), 0))
@@ -630,7 +662,7 @@ class Scheduler:
                                 # and its status changed to ready 
                                 
                                 #PE_to_memory_band = self.resource_matrix.comm_band[predecessor_PE_ID, -1]
-                                memory_to_PE_band = common.ResourceManager.comm_band[self.resource_matrix.list[-1].ID, i]
+                                memory_to_PE_band = self.sim.comm_band[self.resource_matrix.list[-1].ID, i]
                                 shared_memory_comm_time = int(c_vol/memory_to_PE_band)
                                 
                                 PE_comm_wait_times.append(shared_memory_comm_time)
@@ -651,13 +683,13 @@ class Scheduler:
                         PE_wait_time.append(max((self.PEs[i].available_time - self.env.now), 0))
                         
                         # update the comparison vector accordingly    
-                        comparison[i] = self.resource_matrix.list[i].performance[ind] + max(comm_ready[i], PE_wait_time[-1])
+                        comparison[i] = batch.exec_times[task.ID][i] + max(comm_ready[i], PE_wait_time[-1])
                         
     
                         # after going over each resource, choose the one which gives the minimum result
                         resource_id = comparison.index(min(comparison))
                         #print('aa',comparison)
-                    # end of if (task.name in self.resource_matrix.list[i]...
+                    # end of if (batch.exec_times[task.ID][i] != np.inf):
                     
                 # obtain the task ID, resource for the task with earliest finish time 
                 # based on the computation 
@@ -673,77 +705,80 @@ class Scheduler:
             # end of for task in ready_list:
             
             # assign PE ID of the shortest task 
-            index = [i for i,x in enumerate(list_of_ready) if x.ID == shortest_task.ID][0]
-            list_of_ready[index].PE_ID = shortest_task_pe_id
-            list_of_ready[index], list_of_ready[task_counter] = list_of_ready[task_counter], list_of_ready[index]
-            shortest_task.PE_ID        = shortest_task_pe_id
+            assignments.append((shortest_task, shortest_task_pe_id))
     
-            if shortest_task.PE_ID == -1:
+            if shortest_task_pe_id == -1:
                 print ('[E] Time %s: %s can not be assigned to any resource, please check DASH.SoC.**.txt file'
                        % (self.env.now, shortest_task.ID))
                 print ('[E] or job_**.txt file')
-                assert(task.PE_ID >= 0)           
+                assert(shortest_task_pe_id >= 0)           
             else: 
                 if (common.DEBUG_SCH):
                     print('[D] Time %s: Estimated execution times for each PE with task %s, respectively' 
                               %(self.env.now, shortest_task.ID))
                     print('%12s'%(''), comparison)
                     print ('[D] Time %s: The scheduler assigns task %s to PE-%s: %s'
-                           %(self.env.now, shortest_task.ID, shortest_task.PE_ID, 
-                             self.resource_matrix.list[shortest_task.PE_ID].name))
+                           %(self.env.now, shortest_task.ID, shortest_task_pe_id, 
+                             self.resource_matrix.list[shortest_task_pe_id].name))
             
             # Finally, update the estimated available time of the resource to which
             # a task is just assigned
-            self.PEs[shortest_task.PE_ID].available_time = self.env.now + shortest_comparison[shortest_task.PE_ID]
+            self.PEs[shortest_task_pe_id].available_time = self.env.now + shortest_comparison[shortest_task_pe_id]
             
             # Remove the task which got a schedule successfully
-            for i, task in enumerate(ready_list) :
-                if task.ID == shortest_task.ID :
-                    ready_list.remove(task)
-            
+            ready_list.remove(shortest_task)
             
-            task_counter += 1
             # At the end of this loop, we should have a valid (non-negative ID)
             # that can run next_task
 
         # end of while len(ready_list) > 0 :
-    #end of ETF( list_of_ready) 
+
+        return assignments
+    #end of ETF(batch) 
     
   
     
-    def CP(self, list_of_ready):
+    @register_scheduler('CP')
+    def CP(self, batch):
         '''!
         This scheduler utilizes a look-up table for scheduling tasks to a particular processor
-        @param list_of_ready: The list of ready tasks
+        @param batch: The SchedulingBatch with the ready tasks
+        @return List of (task, PE ID) assignments, in the order given by the look-up table
         '''
-        for task in list_of_ready:    
+        assignments = []
+
+        for task in batch.tasks:    
+            PE_ID = task.PE_ID
             ind = 0
             base =  0
-            for item in common.ilp_job_list:
+            for item in self.sim.ilp_job_list:
                 if item[0] == task.jobID:
-                    ind = common.ilp_job_list.index(item)
+                    ind = self.sim.ilp_job_list.index(item)
                     break
             
             previous_job_list = list(range(ind))
             for job in previous_job_list:
-                selection = common.ilp_job_list[job][1]
+                selection = self.sim.ilp_job_list[job][1]
                 num_of_tasks = len(self.jobs.list[selection].task_list)
                 base += num_of_tasks
             
             #print(task.jobID, base, task.base_ID)
             
-            for i, schedule in enumerate(common.table):
+            for i, schedule in enumerate(self.sim.table):
             
-                if len(common.table) > base:
+                if len(self.sim.table) > base:
                     if (task.base_ID + base) == i:
-                        task.PE_ID = schedule[0]
+                        PE_ID = schedule[0]
                         task.order = schedule[1]
                 else:
                     if ( task.ID%num_of_tasks == i):
-                        task.PE_ID = schedule[0]
+                        PE_ID = schedule[0]
                         task.order = schedule[1]        
          
+            assignments.append((task, PE_ID))
             
-        list_of_ready.sort(key=lambda x: x.order, reverse=False) 
+        assignments.sort(key=lambda assignment: assignment[0].order, reverse=False) 
+        return assignments
+    # end of CP(batch)
     # def CP_(self, list_of_ready): 
     
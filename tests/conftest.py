@@ -0,0 +1,21 @@
+'''!
+@brief This file contains the fixtures shared by the tests of DASH-Sim.
+
+The tests are run with pytest from the directory of DASH-Sim, e.g., python -m pytest tests.
+'''
+import os
+import sys
+
+import pytest
+
+## Directory of DASH-Sim, since the SoC and job files are given relative to it
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_dir)
+
+@pytest.fixture(autouse=True)
+def run_in_repo_dir(monkeypatch):
+    '''!
+    Run each test in the directory of DASH-Sim.
+    '''
+    monkeypatch.chdir(repo_dir)
+# end of def run_in_repo_dir(monkeypatch)
@@ -0,0 +1,42 @@
+'''!
+@brief This file contains the tests of the key of the result cache (DASH_Sim_cache.py).
+'''
+import DASH_Sim_cache
+
+## Options of a point, to which the tests add options
+config = {'DEFAULT': {'scheduler': 'MET'}, 'SIMULATION MODE': {'scale_values': '[100]'}}
+
+def get_key(section, option, value):
+    '''!
+    @param section: Section of the option
+    @param option: Name of the option
+    @param value: Value of the option
+    @return The key of the point with the option added to config
+    '''
+    point_config = {name: dict(options) for name, options in config.items()}
+    point_config.setdefault(section, {})[option] = value
+    return DASH_Sim_cache.get_key(point_config)
+# end of def get_key(section, option, value)
+
+def test_key_ignores_display_options():
+    '''!
+    The options that do not affect the results do not change the key.
+    '''
+    key = DASH_Sim_cache.get_key(config)
+    assert get_key('TRACE', 'plot_mode', 'file') == key
+    assert get_key('TRACE', 'plot_dir', 'other_plots') == key
+    assert get_key('DEFAULT', 'engine_mode', 'event') == key
+    assert get_key('SIMULATION MODE', 'num_of_processes', '4') == key
+    assert get_key('INFO', 'info_job', 'yes') == key
+# end of def test_key_ignores_display_options()
+
+def test_key_follows_result_options():
+    '''!
+    The options that affect the results, including the variables derived from them, change the key.
+    '''
+    key = DASH_Sim_cache.get_key(config)
+    assert get_key('DEFAULT', 'scheduler', 'ETF') != key
+    assert get_key('DEFAULT', 'max_jobs', '50') != key
+    assert get_key('POWER MANAGEMENT', 'sampling_rate', '20') != key
+    assert get_key('SIMULATION MODE', 'warmup_period', '1000') != key
+# end of def test_key_follows_result_options()
@@ -0,0 +1,58 @@
+'''!
+@brief This file contains the tests of the distributed sweep (DASH_Sim_distributed.py), which run the workers on localhost.
+'''
+import os
+import glob
+import tempfile
+
+import pytest
+
+import common
+import DASH_Sim_sweep
+import DASH_Sim_distributed
+
+## A small configuration, so that each point is simulated quickly
+config = {'DEFAULT': {'max_jobs': '20'}}
+grid = {'scheduler': ['MET', 'ETF'], 'scale_values': [[100], [300]]}
+
+@pytest.fixture(autouse=True)
+def authkey(monkeypatch):
+    '''!
+    Set the key that authenticates the workers.
+    '''
+    monkeypatch.setenv('DASH_SIM_AUTHKEY', 'DASH-Sim test')
+# end of def authkey(monkeypatch)
+
+def get_work_dirs():
+    '''!
+    @return The temporary work directories of the workers
+    '''
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), 'DASH_Sim_worker_*')))
+# end of def get_work_dirs()
+
+def test_localhost_sweep():
+    '''!
+    The rows of a distributed sweep with local workers are the same as the ones of a sweep on a single machine,
+    and the work directories of the workers are removed.
+    '''
+    common.load_config(config)
+    expected_rows = DASH_Sim_sweep.run_sweep(grid, num_of_processes=2)
+    work_dirs = get_work_dirs()
+
+    rows = DASH_Sim_distributed.run_distributed_sweep(grid, port=0, num_of_local_workers=2)
+
+    assert len(rows) == 4
+    assert rows == expected_rows
+    assert get_work_dirs() == work_dirs
+# end of def test_localhost_sweep()
+
+def test_stopped_local_workers(monkeypatch):
+    '''!
+    The coordinator does not wait for the points when all its local workers stopped without connecting.
+    '''
+    common.load_config(config)
+    monkeypatch.setattr(DASH_Sim_distributed, 'run_points', lambda address, authkey: None)
+
+    with pytest.raises(RuntimeError):
+        DASH_Sim_distributed.run_distributed_sweep(grid, port=0, num_of_local_workers=2)
+# end of def test_stopped_local_workers(monkeypatch)
@@ -0,0 +1,52 @@
+'''!
+@brief This file contains the tests of the simulation engine (DASH_Sim_v0.py and DASH_Sim_core.py),
+which check that the alternative ways of running a simulation give the same results.
+'''
+import pytest
+
+import DASH_Sim_v0
+
+## The communication modes, as the options of the COMMUNICATION MODE section
+communication_modes = {'PE_to_PE'      : {'PE_to_PE': 'yes', 'shared_memory': 'no'},
+                       'shared_memory' : {'PE_to_PE': 'no', 'shared_memory': 'yes'}}
+
+def simulate(default=None, simulation_mode=None, communication_mode='PE_to_PE'):
+    '''!
+    Simulate a small workload under performance mode.
+    @param default: Options added to the DEFAULT section
+    @param simulation_mode: Options added to the SIMULATION MODE section
+    @param communication_mode: Name of the communication mode (see communication_modes)
+    @return The Results object of the simulation
+    '''
+    config = {'DEFAULT'            : dict({'max_jobs': '30'}, **(default or {})),
+              'SIMULATION MODE'    : dict({'scale_values': '[100]'}, **(simulation_mode or {})),
+              'COMMUNICATION MODE' : communication_modes[communication_mode]}
+    return DASH_Sim_v0.simulate(config)
+# end of def simulate(default=None, simulation_mode=None, communication_mode='PE_to_PE')
+
+@pytest.mark.parametrize('communication_mode', communication_modes)
+@pytest.mark.parametrize('scheduler', ['MET', 'EFT', 'STF', 'ETF', 'ETF_LB'])
+def test_event_engine_matches_tick_engine(scheduler, communication_mode):
+    '''!
+    The event engine mode gives the same results as the tick engine mode.
+    '''
+    tick = simulate({'scheduler': scheduler, 'engine_mode': 'tick'}, communication_mode=communication_mode)
+    event = simulate({'scheduler': scheduler, 'engine_mode': 'event'}, communication_mode=communication_mode)
+
+    assert tick.statistics.completed_jobs > 0
+    assert event.iteration_results == tick.iteration_results
+    assert event.scale_results == tick.scale_results
+# end of def test_event_engine_matches_tick_engine(scheduler, communication_mode)
+
+def test_pool_matches_serial():
+    '''!
+    Simulating the (scale, iteration) points in a process pool gives the same results as simulating them one after the other.
+    '''
+    simulation_mode = {'scale_values': '[100, 200]', 'num_of_iterations': '2'}
+    serial = simulate(simulation_mode=dict(simulation_mode, num_of_processes='1'))
+    pool = simulate(simulation_mode=dict(simulation_mode, num_of_processes='2'))
+
+    assert len(serial.iteration_results) == 4
+    assert pool.iteration_results == serial.iteration_results
+    assert pool.scale_results == serial.scale_results
+# end of def test_pool_matches_serial()